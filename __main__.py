@@ -0,0 +1,20 @@
+# ================================ Imports ================================
+import sys
+
+
+# ============================== Subalgoritmos ============================
+
+# Ponto de entrada da pasta do projeto ("python <pasta> [comando ...]"): sem argumentos abre o menu interativo,
+# com argumentos executa a linha de comando. Cada caminho importa apenas os módulos de que precisa.
+def main() -> int:
+    if len(sys.argv) > 1:
+        import cli
+        return cli.main()
+    import código_fonte
+    código_fonte.main()
+    return 0
+
+
+# Executa o programa
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+# ================================ Imports ================================
+import código_fonte as cf
+import exportacao_incremental
+import exportacao_multipla
+import extracao_paralela
+import relatorios
+import servico_async
+from projeto import Projeto
+
+
+# ============================= Configurações =============================
+
+# Formatos de exportação aceitos
+FORMATOS_EXPORTACAO = ("json", "ndjson", "xlsx", "parquet", "feather", "csv")
+
+
+# ======================= API sem interação com o terminal ================
+# Todas as funções levantam exceções em vez de exibir mensagens ou pedir confirmação.
+# As operações de um projeto são invólucros síncronos do serviço assíncrono (servico_async).
+
+# Valida os dados de um projeto contra as tabelas de referência e retorna os parâmetros do banco
+def validar_projeto(descricao: str, custo: float, status: str, id_tipo_fonte: int, id_regiao: int) -> dict:
+    tipos_fonte = cf.carregar_referencia("TBL_TIPO_FONTES", "ID_TIPO_FONTE", "NOME")
+    regioes = cf.carregar_referencia("TBL_REGIOES_SUSTENTAVEIS", "ID_REGIAO", "NOME")
+    return cf.validar_linha_projeto(
+        {
+            "DESCRICAO": descricao,
+            "CUSTO": custo,
+            "STATUS": status,
+            "ID_TIPO_FONTE": id_tipo_fonte,
+            "ID_REGIAO": id_regiao,
+        },
+        tipos_fonte,
+        regioes,
+    )
+
+# Insere um novo projeto, retornando o ID gerado
+def inserir_projeto(descricao: str, custo: float, status: str, id_tipo_fonte: int, id_regiao: int) -> int:
+    return servico_async.executar(servico_async.inserir_projeto(descricao, custo, status, id_tipo_fonte, id_regiao))
+
+# Retorna um projeto pelo ID, ou None se não existir
+def buscar_projeto(id_projeto: int) -> tuple | None:
+    return servico_async.executar(servico_async.buscar_projeto(id_projeto))
+
+# Carrega um projeto como registro com controle de alterações e versão, ou None se não existir
+def carregar_projeto(id_projeto: int) -> Projeto | None:
+    return servico_async.executar(servico_async.carregar_projeto(id_projeto))
+
+# Atualiza os campos informados de um projeto (apenas as colunas alteradas são gravadas).
+# Com "versao", a atualização só ocorre se o projeto ainda estiver na versão que o cliente leu.
+def atualizar_projeto(
+    id_projeto: int,
+    descricao: str | None = None,
+    custo: float | None = None,
+    status: str | None = None,
+    id_tipo_fonte: int | None = None,
+    id_regiao: int | None = None,
+    versao: int | None = None,
+) -> int:
+    return servico_async.executar(
+        servico_async.atualizar_projeto(id_projeto, descricao, custo, status, id_tipo_fonte, id_regiao, versao)
+    )
+
+# Exclui um projeto, retornando a quantidade de linhas excluídas
+def excluir_projeto(id_projeto: int) -> int:
+    return servico_async.executar(servico_async.excluir_projeto(id_projeto))
+
+# Monta o filtro das operações em lote a partir dos valores informados
+def _filtro_lote(status: str | None, id_regiao: int | None, id_tipo_fonte: int | None) -> dict:
+    return {"status": status, "id_regiao": id_regiao, "id_tipo_fonte": id_tipo_fonte}
+
+# Altera status, região e/ou tipo de fonte de vários projetos de uma vez (por IDs, intervalo de IDs e/ou filtro)
+def atualizar_projetos(
+    status: str | None = None,
+    id_regiao: int | None = None,
+    id_tipo_fonte: int | None = None,
+    ids: list[int] | None = None,
+    id_inicial: int | None = None,
+    id_final: int | None = None,
+    filtro_status: str | None = None,
+    filtro_regiao: int | None = None,
+    filtro_tipo_fonte: int | None = None,
+) -> int:
+    if status is not None and status not in cf.STATUS_VALIDOS:
+        raise ValueError(f"Status inválido: {status}")
+    if id_tipo_fonte is not None and id_tipo_fonte not in cf.carregar_referencia("TBL_TIPO_FONTES", "ID_TIPO_FONTE", "NOME"):
+        raise ValueError(f"Tipo de fonte inexistente: {id_tipo_fonte}")
+    if id_regiao is not None and id_regiao not in cf.carregar_referencia("TBL_REGIOES_SUSTENTAVEIS", "ID_REGIAO", "NOME"):
+        raise ValueError(f"Região inexistente: {id_regiao}")
+    return cf.obter_repositorio().atualizar_projetos(
+        {"status": status, "id_regiao": id_regiao, "id_tipo_fonte": id_tipo_fonte},
+        ids,
+        id_inicial,
+        id_final,
+        _filtro_lote(filtro_status, filtro_regiao, filtro_tipo_fonte),
+    )
+
+# Exclui vários projetos de uma vez (por IDs, intervalo de IDs e/ou filtro), retornando a quantidade excluída
+def excluir_projetos(
+    ids: list[int] | None = None,
+    id_inicial: int | None = None,
+    id_final: int | None = None,
+    filtro_status: str | None = None,
+    filtro_regiao: int | None = None,
+    filtro_tipo_fonte: int | None = None,
+) -> int:
+    return cf.obter_repositorio().excluir_projetos(
+        ids, id_inicial, id_final, _filtro_lote(filtro_status, filtro_regiao, filtro_tipo_fonte)
+    )
+
+# Percorre os projetos (opcionalmente de um status), buscando-os em lotes.
+# Com "paralelismo" maior que 1, faixas de IDs são lidas ao mesmo tempo em conexões separadas (mesma ordem).
+def consultar_projetos(status: str | None = None, tamanho_lote: int = cf.TAMANHO_LOTE_CONSULTA, paralelismo: int | None = None):
+    if paralelismo and paralelismo > 1:
+        yield from extracao_paralela.extrair_em_ordem(status, paralelismo, tamanho_lote)
+        return
+    for pagina in cf.obter_repositorio().paginar_projetos(status, tamanho_lote):
+        yield from pagina
+
+# Retorna uma página de projetos (filtrada por status, região e/ou tipo de fonte) e o ID para a próxima página
+def listar_projetos(
+    status: str | None = None,
+    id_regiao: int | None = None,
+    id_tipo_fonte: int | None = None,
+    apos: int = 0,
+    limite: int = cf.TAMANHO_PAGINA_TELA,
+) -> tuple[list[tuple], int | None]:
+    paginas = cf.obter_repositorio().paginar_projetos(
+        status, limite, ultimo_id=apos, id_regiao=id_regiao, id_tipo_fonte=id_tipo_fonte
+    )
+    try:
+        pagina = next(paginas, [])
+    finally:
+        paginas.close()
+    return pagina, (pagina[-1][0] if len(pagina) == limite else None)
+
+# Busca projetos pela descrição (todas as palavras, por prefixo, sem diferenciar acentos e maiúsculas).
+# Retorna uma página de projetos em ordem de ID e o ID para a próxima página.
+def buscar_projetos(
+    texto: str,
+    status: str | None = None,
+    apos: int = 0,
+    limite: int = cf.TAMANHO_PAGINA_TELA,
+) -> tuple[list[tuple], int | None]:
+    pagina = cf.obter_repositorio().buscar_projetos(texto, status, apos, limite)
+    return pagina, (pagina[-1][0] if len(pagina) == limite else None)
+
+# Exporta os projetos (opcionalmente de um status) para um arquivo
+def exportar_projetos(
+    formato: str,
+    nome_arquivo: str | None = None,
+    status: str | None = None,
+    compacto: bool = False,
+    gzip_ativo: bool = False,
+    paralelismo: int | None = None,
+) -> dict:
+    if formato in ("json", "ndjson"):
+        return cf.gravar_json(consultar_projetos(status, paralelismo=paralelismo), nome_arquivo, formato, compacto, gzip_ativo)
+    # Excel incluído: o escritor colunar grava em modo somente escrita e divide as abas no limite de linhas
+    if formato in cf.FORMATOS_COLUNARES:
+        if paralelismo and paralelismo > 1:
+            return cf.gravar_colunar(formato, dados=consultar_projetos(status, paralelismo=paralelismo), nome_arquivo=nome_arquivo)
+        return cf.gravar_colunar(formato, status=status, nome_arquivo=nome_arquivo)
+    raise ValueError(f"Formato não suportado: {formato}")
+
+# Exporta os projetos para vários formatos lendo a consulta uma única vez, com um manifesto dos arquivos gerados.
+# Com "prefixo", cada arquivo recebe o prefixo mais a extensão do formato (ex.: saida/projetos.json, saida/projetos.xlsx).
+def exportar_varios(
+    formatos: list[str],
+    prefixo: str | None = None,
+    status: str | None = None,
+    nome_manifesto: str | None = None,
+    compacto: bool = False,
+    gzip_ativo: bool = False,
+    paralelismo: int | None = None,
+) -> dict:
+    destinos = {
+        formato: prefixo + exportacao_multipla.extensao_formato(formato, gzip_ativo) if prefixo else None
+        for formato in formatos
+    }
+    if prefixo and not nome_manifesto:
+        nome_manifesto = prefixo + "_manifesto.json"
+    return exportacao_multipla.exportar_varios(
+        consultar_projetos(status, paralelismo=paralelismo), destinos, nome_manifesto, compacto, gzip_ativo
+    )
+
+# Exporta apenas os projetos alterados e excluídos desde a última exportação do consumidor ("marca")
+def exportar_alteracoes(
+    formato: str,
+    prefixo: str | None = None,
+    marca: str = exportacao_incremental.MARCA_PADRAO,
+    compacto: bool = False,
+    gzip_ativo: bool = False,
+    avancar: bool = True,
+) -> dict:
+    return exportacao_incremental.exportar_alteracoes(formato, prefixo, marca, compacto, gzip_ativo, avancar)
+
+# Lista as marcas d'água da exportação incremental e, se pedido, remove as exclusões já exportadas por todas
+def marcas_exportacao(limpar_exclusoes: bool = False) -> tuple[list[tuple], int]:
+    repositorio = cf.obter_repositorio()
+    removidas = repositorio.limpar_exclusoes() if limpar_exclusoes else 0
+    return repositorio.listar_marcas(), removidas
+
+# Exporta cada faixa de IDs para um arquivo próprio (prefixo_parteNNN.<formato>), lendo as faixas em paralelo
+def exportar_particoes(
+    formato: str,
+    prefixo: str | None = None,
+    status: str | None = None,
+    paralelismo: int = extracao_paralela.GRAU_PARALELISMO,
+    partes: int | None = None,
+    nome_manifesto: str | None = None,
+    compacto: bool = False,
+    gzip_ativo: bool = False,
+) -> dict:
+    return extracao_paralela.exportar_particoes(
+        formato, prefixo, status, paralelismo, partes, nome_manifesto, compacto, gzip_ativo
+    )
+
+# Importa projetos de um arquivo JSON, Excel ou CSV
+def importar_projetos(
+    nome_arquivo: str,
+    tamanho_lote: int = cf.TAMANHO_LOTE_IMPORTACAO,
+    manter_ids: bool = False,
+) -> dict:
+    return cf.carregar_arquivo_projetos(nome_arquivo, tamanho_lote, manter_ids)
+
+# Quantidade, custo total e médio por região/fonte/status (do resumo, ou agregado sobre todos os projetos)
+def relatorio_custos(
+    dimensoes: tuple[str, ...] = ("regiao",),
+    status: str | None = None,
+    usar_resumo: bool = True,
+) -> list[dict]:
+    consulta = relatorios.custos_por_grupo_resumo if usar_resumo else relatorios.custos_por_grupo
+    return list(consulta(cf.obter_repositorio(), dimensoes, status))
+
+# Compara o resumo com os projetos e o reconstrói se houver divergência
+def reconciliar_resumo(corrigir: bool = True) -> list[dict]:
+    return cf.obter_repositorio().reconciliar_resumo(corrigir)
+
+# Emissões estimadas por região/fonte/status (agregado no banco)
+def relatorio_emissoes(dimensoes: tuple[str, ...] = ("regiao",), status: str | None = None) -> list[dict]:
+    return list(relatorios.emissoes_por_grupo(cf.obter_repositorio(), dimensoes, status))
+
+# Emissões estimadas de cada projeto, à medida que chegam do banco
+def emissoes_por_projeto(status: str | None = None):
+    return relatorios.emissoes_por_projeto(cf.obter_repositorio(), status)
+
+# Os N projetos mais caros
+def projetos_mais_caros(n: int = 10, status: str | None = None) -> list[dict]:
+    return list(relatorios.projetos_mais_caros(cf.obter_repositorio(), n, status))
+
+# Simula cenários de custo e emissão da carteira (inflação por região, troca de tipo de fonte, incerteza de custo).
+# O NumPy (simulacao) só é carregado aqui, fora da inicialização dos demais comandos.
+def simular_cenarios(
+    cenarios: int = 10_000,
+    status: str | None = None,
+    inflacao=0.0,
+    desvio_inflacao=0.0,
+    anos: float = 1.0,
+    trocas: dict | None = None,
+    incerteza=0.0,
+    incerteza_projeto: float = 0.0,
+    semente: int | None = None,
+    processos: int | None = None,
+) -> dict:
+    import simulacao
+    carteira = simulacao.carregar_carteira(status, cf.obter_repositorio())
+    return simulacao.simular(
+        carteira, cenarios, inflacao, desvio_inflacao, anos, trocas, incerteza, incerteza_projeto, semente, processos
+    )
+
+# Linhas do resultado de uma simulação para exibição em tabela
+def linhas_simulacao(resultado: dict) -> list[dict]:
+    import simulacao
+    return simulacao.linhas_resultado(resultado)
+
+# Execuções e análises (parses) estimadas no cliente de cada comando SQL desde o início do processo
+def estatisticas_comandos() -> list[dict]:
+    return cf.obter_repositorio().comandos.estatisticas()
+
+# Encerra os pools (síncrono e assíncrono) ao finalizar o programa
+def encerrar() -> None:
+    servico_async.encerrar()
+    cf.encerrar_pool()
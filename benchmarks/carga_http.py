@@ -0,0 +1,117 @@
+# ================================ Imports ================================
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+# Permite importar o código-fonte a partir da raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# ============================== Subalgoritmos ============================
+
+# Percentil de uma lista de tempos já ordenada
+def percentil(tempos: list[float], fracao: float) -> float:
+    if not tempos:
+        return 0.0
+    return tempos[min(len(tempos) - 1, int(fracao * len(tempos)))]
+
+# Requisições de um cliente: mistura de listagens, buscas por ID, referências com ETag e atualizações
+def executar_cliente(porta: int, fim: float, maior_id: int, escrita: float, semente: int, resultados: list) -> None:
+    gerador = random.Random(semente)
+    conexao = http.client.HTTPConnection("127.0.0.1", porta)  # Conexão persistente (keep-alive)
+    etags, tempos, erros = {}, [], 0
+    while time.perf_counter() < fim:
+        sorteio = gerador.random()
+        cabecalhos = {}
+        if sorteio < escrita:
+            id_projeto = gerador.randint(1, maior_id)
+            metodo, caminho = "PATCH", f"/projetos/{id_projeto}"
+            corpo = json.dumps({"custo": round(gerador.uniform(1_000, 5_000_000), 2)})
+            cabecalhos["Content-Type"] = "application/json"
+        elif sorteio < 0.4:
+            metodo, caminho, corpo = "GET", f"/projetos/{gerador.randint(1, maior_id)}", None
+        elif sorteio < 0.7:
+            filtro = gerador.choice(("", "status=Conclu%C3%ADdo&", "regiao=1&", "tipo_fonte=2&"))
+            metodo, caminho, corpo = "GET", f"/projetos?{filtro}apos={gerador.randint(0, maior_id)}&limite=50", None
+        else:
+            metodo, caminho, corpo = "GET", gerador.choice(("/referencias/tipos-fonte", "/referencias/regioes")), None
+            if caminho in etags:
+                cabecalhos["If-None-Match"] = etags[caminho]
+
+        inicio = time.perf_counter()
+        conexao.request(metodo, caminho, corpo, cabecalhos)
+        resposta = conexao.getresponse()
+        resposta.read()
+        tempos.append(time.perf_counter() - inicio)
+        if resposta.status >= 400 and resposta.status not in (404, 412):
+            erros += 1
+        elif caminho.startswith("/referencias") and resposta.getheader("ETag"):
+            etags[caminho] = resposta.getheader("ETag")
+    conexao.close()
+    resultados.append((tempos, erros))
+
+# Executa o teste de carga contra um servidor local com banco SQLite temporário
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Teste de carga da API HTTP com banco SQLite local.")
+    parser.add_argument("--projetos", type=int, default=20_000, help="Projetos gerados no banco temporário")
+    parser.add_argument("--clientes", type=int, default=8, help="Clientes simultâneos")
+    parser.add_argument("--segundos", type=float, default=10.0, help="Duração do teste")
+    parser.add_argument("--escrita", type=float, default=0.05, help="Fração das requisições que atualizam projetos")
+    parser.add_argument("--sqlite", help="Usa um banco SQLite existente em vez de gerar um temporário")
+    args = parser.parse_args()
+
+    pasta = tempfile.TemporaryDirectory()
+    caminho = args.sqlite or os.path.join(pasta.name, "carga.db")
+    os.environ["BACKEND_BD"] = "sqlite"  # Precisa estar definido antes de importar o código-fonte
+    os.environ["SQLITE_CAMINHO"] = caminho
+
+    import api
+    import gerador_dados
+    import servidor_http
+
+    repositorio = api.cf.obter_repositorio()
+    if not args.sqlite:
+        gerador_dados.popular_projetos(repositorio, args.projetos)
+    maior_id = max(repositorio.contar_projetos(), 1)
+
+    servidor = servidor_http.criar_servidor("127.0.0.1", 0)  # Porta livre escolhida pelo sistema
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+
+    print(f"\n=== {args.clientes} cliente(s) por {args.segundos:.0f} s em http://127.0.0.1:{servidor.server_port} ===")
+    resultados = []
+    fim = time.perf_counter() + args.segundos
+    clientes = [
+        threading.Thread(
+            target=executar_cliente,
+            args=(servidor.server_port, fim, maior_id, args.escrita, semente, resultados),
+        )
+        for semente in range(args.clientes)
+    ]
+    for cliente in clientes:
+        cliente.start()
+    for cliente in clientes:
+        cliente.join()
+    servidor.shutdown()
+    servidor.server_close()
+    api.encerrar()
+    pasta.cleanup()
+
+    tempos = sorted(tempo for tempos_cliente, _ in resultados for tempo in tempos_cliente)
+    erros = sum(erros_cliente for _, erros_cliente in resultados)
+    print(f"{'Requisições':<14}{'Req/s':>10}{'p50 (ms)':>12}{'p95 (ms)':>12}{'p99 (ms)':>12}{'Erros':>8}")
+    print(
+        f"{len(tempos):<14,}{len(tempos) / args.segundos:>10,.0f}"
+        f"{percentil(tempos, 0.50) * 1000:>12.2f}{percentil(tempos, 0.95) * 1000:>12.2f}"
+        f"{percentil(tempos, 0.99) * 1000:>12.2f}{erros:>8}"
+    )
+
+
+# Executa o teste de carga
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# ================================ Imports ================================
+import argparse
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pyarrow as pa
+
+# Permite importar o código-fonte a partir da raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import código_fonte as cf
+
+
+# ============================== Subalgoritmos ============================
+
+# Gera lotes sintéticos de projetos com o mesmo esquema da exportação
+def gerar_lotes_sinteticos(total_linhas: int, tamanho_lote: int, semente: int = 42):
+    gerador = np.random.default_rng(semente)
+    status = np.array(cf.STATUS_VALIDOS, dtype=object)
+    for inicio in range(0, total_linhas, tamanho_lote):
+        quantidade = min(tamanho_lote, total_linhas - inicio)
+        ids = np.arange(inicio + 1, inicio + quantidade + 1, dtype=np.int64)
+        yield pa.table({
+            "ID_PROJETO": ids,
+            "DESCRICAO": pa.array([f"Projeto sintético {i}" for i in ids]),
+            "CUSTO": np.round(gerador.uniform(1_000, 5_000_000, quantidade), 2),
+            "STATUS": pa.array(status[gerador.integers(0, len(status), quantidade)].tolist()),
+            "ID_TIPO_FONTE": gerador.integers(1, 6, quantidade, dtype=np.int64),
+            "ID_REGIAO": gerador.integers(1, 28, quantidade, dtype=np.int64),
+        })
+
+# Executa o benchmark de cada formato e exibe uma tabela comparativa
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compara os formatos de exportação colunar em dados sintéticos.")
+    parser.add_argument("--linhas", type=int, default=1_000_000, help="Quantidade de projetos sintéticos")
+    parser.add_argument("--lote", type=int, default=cf.TAMANHO_LOTE_COLUNAR, help="Projetos por lote Arrow")
+    parser.add_argument(
+        "--formatos",
+        default=",".join(cf.FORMATOS_COLUNARES),
+        help="Formatos separados por vírgula (o Excel é bem mais lento que os demais)",
+    )
+    args = parser.parse_args()
+
+    print(f"\n=== Exportação de {args.linhas:,} projetos sintéticos ===")
+    print(f"{'Formato':<10}{'Tempo (s)':>12}{'Tamanho (MB)':>16}{'Projetos/s':>16}")
+    with tempfile.TemporaryDirectory() as pasta:
+        for formato in args.formatos.split(","):
+            formato = formato.strip()
+            extensao = cf.FORMATOS_COLUNARES[formato][0]
+            nome_arquivo = os.path.join(pasta, f"projetos{extensao}")
+            estatisticas = cf.escrever_lotes_colunares(
+                gerar_lotes_sinteticos(args.linhas, args.lote), formato, nome_arquivo
+            )
+            taxa = estatisticas["linhas"] / estatisticas["segundos"] if estatisticas["segundos"] else 0
+            print(
+                f"{formato:<10}{estatisticas['segundos']:>12.2f}"
+                f"{estatisticas['bytes'] / 1_048_576:>16.1f}{taxa:>16,.0f}"
+            )
+
+
+# Executa o benchmark
+if __name__ == "__main__":
+    main()
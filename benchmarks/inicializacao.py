@@ -0,0 +1,98 @@
+# ================================ Imports ================================
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+
+# ============================= Configurações =============================
+
+# Raiz do repositório (onde ficam os módulos importados)
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos cuja importação é medida
+ALVOS_PADRAO = "cli,api,código_fonte,servidor_http"
+
+# Tempo máximo (ms) de importação de cada alvo
+ORCAMENTO_MS = float(os.getenv("ORCAMENTO_INICIALIZACAO_MS", "250"))
+
+# Bibliotecas pesadas que só podem ser carregadas no caminho que as usa (Excel, pool Oracle, formatos colunares)
+PROIBIDOS_NA_INICIALIZACAO = ("pandas", "numpy", "openpyxl", "oracledb", "pyarrow")
+
+# Linha do "-X importtime": "import time: <próprio us> | <acumulado us> | <espaços><módulo>"
+LINHA_IMPORTTIME = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)")
+
+
+# ============================== Subalgoritmos ============================
+
+# Importa um módulo em um processo novo com "-X importtime", retornando o tempo acumulado (ms) e os módulos carregados
+def medir_importacao(modulo: str) -> tuple[float, dict[str, float]]:
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=RAIZ, capture_output=True, text=True, encoding="utf-8", check=True,
+    )
+    carregados = {}
+    for linha in processo.stderr.splitlines():
+        if encontrada := LINHA_IMPORTTIME.match(linha):
+            carregados[encontrada.group(3)] = int(encontrada.group(2)) / 1000
+    return carregados[modulo], carregados
+
+# Bibliotecas proibidas entre os módulos carregados
+def bibliotecas_proibidas(carregados: dict[str, float]) -> list[str]:
+    return sorted({nome.split(".")[0] for nome in carregados} & set(PROIBIDOS_NA_INICIALIZACAO))
+
+# Tempo total (ms) de um processo da linha de comando (interpretador + importações + --help)
+def medir_processo(argumentos: list[str]) -> float:
+    inicio = time.perf_counter()
+    subprocess.run([sys.executable, *argumentos], cwd=RAIZ, capture_output=True, check=True)
+    return (time.perf_counter() - inicio) * 1000
+
+# Mede a inicialização dos módulos e confere o orçamento, retornando o código de saída (1 se algum alvo estourar)
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Tempo de inicialização (python -X importtime) com orçamento.")
+    parser.add_argument("--alvos", default=ALVOS_PADRAO, help="Módulos medidos, separados por vírgula")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Processos por módulo (vale o menor tempo)")
+    parser.add_argument("--orcamento", type=float, default=ORCAMENTO_MS, help="Tempo máximo de importação (ms)")
+    parser.add_argument("--detalhes", type=int, default=0, metavar="N", help="Mostra os N módulos mais lentos de cada alvo")
+    args = parser.parse_args()
+
+    falhas = []
+    print(f"\n=== Importação (menor de {args.repeticoes}; orçamento {args.orcamento:.0f} ms) ===")
+    print(f"{'Módulo':<16}{'ms':>10}  Situação")
+    for modulo in (alvo.strip() for alvo in args.alvos.split(",") if alvo.strip()):
+        medicoes = [medir_importacao(modulo) for _ in range(args.repeticoes)]
+        melhor, carregados = min(medicoes, key=lambda medicao: medicao[0])
+        proibidos = bibliotecas_proibidas(carregados)
+
+        problemas = []
+        if melhor > args.orcamento:
+            problemas.append("acima do orçamento")
+        if proibidos:
+            problemas.append("carrega " + ", ".join(proibidos))
+        print(f"{modulo:<16}{melhor:>10.1f}  {'; '.join(problemas) or 'ok'}")
+        if problemas:
+            falhas.append(modulo)
+
+        if args.detalhes:
+            mais_lentos = sorted(
+                ((nome, ms) for nome, ms in carregados.items() if nome != modulo), key=lambda item: -item[1]
+            )
+            for nome, ms in mais_lentos[: args.detalhes]:
+                print(f"    {nome:<40}{ms:>10.1f}")
+
+    # Processo completo, como o usuário percebe (informativo)
+    ajuda = min(medir_processo(["cli.py", "--help"]) for _ in range(args.repeticoes))
+    print(f"\n'python cli.py --help': {ajuda:.0f} ms")
+
+    if falhas:
+        print(f"\n🔴 Inicialização fora do orçamento: {', '.join(falhas)}")
+        return 1
+    print("\n🟢 Inicialização dentro do orçamento.")
+    return 0
+
+
+# Executa o benchmark de inicialização
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+# ================================ Imports ================================
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+# Permite importar o código-fonte a partir da raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# ============================= Configurações =============================
+
+# Arquivo com o histórico dos resultados (uma entrada por execução)
+ARQUIVO_HISTORICO = "benchmarks_historico.json"
+
+# Quantas vezes um tempo (ou pico de memória) pode crescer em relação à execução anterior antes de alertar
+FATOR_REGRESSAO = 1.5
+
+# Diferença mínima para considerar regressão (abaixo disso é ruído de medição)
+DIFERENCA_MINIMA_SEGUNDOS = 0.005
+DIFERENCA_MINIMA_MB = 1.0
+
+# Quantidades de projetos usadas nas consultas e exportações
+TAMANHOS_PADRAO = "10000,100000"
+
+# Semente dos dados gerados (mesmos projetos em todas as execuções)
+SEMENTE = 42
+
+
+# ============================== Subalgoritmos ============================
+
+# Menor tempo de várias repetições de uma função (a repetição menos afetada por ruído)
+def melhor_tempo(funcao, repeticoes: int) -> tuple[float, object]:
+    melhor, resultado = float("inf"), None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+# Pico de memória (MB) alocada pelo Python durante uma execução da função
+def pico_memoria(funcao) -> float:
+    tracemalloc.start()
+    try:
+        funcao()
+        return tracemalloc.get_traced_memory()[1] / 1_048_576
+    finally:
+        tracemalloc.stop()
+
+# Resultado de um benchmark de vazão
+def resultado_vazao(segundos: float, operacoes: int, pico_mb: float | None = None) -> dict:
+    resultado = {"segundos": round(segundos, 6), "operacoes": operacoes, "por_segundo": round(operacoes / segundos, 1) if segundos else 0.0}
+    if pico_mb is not None:
+        resultado["pico_mb"] = round(pico_mb, 2)
+    return resultado
+
+# Abre (ou gera) o banco SQLite com a quantidade de projetos pedida; o banco é reaproveitado entre execuções
+def preparar_banco(pasta: str, total: int):
+    from gerador_dados import popular_projetos
+    from repositorio import criar_repositorio_sqlite
+
+    caminho = os.path.join(pasta, f"projetos_{total}.db")
+    repositorio = criar_repositorio_sqlite(caminho)
+    existentes = repositorio.contar_projetos()
+    if existentes == 0:
+        popular_projetos(repositorio, total, semente=SEMENTE)
+    elif existentes != total:
+        # Geração interrompida em uma execução anterior
+        raise SystemExit(f"🔴 {caminho} tem {existentes:,} projetos em vez de {total:,}; remova o arquivo e execute de novo.")
+    return repositorio
+
+# Inserção de projetos um a um (um commit por projeto) e em lote (um executemany)
+def benchmark_insercao(pasta: str, quantidade: int, repeticoes: int) -> dict:
+    from gerador_dados import gerar_lote_projetos, popular_referencias
+    from repositorio import criar_repositorio_sqlite
+
+    caminho = os.path.join(pasta, "insercao.db")
+
+    # Cada repetição começa com um banco vazio
+    def banco_vazio():
+        for sufixo in ("", "-journal", "-wal", "-shm"):
+            if os.path.exists(caminho + sufixo):
+                os.remove(caminho + sufixo)
+        repositorio = criar_repositorio_sqlite(caminho)
+        ids_tipo_fonte, ids_regiao = popular_referencias(repositorio)
+        return repositorio, gerar_lote_projetos(quantidade, ids_tipo_fonte, ids_regiao, random.Random(SEMENTE))
+
+    def inserir_um_a_um():
+        repositorio, lote = banco_vazio()
+        inicio = time.perf_counter()
+        for dados in lote:
+            repositorio.inserir_projeto(dados)
+        return time.perf_counter() - inicio
+
+    def inserir_em_lote():
+        repositorio, lote = banco_vazio()
+        inicio = time.perf_counter()
+        repositorio.inserir_projetos(lote)
+        return time.perf_counter() - inicio
+
+    resultados = {}
+    for nome, funcao in (("inserir_unitario", inserir_um_a_um), ("inserir_lote", inserir_em_lote)):
+        segundos = min(funcao() for _ in range(repeticoes))  # Mede só a inserção, sem preparar o banco
+        resultados[f"{nome}[{quantidade}]"] = resultado_vazao(segundos, quantidade)
+    os.remove(caminho)
+    return resultados
+
+# Consulta paginada de todos os projetos (o caminho de consultar_projetos)
+def benchmark_consulta(repositorio, total: int, repeticoes: int) -> dict:
+    import código_fonte as cf
+
+    def consultar():
+        return sum(len(pagina) for pagina in repositorio.paginar_projetos(None, cf.TAMANHO_LOTE_CONSULTA))
+
+    segundos, linhas = melhor_tempo(consultar, repeticoes)
+    return {f"consultar_projetos[{total}]": resultado_vazao(segundos, linhas)}
+
+# Exportação para JSON (tempo e pico de memória), lendo os projetos do banco como na aplicação
+def benchmark_exportacao_json(repositorio, pasta: str, total: int, repeticoes: int, medir_memoria: bool) -> dict:
+    import código_fonte as cf
+
+    caminho = os.path.join(pasta, "exportacao.json")
+
+    def exportar():
+        linhas = itertools.chain.from_iterable(repositorio.paginar_projetos(None, cf.TAMANHO_LOTE_CONSULTA))
+        return cf.gravar_json(linhas, caminho)["linhas"]
+
+    segundos, linhas = melhor_tempo(exportar, repeticoes)
+    pico_mb = pico_memoria(exportar) if medir_memoria else None  # Medido à parte: o tracemalloc deixa a execução mais lenta
+    os.remove(caminho)
+    return {f"exportar_json[{total}]": resultado_vazao(segundos, linhas, pico_mb)}
+
+# Exportação para Excel via pandas (limitada, pois o openpyxl é muito mais lento que os demais formatos)
+def benchmark_exportacao_excel(repositorio, pasta: str, total: int, limite: int, repeticoes: int, medir_memoria: bool) -> dict:
+    import código_fonte as cf
+
+    caminho = os.path.join(pasta, "exportacao.xlsx")
+    quantidade = min(total, limite)
+
+    def exportar():
+        linhas = itertools.chain.from_iterable(repositorio.paginar_projetos(None, cf.TAMANHO_LOTE_CONSULTA))
+        return cf.gravar_excel(itertools.islice(linhas, quantidade), caminho)["linhas"]
+
+    segundos, linhas = melhor_tempo(exportar, repeticoes)
+    pico_mb = pico_memoria(exportar) if medir_memoria else None
+    os.remove(caminho)
+    return {f"exportar_excel[{quantidade}]": resultado_vazao(segundos, linhas, pico_mb)}
+
+# Latência das buscas nas tabelas de referência usadas por listar_opcoes (com e sem o cache)
+def benchmark_referencias(repositorio, buscas: int) -> dict:
+    import código_fonte as cf
+
+    # As buscas do código-fonte usam o repositório global: aponta-o para o banco do benchmark
+    cf._repositorio = repositorio
+    resultados = {}
+    for nome, invalidar in (("buscar_referencia_cache", False), ("buscar_referencia_banco", True)):
+        tempos = []
+        for _ in range(buscas):
+            if invalidar:
+                cf.invalidar_cache_referencia("TBL_TIPO_FONTES")
+            inicio = time.perf_counter()
+            cf.carregar_referencia("TBL_TIPO_FONTES", "ID_TIPO_FONTE", "NOME")
+            tempos.append(time.perf_counter() - inicio)
+        tempos.sort()
+        resultados[nome] = {
+            "segundos": round(statistics.median(tempos), 9),  # Mediana de uma busca
+            "p95": round(tempos[int(0.95 * (len(tempos) - 1))], 9),
+            "operacoes": buscas,
+        }
+    return resultados
+
+# Compara uma execução com a anterior, retornando os alertas de tempo ou memória maiores
+def comparar_execucoes(anterior: dict, atual: dict, fator: float = FATOR_REGRESSAO) -> list[str]:
+    alertas = []
+    for nome, resultado in atual["resultados"].items():
+        antes = anterior["resultados"].get(nome)
+        if not antes:
+            continue
+        if (
+            resultado["segundos"] > antes["segundos"] * fator
+            and resultado["segundos"] - antes["segundos"] >= DIFERENCA_MINIMA_SEGUNDOS
+        ):
+            alertas.append(f"{nome}: tempo {resultado['segundos'] / antes['segundos']:.1f}x maior ({antes['segundos']:.4f} → {resultado['segundos']:.4f} s)")
+        if (
+            "pico_mb" in resultado and "pico_mb" in antes
+            and resultado["pico_mb"] > antes["pico_mb"] * fator
+            and resultado["pico_mb"] - antes["pico_mb"] >= DIFERENCA_MINIMA_MB
+        ):
+            alertas.append(f"{nome}: memória {resultado['pico_mb'] / antes['pico_mb']:.1f}x maior ({antes['pico_mb']:.1f} → {resultado['pico_mb']:.1f} MB)")
+    return alertas
+
+# Lê o histórico de execuções
+def ler_historico(nome_arquivo: str = ARQUIVO_HISTORICO) -> list[dict]:
+    if not os.path.exists(nome_arquivo):
+        return []
+    with open(nome_arquivo, "r", encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+# Acrescenta uma execução ao histórico
+def gravar_historico(execucao: dict, nome_arquivo: str = ARQUIVO_HISTORICO) -> None:
+    historico = ler_historico(nome_arquivo)
+    historico.append(execucao)
+    with open(nome_arquivo, "w", encoding="utf-8") as arquivo:
+        json.dump(historico, arquivo, ensure_ascii=False, indent=2)
+
+# Exibe os resultados em uma tabela
+def exibir_resultados(resultados: dict) -> None:
+    print(f"\n{'Benchmark':<34}{'Tempo (s)':>12}{'Operações/s':>16}{'Pico (MB)':>12}")
+    for nome, resultado in resultados.items():
+        por_segundo = f"{resultado['por_segundo']:,.0f}" if "por_segundo" in resultado else "-"
+        pico = f"{resultado['pico_mb']:.1f}" if "pico_mb" in resultado else "-"
+        print(f"{nome:<34}{resultado['segundos']:>12.6f}{por_segundo:>16}{pico:>12}")
+
+# Executa a suíte, grava o resultado no histórico e compara com a execução anterior
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de inserção, consulta, exportação e buscas de referência (SQLite).")
+    parser.add_argument("--tamanhos", default=TAMANHOS_PADRAO, help="Quantidades de projetos separadas por vírgula (ex.: 10000,100000,1000000)")
+    parser.add_argument("--insercoes", type=int, default=2_000, help="Projetos inseridos nos benchmarks de inserção")
+    parser.add_argument("--linhas-excel", type=int, default=20_000, help="Máximo de projetos na exportação para Excel")
+    parser.add_argument("--buscas", type=int, default=1_000, help="Buscas nas tabelas de referência")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Repetições de cada benchmark (vale o menor tempo)")
+    parser.add_argument("--pasta", help="Pasta dos bancos gerados (reaproveitados entre execuções); padrão: temporária")
+    parser.add_argument("--sem-memoria", action="store_true", help="Não mede o pico de memória das exportações")
+    parser.add_argument("--historico", default=ARQUIVO_HISTORICO, help="Arquivo JSON com as execuções anteriores")
+    parser.add_argument("--fator", type=float, default=FATOR_REGRESSAO, help="Aumento considerado regressão")
+    parser.add_argument("--apenas", help="Executa só os benchmarks cujo nome contém este texto (ex.: exportar)")
+    args = parser.parse_args()
+
+    pasta_temporaria = None if args.pasta else tempfile.TemporaryDirectory()
+    pasta = args.pasta or pasta_temporaria.name
+    os.makedirs(pasta, exist_ok=True)
+    tamanhos = [int(tamanho) for tamanho in args.tamanhos.split(",")]
+    incluir = lambda nome: not args.apenas or args.apenas in nome
+
+    resultados = {}
+    if incluir("inserir"):
+        print(f"🔵 Inserção de {args.insercoes:,} projetos...")
+        resultados.update(benchmark_insercao(pasta, args.insercoes, args.repeticoes))
+    for total in tamanhos:
+        if not any(incluir(nome) for nome in ("consultar_projetos", "exportar_json", "exportar_excel", "buscar_referencia")):
+            break
+        print(f"🔵 Preparando o banco com {total:,} projetos...")
+        repositorio = preparar_banco(pasta, total)
+        if incluir("consultar_projetos"):
+            resultados.update(benchmark_consulta(repositorio, total, args.repeticoes))
+        if incluir("exportar_json"):
+            resultados.update(benchmark_exportacao_json(repositorio, pasta, total, args.repeticoes, not args.sem_memoria))
+        if incluir("exportar_excel") and (total == tamanhos[0] or total <= args.linhas_excel):
+            resultados.update(
+                benchmark_exportacao_excel(repositorio, pasta, total, args.linhas_excel, args.repeticoes, not args.sem_memoria)
+            )
+        if incluir("buscar_referencia") and total == tamanhos[0]:
+            resultados.update(benchmark_referencias(repositorio, args.buscas))
+    if pasta_temporaria:
+        pasta_temporaria.cleanup()
+
+    execucao = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+    }
+    exibir_resultados(resultados)
+
+    # Compara com a última execução no mesmo ambiente
+    anteriores = [
+        e for e in ler_historico(args.historico)
+        if e["python"] == execucao["python"] and e["plataforma"] == execucao["plataforma"]
+    ]
+    alertas = comparar_execucoes(anteriores[-1], execucao, args.fator) if anteriores else []
+    gravar_historico(execucao, args.historico)
+    for alerta in alertas:
+        print(f"🔴 {alerta}")
+    if not alertas:
+        print(f"\n🟢 {len(resultados)} benchmark(s) executado(s) sem regressões.")
+    return 1 if alertas else 0
+
+
+# Executa a suíte
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,424 @@
+# ================================ Imports ================================
+import argparse
+import json
+import os
+import shlex
+import sys
+
+import api
+import metricas
+import relatorios
+
+
+# ============================= Configurações =============================
+
+# Apelidos aceitos para o status na linha de comando
+APELIDOS_STATUS = {
+    "andamento": "Em andamento",
+    "em-andamento": "Em andamento",
+    "em andamento": "Em andamento",
+    "concluido": "Concluído",
+    "concluído": "Concluído",
+}
+
+
+# ============================== Subalgoritmos ============================
+
+# Converte o status digitado para o valor gravado no banco
+def converter_status(valor: str) -> str:
+    status = APELIDOS_STATUS.get(valor.strip().lower())
+    if not status:
+        raise argparse.ArgumentTypeError(f"status inválido: {valor!r} (use 'andamento' ou 'concluido')")
+    return status
+
+# Converte a lista de dimensões separadas por vírgula
+def converter_dimensoes(valor: str) -> tuple[str, ...]:
+    dimensoes = tuple(parte.strip() for parte in valor.split(",") if parte.strip())
+    invalidas = [dimensao for dimensao in dimensoes if dimensao not in relatorios.DIMENSOES]
+    if invalidas or not dimensoes:
+        raise argparse.ArgumentTypeError(f"dimensões inválidas: {valor!r} (use {', '.join(relatorios.DIMENSOES)})")
+    return dimensoes
+
+# Converte a lista de formatos de exportação separados por vírgula (sem repetições, na ordem digitada)
+def converter_formatos(valor: str) -> list[str]:
+    formatos = list(dict.fromkeys(parte.strip().lower() for parte in valor.split(",") if parte.strip()))
+    invalidos = [formato for formato in formatos if formato not in api.FORMATOS_EXPORTACAO]
+    if invalidos or not formatos:
+        raise argparse.ArgumentTypeError(f"formatos inválidos: {valor!r} (use {', '.join(api.FORMATOS_EXPORTACAO)})")
+    return formatos
+
+# Converte uma lista de IDs separados por vírgula
+def converter_ids(valor: str) -> list[int]:
+    try:
+        return [int(parte) for parte in valor.split(",") if parte.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"lista de IDs inválida: {valor!r}") from None
+
+# Converte um valor único ("0.05") ou por ID ("1=0.05,2=0.08") para as opções da simulação
+def converter_valores_por_id(valor: str) -> float | dict[int, float]:
+    try:
+        if "=" not in valor:
+            return float(valor)
+        return {int(id_): float(numero) for id_, numero in (parte.split("=") for parte in valor.split(",") if parte.strip())}
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"valor inválido: {valor!r} (use 0.05 ou 1=0.05,2=0.08)") from None
+
+# Converte uma troca de tipo de fonte "origem:destino=fração" ou "origem:destino=mínima-máxima"
+# (sem caracteres especiais do shell, como ">", para não precisar de aspas)
+def converter_troca(valor: str) -> tuple[tuple[int, int], float | tuple[float, float]]:
+    try:
+        fontes, fracao = valor.split("=")
+        origem, destino = (int(parte) for parte in fontes.split(":"))
+        if "-" in fracao:
+            minimo, maximo = (float(parte) for parte in fracao.split("-"))
+            return (origem, destino), (minimo, maximo)
+        return (origem, destino), float(fracao)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"troca inválida: {valor!r} (use 1:2=0.3 ou 1:2=0.1-0.5)") from None
+
+# Acrescenta as opções de seleção das operações em lote (IDs, intervalo e filtro)
+def adicionar_selecao(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--ids", type=converter_ids, help="IDs separados por vírgula")
+    parser.add_argument("--de", type=int, dest="id_inicial", help="Primeiro ID do intervalo")
+    parser.add_argument("--ate", type=int, dest="id_final", help="Último ID do intervalo")
+    parser.add_argument("--onde-status", type=converter_status, dest="filtro_status")
+    parser.add_argument("--onde-regiao", type=int, dest="filtro_regiao")
+    parser.add_argument("--onde-tipo-fonte", type=int, dest="filtro_tipo_fonte")
+
+# Escreve linhas (dicts) como texto tabulado com cabeçalho ou como JSON por linha
+def escrever_linhas(linhas, como_json: bool = False, saida=None) -> None:
+    saida = saida or sys.stdout
+    cabecalho_escrito = False
+    for linha in linhas:
+        if como_json:
+            saida.write(json.dumps(linha, ensure_ascii=False, default=str) + "\n")
+            continue
+        if not cabecalho_escrito:
+            saida.write("\t".join(linha) + "\n")
+            cabecalho_escrito = True
+        saida.write("\t".join(f"{valor:.2f}" if isinstance(valor, float) else str(valor) for valor in linha.values()) + "\n")
+
+# Monta o parser com todos os subcomandos
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Gerenciamento de projetos sustentáveis sem menus interativos.",
+    )
+    parser.add_argument(
+        "--estatisticas", action="store_true", help="Ao final, mostra execuções e análises (parses) estimadas de cada comando SQL"
+    )
+    parser.add_argument(
+        "--metricas",
+        choices=("prometheus", "json"),
+        help="Mede latência, idas e voltas ao banco, linhas e bytes por operação e mostra ao final",
+    )
+    parser.add_argument("--metricas-log", help="Grava cada operação medida neste arquivo (um objeto JSON por linha)")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    # insert
+    inserir = subcomandos.add_parser("insert", help="Cadastra um novo projeto")
+    inserir.add_argument("--descricao", required=True)
+    inserir.add_argument("--custo", type=float, required=True)
+    inserir.add_argument("--status", type=converter_status, required=True)
+    inserir.add_argument("--tipo-fonte", type=int, required=True, dest="id_tipo_fonte")
+    inserir.add_argument("--regiao", type=int, required=True, dest="id_regiao")
+
+    # update
+    atualizar = subcomandos.add_parser("update", help="Atualiza os campos informados de um projeto")
+    atualizar.add_argument("id_projeto", type=int)
+    atualizar.add_argument("--descricao")
+    atualizar.add_argument("--custo", type=float)
+    atualizar.add_argument("--status", type=converter_status)
+    atualizar.add_argument("--tipo-fonte", type=int, dest="id_tipo_fonte")
+    atualizar.add_argument("--regiao", type=int, dest="id_regiao")
+    atualizar.add_argument("--versao", type=int, help="Só atualiza se o projeto ainda estiver nesta versão")
+
+    # update-many
+    atualizar_lote = subcomandos.add_parser(
+        "update-many", help="Altera status, região e/ou tipo de fonte de vários projetos em uma única operação"
+    )
+    atualizar_lote.add_argument("--status", type=converter_status)
+    atualizar_lote.add_argument("--tipo-fonte", type=int, dest="id_tipo_fonte")
+    atualizar_lote.add_argument("--regiao", type=int, dest="id_regiao")
+    adicionar_selecao(atualizar_lote)
+
+    # delete
+    excluir = subcomandos.add_parser("delete", help="Exclui projetos pelo ID, intervalo de IDs e/ou filtro")
+    excluir.add_argument("ids_posicionais", type=int, nargs="*", metavar="ID_PROJETO")
+    adicionar_selecao(excluir)
+
+    # query
+    consultar = subcomandos.add_parser("query", help="Lista projetos")
+    consultar.add_argument("--status", type=converter_status)
+    consultar.add_argument("--limite", type=int, help="Quantidade máxima de projetos exibidos")
+    consultar.add_argument("--json", action="store_true", help="Um objeto JSON por linha em vez de texto")
+
+    # search
+    buscar = subcomandos.add_parser("search", help="Busca projetos pela descrição (prefixos, sem acentos/maiúsculas)")
+    buscar.add_argument("texto", help='Palavras da busca (ex.: "eol norte")')
+    buscar.add_argument("--status", type=converter_status)
+    buscar.add_argument("--apos", type=int, default=0, help="Continua a busca após este ID (paginação)")
+    buscar.add_argument("--limite", type=int, default=api.cf.TAMANHO_PAGINA_TELA, help="Projetos por página")
+    buscar.add_argument("--json", action="store_true", help="Um objeto JSON por linha em vez de texto")
+
+    # export
+    exportar = subcomandos.add_parser("export", help="Exporta projetos para um arquivo")
+    exportar.add_argument(
+        "--format", required=True, type=converter_formatos, dest="formatos",
+        help=f"Formato ou formatos separados por vírgula ({', '.join(api.FORMATOS_EXPORTACAO)})",
+    )
+    exportar.add_argument("--status", type=converter_status)
+    exportar.add_argument(
+        "--saida",
+        help="Caminho do arquivo gerado (padrão: projetos_<data>.<formato>); com vários formatos, o prefixo dos arquivos",
+    )
+    exportar.add_argument("--manifesto", help="Arquivo do manifesto (linhas e SHA-256 de cada arquivo gerado)")
+    exportar.add_argument(
+        "--paralelo", type=int, metavar="N", dest="paralelismo",
+        help="Lê N faixas de IDs ao mesmo tempo, cada uma em uma conexão (a ordem dos projetos é mantida)",
+    )
+    exportar.add_argument(
+        "--por-parte", action="store_true", dest="por_parte",
+        help="Grava cada faixa de IDs em um arquivo próprio (<saida>_parteNNN.<formato>) com manifesto",
+    )
+    exportar.add_argument("--partes", type=int, help="Quantidade de faixas com --por-parte (padrão: o valor de --paralelo)")
+    exportar.add_argument(
+        "--incremental", action="store_true",
+        help="Apenas projetos alterados/excluídos desde a última exportação incremental (<saida>_excluidos.json + manifesto)",
+    )
+    exportar.add_argument("--marca", default=None, help="Nome do consumidor da exportação incremental (marca d'água)")
+    exportar.add_argument(
+        "--sem-avancar", action="store_false", dest="avancar", help="Não avança a marca d'água (apenas pré-visualiza)"
+    )
+    exportar.add_argument("--compact", action="store_true", dest="compacto", help="JSON sem indentação")
+    exportar.add_argument("--gzip", action="store_true", dest="gzip_ativo", help="Compacta JSON/NDJSON com gzip")
+
+    # marks
+    marcas = subcomandos.add_parser("marks", help="Marcas d'água das exportações incrementais")
+    marcas.add_argument(
+        "--limpar-exclusoes", action="store_true", help="Remove as exclusões já exportadas por todos os consumidores"
+    )
+
+    # import
+    importar = subcomandos.add_parser("import", help="Importa projetos de um arquivo JSON, Excel ou CSV")
+    importar.add_argument("arquivo")
+    importar.add_argument("--lote", type=int, default=api.cf.TAMANHO_LOTE_IMPORTACAO)
+    importar.add_argument("--manter-ids", action="store_true")
+
+    # report
+    relatorio = subcomandos.add_parser("report", help="Relatórios de custos e emissões calculados no banco")
+    relatorio.add_argument("tipo", choices=("custos", "emissoes", "emissoes-projeto", "top"))
+    relatorio.add_argument("--por", type=converter_dimensoes, default=("regiao",), help="Dimensões: regiao,fonte,status")
+    relatorio.add_argument("--status", type=converter_status)
+    relatorio.add_argument("--n", type=int, default=10, help="Quantidade de projetos no relatório 'top'")
+    relatorio.add_argument("--json", action="store_true", help="Um objeto JSON por linha em vez de texto")
+    relatorio.add_argument("--completo", action="store_true", help="Custos agregados sobre todos os projetos, sem usar o resumo")
+
+    # simulate
+    simular = subcomandos.add_parser("simulate", help="Simula cenários de custo e emissão da carteira de projetos")
+    simular.add_argument("--cenarios", type=int, default=10_000)
+    simular.add_argument("--status", type=converter_status)
+    simular.add_argument("--anos", type=float, default=1.0, help="Anos de inflação acumulada")
+    simular.add_argument("--inflacao", type=converter_valores_por_id, default=0.0, help="Taxa anual: 0.05 ou por região 1=0.05,2=0.08")
+    simular.add_argument("--desvio-inflacao", type=converter_valores_por_id, default=0.0, help="Desvio da taxa anual (geral ou por região)")
+    simular.add_argument("--troca", type=converter_troca, action="append", default=[], dest="trocas", help="Troca de tipo de fonte origem:destino=fração, ex.: 1:2=0.3 ou 1:2=0.1-0.5")
+    simular.add_argument("--incerteza", type=converter_valores_por_id, default=0.0, help="Desvio lognormal comum do custo (geral ou por tipo de fonte)")
+    simular.add_argument("--incerteza-projeto", type=float, default=0.0, help="Desvio lognormal do custo de cada projeto")
+    simular.add_argument("--semente", type=int, help="Repete uma simulação")
+    simular.add_argument("--processos", type=int, help="Processos (padrão: vários só em simulações grandes)")
+    simular.add_argument("--json", action="store_true", help="Um objeto JSON por linha em vez de texto")
+
+    # reconcile
+    reconciliar = subcomandos.add_parser("reconcile", help="Confere o resumo de custos e o reconstrói se houver divergência")
+    reconciliar.add_argument("--apenas-verificar", action="store_true", help="Mostra as divergências sem corrigir")
+
+    # batch
+    lote = subcomandos.add_parser("batch", help="Executa vários comandos (um por linha) no mesmo processo")
+    lote.add_argument("arquivo", help="Arquivo com os comandos, ou '-' para a entrada padrão")
+    lote.add_argument("--parar-no-erro", action="store_true", help="Interrompe no primeiro comando com erro")
+    return parser
+
+# Executa um comando já interpretado pelo parser
+def executar_comando(args: argparse.Namespace) -> None:
+    if args.comando == "insert":
+        id_projeto = api.inserir_projeto(args.descricao, args.custo, args.status, args.id_tipo_fonte, args.id_regiao)
+        print(f"Projeto {id_projeto} inserido.")
+
+    elif args.comando == "update":
+        alteradas = api.atualizar_projeto(
+            args.id_projeto, args.descricao, args.custo, args.status, args.id_tipo_fonte, args.id_regiao, args.versao
+        )
+        print(f"{alteradas} projeto(s) atualizado(s).")
+
+    elif args.comando == "update-many":
+        alteradas = api.atualizar_projetos(
+            args.status, args.id_regiao, args.id_tipo_fonte, args.ids, args.id_inicial, args.id_final,
+            args.filtro_status, args.filtro_regiao, args.filtro_tipo_fonte,
+        )
+        print(f"{alteradas} projeto(s) atualizado(s).")
+
+    elif args.comando == "delete":
+        ids = (args.ids or []) + args.ids_posicionais or None
+        excluidos = api.excluir_projetos(
+            ids, args.id_inicial, args.id_final, args.filtro_status, args.filtro_regiao, args.filtro_tipo_fonte
+        )
+        print(f"{excluidos} projeto(s) excluído(s).")
+
+    elif args.comando == "query":
+        saida = sys.stdout
+        for numero, projeto in enumerate(api.consultar_projetos(args.status), start=1):
+            if args.limite and numero > args.limite:
+                break
+            if args.json:
+                saida.write(json.dumps(api.cf._projeto_para_dict(projeto), ensure_ascii=False) + "\n")
+            else:
+                saida.write("\t".join(str(campo) for campo in projeto) + "\n")
+
+    elif args.comando == "search":
+        pagina, proximo = api.buscar_projetos(args.texto, args.status, args.apos, args.limite)
+        for projeto in pagina:
+            if args.json:
+                sys.stdout.write(json.dumps(api.cf._projeto_para_dict(projeto), ensure_ascii=False) + "\n")
+            else:
+                sys.stdout.write("\t".join(str(campo) for campo in projeto) + "\n")
+        if proximo is not None:
+            print(f"Próxima página: --apos {proximo}", file=sys.stderr)
+
+    elif args.comando == "export":
+        if args.incremental:
+            if len(args.formatos) > 1 or args.por_parte:
+                raise ValueError("--incremental aceita um único formato, sem --por-parte.")
+            manifesto = api.exportar_alteracoes(
+                args.formatos[0], args.saida, args.marca or api.exportacao_incremental.MARCA_PADRAO,
+                args.compacto, args.gzip_ativo, args.avancar,
+            )
+            print(f"Alterações {manifesto['desde']} → {manifesto['ate']} (marca '{manifesto['marca']}').")
+        elif args.por_parte:
+            if len(args.formatos) > 1:
+                raise ValueError("--por-parte aceita um único formato.")
+            # Uma faixa de IDs por arquivo, lidas e gravadas em paralelo
+            manifesto = api.exportar_particoes(
+                args.formatos[0], args.saida, args.status, args.paralelismo or api.extracao_paralela.GRAU_PARALELISMO,
+                args.partes, args.manifesto, args.compacto, args.gzip_ativo,
+            )
+        elif len(args.formatos) == 1 and not args.manifesto:
+            estatisticas = api.exportar_projetos(
+                args.formatos[0], args.saida, args.status, args.compacto, args.gzip_ativo, args.paralelismo
+            )
+            print(f"{estatisticas['linhas']} projeto(s) exportado(s) para {estatisticas['arquivo']} ({estatisticas['bytes']:,} bytes).")
+            return
+        else:
+            # Vários formatos: uma única leitura dos projetos alimenta todos os arquivos
+            manifesto = api.exportar_varios(
+                args.formatos, args.saida, args.status, args.manifesto, args.compacto, args.gzip_ativo, args.paralelismo
+            )
+        for arquivo in manifesto["arquivos"]:
+            print(f"{arquivo['linhas']} projeto(s) exportado(s) para {arquivo['arquivo']} ({arquivo['bytes']:,} bytes).")
+        print(f"Manifesto: {manifesto['manifesto']}")
+        if manifesto["erros"]:
+            raise RuntimeError("; ".join(f"{formato}: {erro}" for formato, erro in manifesto["erros"].items()))
+
+    elif args.comando == "marks":
+        marcas, removidas = api.marcas_exportacao(args.limpar_exclusoes)
+        for nome, id_alteracao, atualizada_em in marcas:
+            print(f"{nome}\t{id_alteracao}\t{atualizada_em}")
+        if args.limpar_exclusoes:
+            print(f"{removidas} exclusão(ões) removida(s).")
+
+    elif args.comando == "import":
+        resumo = api.importar_projetos(args.arquivo, args.lote, args.manter_ids)
+        print(f"{resumo['inseridas']} de {resumo['lidas']} projeto(s) importado(s).")
+        for numero, mensagem in resumo["erros"]:
+            print(f"Linha {numero}: {mensagem}", file=sys.stderr)
+
+    elif args.comando == "report":
+        if args.tipo == "custos":
+            linhas = api.relatorio_custos(args.por, args.status, usar_resumo=not args.completo)
+        elif args.tipo == "emissoes":
+            linhas = api.relatorio_emissoes(args.por, args.status)
+        elif args.tipo == "emissoes-projeto":
+            linhas = api.emissoes_por_projeto(args.status)
+        else:
+            linhas = api.projetos_mais_caros(args.n, args.status)
+        escrever_linhas(linhas, args.json)
+
+    elif args.comando == "simulate":
+        resultado = api.simular_cenarios(
+            args.cenarios, args.status, args.inflacao, args.desvio_inflacao, args.anos, dict(args.trocas),
+            args.incerteza, args.incerteza_projeto, args.semente, args.processos,
+        )
+        escrever_linhas(api.linhas_simulacao(resultado), args.json)
+        print(
+            f"{resultado['cenarios']} cenário(s) de {resultado['projetos']} projeto(s) em {resultado['segundos']} s "
+            f"({resultado['processos']} processo(s), semente {resultado['semente']}).",
+            file=sys.stderr,
+        )
+
+    elif args.comando == "reconcile":
+        divergencias = api.reconciliar_resumo(corrigir=not args.apenas_verificar)
+        escrever_linhas(divergencias)
+        if not divergencias:
+            print("Resumo consistente com os projetos.")
+        elif not args.apenas_verificar:
+            print(f"{len(divergencias)} grupo(s) divergente(s); resumo reconstruído.")
+
+    elif args.comando == "batch":
+        executar_lote(args.arquivo, args.parar_no_erro)
+
+# Executa os comandos de um arquivo (um por linha, com a mesma sintaxe da linha de comando)
+def executar_lote(nome_arquivo: str, parar_no_erro: bool = False) -> None:
+    parser = criar_parser()
+    arquivo = sys.stdin if nome_arquivo == "-" else open(nome_arquivo, "r", encoding="utf-8")
+    executados, falhas = 0, 0
+    try:
+        for numero, linha in enumerate(arquivo, start=1):
+            linha = linha.strip()
+            if not linha or linha.startswith("#"):
+                continue
+            try:
+                args = parser.parse_args(shlex.split(linha))
+                if args.comando == "batch":
+                    raise ValueError("comandos 'batch' não podem ser aninhados")
+                with metricas.medir("cli:" + args.comando):
+                    executar_comando(args)
+                executados += 1
+            except (Exception, SystemExit) as e:
+                falhas += 1
+                print(f"Linha {numero}: {e}", file=sys.stderr)
+                if parar_no_erro:
+                    break
+    finally:
+        if arquivo is not sys.stdin:
+            arquivo.close()
+    print(f"{executados} comando(s) executado(s), {falhas} com erro.")
+    if falhas:
+        raise RuntimeError(f"{falhas} comando(s) do lote falharam.")
+
+# Ponto de entrada da linha de comando
+def main(argv: list[str] | None = None) -> int:
+    args = criar_parser().parse_args(argv)
+    if args.metricas or args.metricas_log:
+        metricas.ativar(args.metricas_log)
+    try:
+        with metricas.medir("cli:" + args.comando):
+            executar_comando(args)
+        return 0
+    except BrokenPipeError:
+        # Quem lia a saída fechou o pipe (por exemplo, "| head"): encerra em silêncio. A saída padrão passa a apontar
+        # para o devnull, para o flush final do Python não falhar de novo
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except Exception as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if args.estatisticas:
+            escrever_linhas(api.estatisticas_comandos(), saida=sys.stderr)
+        if args.metricas:
+            sys.stderr.write(metricas.texto_prometheus() if args.metricas == "prometheus" else metricas.texto_json() + "\n")
+        api.encerrar()
+
+
+# Executa a linha de comando
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+# ================================ Imports ================================
+import os
+import threading
+from collections import OrderedDict
+
+import metricas
+
+
+# ============================= Configurações =============================
+
+# Comandos preparados mantidos em cache por conexão (stmtcachesize no Oracle, cached_statements no SQLite)
+TAMANHO_CACHE_COMANDOS = int(os.getenv("TAMANHO_CACHE_COMANDOS", "40"))
+
+# Sessões cujo cache é acompanhado; além disso, as usadas há mais tempo são esquecidas
+SESSOES_ACOMPANHADAS = int(os.getenv("SESSOES_ACOMPANHADAS", "256"))
+
+
+# ========================= Registro de comandos ==========================
+
+# Registro central dos comandos SQL: texto fixo por nome, valores sempre em variáveis de ligação.
+# Conta, por comando, as execuções e as análises (parses) que o cache de comandos não evitou. As análises são uma
+# estimativa do lado do cliente: o cache de cada sessão é simulado aqui, sem consultar o banco.
+class RegistroComandos:
+    def __init__(
+        self, dialeto: str, tamanho_cache: int = TAMANHO_CACHE_COMANDOS, sessoes: int = SESSOES_ACOMPANHADAS
+    ):
+        self.dialeto = dialeto
+        self.tamanho_cache = tamanho_cache
+        self.sessoes = sessoes
+        self._textos: dict[str, str] = {}
+        self._contadores: dict[str, list[int]] = {}  # nome -> [execuções, análises]
+        # id da sessão -> (sessão, textos em cache em ordem LRU). Guardar a sessão impede que o id seja reaproveitado
+        # por outra enquanto a entrada existe (as sessões do oracledb e do sqlite3 não aceitam referências fracas)
+        self._caches: OrderedDict[int, tuple[object, OrderedDict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Registra um comando (texto único ou um texto por dialeto); registrar de novo o mesmo texto não tem efeito
+    def registrar(self, nome: str, texto: str | dict) -> str:
+        if isinstance(texto, dict):
+            texto = texto[self.dialeto]
+        with self._lock:
+            atual = self._textos.get(nome)
+            if atual is not None and atual != texto:
+                raise ValueError(f"Comando '{nome}' já registrado com outro texto.")
+            self._textos[nome] = texto
+            self._contadores.setdefault(nome, [0, 0])
+        return texto
+
+    # Registra vários comandos de uma vez ({nome: texto})
+    def registrar_todos(self, comandos: dict) -> None:
+        for nome, texto in comandos.items():
+            self.registrar(nome, texto)
+
+    # Retorna o texto de um comando registrado
+    def texto(self, nome: str) -> str:
+        try:
+            return self._textos[nome]
+        except KeyError:
+            raise ValueError(f"Comando não registrado: {nome}") from None
+
+    # Contabiliza uma execução do comando na conexão e retorna o seu texto
+    def preparar(self, nome: str, conexao) -> str:
+        texto = self.texto(nome)
+        sessao = getattr(conexao, "_impl", conexao)  # Conexões do pool reaproveitam a mesma sessão
+        with self._lock:
+            entrada = self._caches.get(id(sessao))
+            if entrada is None:
+                entrada = self._caches[id(sessao)] = (sessao, OrderedDict())
+                if len(self._caches) > self.sessoes:
+                    self._caches.popitem(last=False)  # Sessão usada há mais tempo (talvez já encerrada)
+            else:
+                self._caches.move_to_end(id(sessao))
+            cache = entrada[1]
+            contador = self._contadores[nome]
+            contador[0] += 1
+            if texto in cache:
+                cache.move_to_end(texto)  # Encontrado no cache: nenhuma nova análise
+            else:
+                contador[1] += 1
+                cache[texto] = None
+                if len(cache) > self.tamanho_cache:
+                    cache.popitem(last=False)
+        return texto
+
+    # Executa um comando registrado em um cursor (medido como a operação "sql:<nome>")
+    def executar(self, cursor, nome: str, parametros: dict | None = None):
+        with metricas.medir("sql:" + nome):
+            return cursor.execute(self.preparar(nome, cursor.connection), parametros or {})
+
+    # Executa um comando registrado para vários conjuntos de parâmetros
+    def executar_muitos(self, cursor, nome: str, parametros: list, **kwargs):
+        with metricas.medir("sql:" + nome):
+            return cursor.executemany(self.preparar(nome, cursor.connection), parametros, **kwargs)
+
+    # Esquece o cache de uma conexão encerrada
+    def descartar(self, conexao) -> None:
+        with self._lock:
+            self._caches.pop(id(getattr(conexao, "_impl", conexao)), None)
+
+    # Execuções e análises estimadas de cada comando já executado
+    def estatisticas(self) -> list[dict]:
+        with self._lock:
+            contadores = {nome: tuple(valores) for nome, valores in self._contadores.items() if valores[0]}
+        return [
+            {
+                "COMANDO": nome,
+                "EXECUCOES": execucoes,
+                "ANALISES_ESTIMADAS": analises,
+                "REUSO": 1 - analises / execucoes,
+            }
+            for nome, (execucoes, analises) in sorted(contadores.items(), key=lambda item: -item[1][0])
+        ]
+
+    # Zera os contadores (os comandos continuam registrados)
+    def zerar(self) -> None:
+        with self._lock:
+            for contador in self._contadores.values():
+                contador[0] = contador[1] = 0
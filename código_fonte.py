@@ -1,50 +1,247 @@
 # ================================ Imports ================================ 
-import oracledb
+# oracledb, pyarrow e openpyxl são importados apenas quando usados (pool Oracle e exportações): a inicialização
+# do menu e da linha de comando não paga o custo de carregá-los
 import json
-import pandas as pd
 from datetime import datetime
 import os
+import sys
+import threading
+import time
+import csv
+import gzip
+from typing import TYPE_CHECKING
+from repositorio import Repositorio, CONSULTA_PROJETOS, ConflitoDeVersao, criar_repositorio_oracle, criar_repositorio_sqlite
+from projeto import Projeto
+from comandos import TAMANHO_CACHE_COMANDOS
+import relatorios
+import metricas
+
+if TYPE_CHECKING:
+    import oracledb
+
+
+# ============================= Configurações =============================
+
+# Banco de dados utilizado: "oracle" ou "sqlite" (para testes e benchmarks locais)
+BACKEND_BD = os.getenv("BACKEND_BD", "oracle")
+SQLITE_CAMINHO = os.getenv("SQLITE_CAMINHO", "projetos.db")
+
+# Credenciais de acesso ao Banco de Dados
+DB_USUARIO = "SEU USUÁRIO"
+DB_SENHA = "SUA SENHA"
+DB_DSN = "(DESCRIPTION=(ADDRESS=(PROTOCOL= SEU PROTOCOL)(HOST= SEU HOST)(PORT= SEU PORT))(CONNECT_DATA=(SID= SEU SID)))"
+
+# Parâmetros do pool de conexões (podem ser sobrescritos por variáveis de ambiente)
+POOL_MIN = int(os.getenv("POOL_MIN", "1"))  # Conexões abertas na criação do pool
+POOL_MAX = int(os.getenv("POOL_MAX", "4"))  # Limite de conexões simultâneas
+POOL_INCREMENTO = int(os.getenv("POOL_INCREMENTO", "1"))  # Conexões abertas a cada crescimento
+POOL_TIMEOUT_AQUISICAO = float(os.getenv("POOL_TIMEOUT_AQUISICAO", "5"))  # Espera máxima (s) por uma conexão livre
+
+# Pool compartilhado pelo processo inteiro (criado sob demanda)
+_pool: "oracledb.ConnectionPool | None" = None
+_pool_lock = threading.Lock()
+
+# Repositório de dados do backend configurado (criado sob demanda)
+_repositorio: Repositorio | None = None
+_repositorio_lock = threading.Lock()
+
+# Métricas de uso do pool
+_metricas_pool = {
+    "aquisicoes": 0,  # Total de conexões emprestadas
+    "reaproveitadas": 0,  # Empréstimos atendidos por conexões já abertas
+    "novas": 0,  # Empréstimos que obrigaram o pool a abrir conexões
+    "falhas": 0,  # Empréstimos que falharam (timeout ou erro)
+    "espera_total": 0.0,  # Tempo total (s) aguardando o pool
+    "espera_max": 0.0,  # Maior espera (s) registrada
+}
+
+# Tempo (s) em que as tabelas de referência ficam em cache sem revalidação
+CACHE_TTL_REFERENCIA = float(os.getenv("CACHE_TTL_REFERENCIA", "300"))
+
+# Cache em memória das tabelas de referência: tabela -> {id: nome} e versão
+_cache_referencia: dict[str, dict] = {}
+_cache_lock = threading.Lock()
+
+# Quantidade de linhas enviadas ao banco por executemany() na importação
+TAMANHO_LOTE_IMPORTACAO = int(os.getenv("TAMANHO_LOTE_IMPORTACAO", "1000"))
+
+# Status aceitos para um projeto
+STATUS_VALIDOS = ("Em andamento", "Concluído")
+
+# Paginação das consultas de projetos
+TAMANHO_PAGINA_TELA = int(os.getenv("TAMANHO_PAGINA_TELA", "20"))  # Projetos exibidos por página no terminal
+TAMANHO_LOTE_CONSULTA = int(os.getenv("TAMANHO_LOTE_CONSULTA", "1000"))  # Projetos buscados por ida ao banco nas exportações
+
+# Quantidade de projetos acumulados antes de cada escrita no arquivo exportado
+INTERVALO_FLUSH_EXPORTACAO = int(os.getenv("INTERVALO_FLUSH_EXPORTACAO", "1000"))
+
+# Colunas gravadas nas exportações
+COLUNAS_EXPORTACAO = ("ID_PROJETO", "DESCRICAO", "CUSTO", "STATUS", "ID_TIPO_FONTE", "ID_REGIAO")
+
+# Projetos por lote colunar (Arrow) nas exportações Parquet/Feather/CSV
+TAMANHO_LOTE_COLUNAR = int(os.getenv("TAMANHO_LOTE_COLUNAR", "100000"))
+
+# Limite de linhas de dados por aba do Excel (1.048.576 linhas menos o cabeçalho)
+LIMITE_LINHAS_EXCEL = 1_048_575
 
 
 # ============================== Subalgoritmos ============================
 
 # Limpa o terminal para uma exibição mais limpa
 def limpar_terminal() -> None:
-    # Determina o comando para limpar o terminal dependendo do sistema operacional
-    os.system("cls" if os.name == "nt" else "clear")
+    if not sys.stdout.isatty():
+        return  # Saída redirecionada: não há tela para limpar
+    if os.name == "nt":
+        os.system("cls")
+    else:
+        # Sequência ANSI: limpa a tela sem abrir um processo de shell
+        print("\033[2J\033[H", end="", flush=True)
 
-# Estabelece conexão com o Banco de Dados
-def conectarBD() -> oracledb.Connection | None:
+# Cria (uma única vez) o pool de conexões compartilhado
+def obter_pool() -> "oracledb.ConnectionPool":
+    import oracledb
+
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = oracledb.create_pool(
+                user=DB_USUARIO,
+                password=DB_SENHA,
+                dsn=DB_DSN,
+                min=POOL_MIN,
+                max=POOL_MAX,
+                increment=POOL_INCREMENTO,
+                getmode=oracledb.POOL_GETMODE_TIMEDWAIT,  # Espera limitada por uma conexão livre
+                wait_timeout=int(POOL_TIMEOUT_AQUISICAO * 1000),  # Em milissegundos
+                stmtcachesize=TAMANHO_CACHE_COMANDOS,  # Comandos preparados reaproveitados por conexão
+            )
+        return _pool
+
+# Empresta uma conexão do pool Oracle compartilhado
+def _emprestar_conexao_oracle() -> "oracledb.Connection":
+    import oracledb
+
+    inicio = time.perf_counter()
     try:
-        # Conecta ao banco de dados usando as credenciais fornecidas
-        conn = oracledb.connect(
-            user="SEU USUÁRIO",
-            password="SUA SENHA",
-            dsn="(DESCRIPTION=(ADDRESS=(PROTOCOL= SEU PROTOCOL)(HOST= SEU HOST)(PORT= SEU PORT))(CONNECT_DATA=(SID= SEU SID)))",
-        )
-        return conn  # Retorna a conexão ativa
-    except oracledb.Error as e:
+        pool = obter_pool()
+        abertas_antes = pool.opened
+        conn = pool.acquire()  # Reaproveita uma conexão já aberta sempre que possível
+    except oracledb.Error:
+        with _pool_lock:
+            _metricas_pool["falhas"] += 1
+        raise
+    espera = time.perf_counter() - inicio
+
+    # Atualiza as métricas de uso do pool
+    with _pool_lock:
+        _metricas_pool["aquisicoes"] += 1
+        if pool.opened > abertas_antes:
+            _metricas_pool["novas"] += 1
+        else:
+            _metricas_pool["reaproveitadas"] += 1
+        _metricas_pool["espera_total"] += espera
+        _metricas_pool["espera_max"] = max(_metricas_pool["espera_max"], espera)
+    return conn
+
+# Retorna o repositório de dados do backend configurado
+def obter_repositorio() -> Repositorio:
+    global _repositorio
+    with _repositorio_lock:
+        if _repositorio is None:
+            if BACKEND_BD == "sqlite":
+                _repositorio = criar_repositorio_sqlite(SQLITE_CAMINHO)
+            else:
+                _repositorio = criar_repositorio_pool_oracle()
+        return _repositorio
+
+# Cria um repositório sobre o pool Oracle configurado, seja qual for o BACKEND_BD (ferramentas com --backend oracle)
+def criar_repositorio_pool_oracle() -> Repositorio:
+    # Em conexões do pool, close() devolve a conexão em vez de encerrá-la
+    return criar_repositorio_oracle(_emprestar_conexao_oracle, lambda conexao: conexao.close(), TAMANHO_CACHE_COMANDOS)
+
+# Empresta uma conexão do backend configurado
+def conectarBD() -> "oracledb.Connection | None":
+    try:
+        return obter_repositorio().conectar()  # Retorna a conexão emprestada
+    except Exception as e:
         # Exibe mensagem de erro caso a conexão falhe
         print(f"\n🔴 Erro ao conectar ao banco de dados: {e}")
         return None
 
-# Encerra a conexão com o banco de dados
-def fechar_conexao(conexao: oracledb.Connection) -> None:
+# Devolve a conexão ao backend (ao pool, no caso do Oracle)
+def fechar_conexao(conexao: "oracledb.Connection | None") -> None:
     if conexao:
-        conexao.close()  # Fecha a conexão com o Banco de Dados
+        obter_repositorio().devolver(conexao)
+
+# Retorna um resumo das métricas do pool de conexões
+def obter_metricas_pool() -> dict:
+    with _pool_lock:
+        metricas = dict(_metricas_pool)
+        pool = _pool
+    aquisicoes = metricas["aquisicoes"]
+    metricas["taxa_reaproveitamento"] = metricas["reaproveitadas"] / aquisicoes if aquisicoes else 0.0
+    metricas["espera_media"] = metricas["espera_total"] / aquisicoes if aquisicoes else 0.0
+    # Estado atual do pool (se já tiver sido criado)
+    metricas["abertas"] = pool.opened if pool else 0
+    metricas["ocupadas"] = pool.busy if pool else 0
+    return metricas
+
+# Encerra o pool de conexões ao finalizar o programa
+def encerrar_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close(force=True)
+            _pool = None
+
+# Carrega o mapa {id: nome} de uma tabela de referência, usando o cache quando possível
+def carregar_referencia(tabela: str, campo_id: str, campo_nome: str) -> dict[int, str]:
+    agora = time.monotonic()
+    with _cache_lock:
+        entrada = _cache_referencia.get(tabela)
+    if entrada and agora - entrada["carregado_em"] < CACHE_TTL_REFERENCIA:
+        return entrada["opcoes"]  # Cache válido: nenhuma ida ao banco
+
+    try:
+        repositorio = obter_repositorio()
+        versao = repositorio.versao_referencia(tabela)  # Quantidade de linhas e maior ID
+
+        # TTL expirado, mas a tabela não mudou: apenas renova a validade
+        if entrada and entrada["versao"] == versao:
+            with _cache_lock:
+                entrada["carregado_em"] = agora
+            return entrada["opcoes"]
+
+        # Recarrega a tabela inteira (são tabelas pequenas)
+        opcoes = dict(repositorio.listar_referencia(tabela))
+        with _cache_lock:
+            _cache_referencia[tabela] = {"opcoes": opcoes, "versao": versao, "carregado_em": agora}
+        return opcoes
+    except Exception:
+        # Sem banco disponível, usa a última versão conhecida (se houver)
+        if entrada:
+            return entrada["opcoes"]
+        raise
+
+# Invalida o cache de uma tabela de referência (ou de todas)
+def invalidar_cache_referencia(tabela: str | None = None) -> None:
+    with _cache_lock:
+        if tabela is None:
+            _cache_referencia.clear()
+        else:
+            _cache_referencia.pop(tabela, None)
+
+# Retorna o nome associado a um ID já presente no cache
+def obter_nome_referencia(tabela: str, id_opcao: int) -> str | None:
+    with _cache_lock:
+        entrada = _cache_referencia.get(tabela)
+    return entrada["opcoes"].get(id_opcao) if entrada else None
 
 # Lista as opções de uma tabela do banco de dados com mensagens personalizadas
 def listar_opcoes(tabela: str, campo_id: str, campo_nome: str) -> int | None:
     try:
-        conexao = conectarBD()  # Abre uma conexão com o banco
-        if not conexao:
-            return None
-        cursor = conexao.cursor()
-
-        # Monta e executa a query para buscar os dados da tabela
-        query = f"SELECT {campo_id}, {campo_nome} FROM {tabela}"
-        cursor.execute(query)
-        resultados = cursor.fetchall()  # Armazena os resultados
+        # Busca os dados da tabela no cache de referência
+        resultados = list(carregar_referencia(tabela, campo_id, campo_nome).items())
 
         if resultados:
             # Define títulos amigáveis ao usuário
@@ -77,8 +274,6 @@ def listar_opcoes(tabela: str, campo_id: str, campo_nome: str) -> int | None:
         # Captura e exibe mensagens de erro durante a execução
         print(f"\n🔴 Erro ao listar opções na tabela {tabela}: {e}")
         return None
-    finally:
-        fechar_conexao(conexao)  # Fecha a conexão com o Banco de Dados
 
 # Valida números positivos
 def validar_numero_positivo(valor: str, nome_campo: str) -> float:
@@ -107,10 +302,6 @@ def inserir_projeto() -> None:
     try:
         limpar_terminal()  # Limpa o terminal antes de exibir o menu
         print("\n=== Cadastrando um novo projeto ===")
-        conexao = conectarBD()  # Estabelece conexão com o banco
-        if not conexao:
-            return
-        cursor = conexao.cursor()
 
         # Coleta e valida as informações do projeto
         descricao = validar_string_nao_vazia(input("Descrição do projeto: "), "Descrição")
@@ -140,93 +331,63 @@ def inserir_projeto() -> None:
             print("🔴 Operação cancelada devido a falha na seleção de dados.")
             return
 
-        # Insere os dados do projeto no banco de dados
-        query = """
-            INSERT INTO TBL_PROJETOS_SUSTENTAVEIS 
-            (DESCRICAO, CUSTO, STATUS, ID_TIPO_FONTE, ID_REGIAO)
-            VALUES (:descricao, :custo, :status, :id_tipo_fonte, :id_regiao)
-        """
-        cursor.execute(
-            query,
+        # Insere os dados do projeto no banco de dados (a conexão só é usada agora)
+        obter_repositorio().inserir_projeto(
             {
                 "descricao": descricao,
                 "custo": custo,
                 "status": status,
                 "id_tipo_fonte": id_tipo_fonte,
                 "id_regiao": id_regiao,
-            },
+            }
         )
-        conexao.commit()  # Confirma as alterações no banco
         print("\n🟢 Projeto inserido com sucesso!")
     except Exception as e:
         # Mensagem de erro em caso de falha
         print(f"\n🔴 Erro ao inserir projeto: {e}")
+        metricas.registrar_erro("inserir_projeto", e)
     finally:
-        fechar_conexao(conexao)  # Fecha a conexão com o Banco de Dados
         input("\nPressione Enter para continuar...")
         
+# Grava somente os campos alterados do projeto, avisando se outro usuário o alterou nesse meio-tempo
+def salvar_alteracoes_projeto(repositorio: Repositorio, projeto: Projeto, mensagem_sucesso: str) -> None:
+    if not projeto.alterado:
+        print("\n🔵 Nenhuma alteração foi realizada.")
+        return
+    try:
+        repositorio.salvar_projeto(projeto)
+        print(mensagem_sucesso)
+    except ConflitoDeVersao as e:
+        print(f"\n🔴 {e} Consulte o projeto novamente e refaça as alterações.")
+
 # Atualiza um projeto existente no Banco de Dados
 def atualizar_projeto() -> None:
     try:
         limpar_terminal()  # Limpa o terminal para exibição organizada
         print("\n=== Atualizando um projeto ===")
-        conexao = conectarBD()  # Conecta ao banco de dados
-        if not conexao:
-            return
-        cursor = conexao.cursor()
+        repositorio = obter_repositorio()
 
         # Solicita o ID do projeto a ser atualizado
         id_projeto = validar_numero_positivo(input("ID do projeto a ser atualizado: "), "ID do Projeto")
 
-        # Consulta informações atuais do projeto
-        consulta = """
-            SELECT 
-                p.ID_PROJETO, 
-                p.DESCRICAO, 
-                p.CUSTO, 
-                p.STATUS, 
-                p.ID_TIPO_FONTE, 
-                tf.NOME AS TIPO_FONTE, 
-                p.ID_REGIAO, 
-                r.NOME AS REGIAO
-            FROM RM556310.TBL_PROJETOS_SUSTENTAVEIS p
-            JOIN TBL_TIPO_FONTES tf ON p.ID_TIPO_FONTE = tf.ID_TIPO_FONTE
-            JOIN TBL_REGIOES_SUSTENTAVEIS r ON p.ID_REGIAO = r.ID_REGIAO
-            WHERE p.ID_PROJETO = :id_projeto
-        """
-        cursor.execute(consulta, {"id_projeto": id_projeto})
-        resultado = cursor.fetchone()
-
-        if not resultado:  # Verifica se o projeto foi encontrado
+        # Consulta informações atuais do projeto (com a versão lida, para detectar edições concorrentes)
+        projeto = repositorio.carregar_projeto(id_projeto)
+
+        if not projeto:  # Verifica se o projeto foi encontrado
             print("\n🔴 Projeto com o ID informado não encontrado.")
             input("\nPressione Enter para continuar...")
             return
 
-        # Carrega os dados do projeto
-        projeto_atual = {
-            "ID_PROJETO": resultado[0],
-            "DESCRICAO": resultado[1],
-            "CUSTO": resultado[2],
-            "STATUS": resultado[3],
-            "ID_TIPO_FONTE": resultado[4],
-            "TIPO_FONTE": resultado[5],
-            "ID_REGIAO": resultado[6],
-            "REGIAO": resultado[7],
-        }
-
-        # Clona os dados originais para verificar alterações posteriormente
-        projeto_inicial = projeto_atual.copy()
-
         while True:
             limpar_terminal()  # Limpa o terminal para exibição organizada
             print("\n=== Informações atuais do projeto ===")
             # Exibe os dados do projeto no formato correto
-            print(f"ID: {projeto_atual['ID_PROJETO']}")
-            print(f"Descrição: {projeto_atual['DESCRICAO']}")
-            print(f"Custo: R${projeto_atual['CUSTO']:,.2f}")
-            print(f"Status: {projeto_atual['STATUS']}")
-            print(f"Tipo de Fonte ID: {projeto_atual['ID_TIPO_FONTE']} ({projeto_atual['TIPO_FONTE']})")
-            print(f"Região ID: {projeto_atual['ID_REGIAO']} ({projeto_atual['REGIAO']})")
+            print(f"ID: {projeto.id_projeto}")
+            print(f"Descrição: {projeto.descricao}")
+            print(f"Custo: R${projeto.custo:,.2f}")
+            print(f"Status: {projeto.status}")
+            print(f"Tipo de Fonte ID: {projeto.id_tipo_fonte} ({projeto.tipo_fonte})")
+            print(f"Região ID: {projeto.id_regiao} ({projeto.regiao})")
 
             # Menu de opções para atualizar os campos
             print("\n=== Escolha o campo que deseja modificar ===")
@@ -243,7 +404,7 @@ def atualizar_projeto() -> None:
                 # Atualizar descrição
                 descricao = input("\nNova descrição do projeto: ").strip()
                 if descricao:
-                    projeto_atual["DESCRICAO"] = descricao
+                    projeto.descricao = descricao
                     print("\n🟢 Descrição atualizada com sucesso!")
                 else:
                     print("\n🔴 A descrição não pode ser vazia.")
@@ -253,7 +414,7 @@ def atualizar_projeto() -> None:
                 custo = input("\nNovo custo do projeto: ").strip()
                 if custo:
                     try:
-                        projeto_atual["CUSTO"] = float(custo)
+                        projeto.custo = float(custo)
                         print("\n🟢 Custo atualizado com sucesso!")
                     except ValueError:
                         print("\n🔴 O custo deve ser um número válido.")
@@ -268,11 +429,11 @@ def atualizar_projeto() -> None:
                 while True:
                     status_opcao = input("Escolha uma opção (1-2): ").strip()
                     if status_opcao == "1":
-                        projeto_atual["STATUS"] = "Em andamento"
+                        projeto.status = "Em andamento"
                         print("\n🟢 Status atualizado para 'Em andamento'.")
                         break
                     elif status_opcao == "2":
-                        projeto_atual["STATUS"] = "Concluído"
+                        projeto.status = "Concluído"
                         print("\n🟢 Status atualizado para 'Concluído'.")
                         break
                     else:
@@ -283,13 +444,9 @@ def atualizar_projeto() -> None:
                 print("\n=== Escolha o novo tipo de fonte ===")
                 id_tipo_fonte = listar_opcoes("TBL_TIPO_FONTES", "ID_TIPO_FONTE", "NOME")
                 if id_tipo_fonte is not None:
-                    projeto_atual["ID_TIPO_FONTE"] = id_tipo_fonte
-                    consulta_tipo = """
-                        SELECT NOME FROM TBL_TIPO_FONTES WHERE ID_TIPO_FONTE = :id_tipo_fonte
-                    """
-                    cursor.execute(consulta_tipo, {"id_tipo_fonte": id_tipo_fonte})
-                    novo_tipo = cursor.fetchone()
-                    projeto_atual["TIPO_FONTE"] = novo_tipo[0] if novo_tipo else "Desconhecido"
+                    projeto.id_tipo_fonte = id_tipo_fonte
+                    # O nome já está no cache carregado por listar_opcoes()
+                    projeto.tipo_fonte = obter_nome_referencia("TBL_TIPO_FONTES", id_tipo_fonte) or "Desconhecido"
                     print("\n🟢 Tipo de fonte atualizado com sucesso!")
 
             elif opcao == "5":
@@ -297,39 +454,14 @@ def atualizar_projeto() -> None:
                 print("\n=== Escolha a nova região do projeto ===")
                 id_regiao = listar_opcoes("TBL_REGIOES_SUSTENTAVEIS", "ID_REGIAO", "NOME")
                 if id_regiao is not None:
-                    projeto_atual["ID_REGIAO"] = id_regiao
-                    consulta_regiao = """
-                        SELECT NOME FROM TBL_REGIOES_SUSTENTAVEIS WHERE ID_REGIAO = :id_regiao
-                    """
-                    cursor.execute(consulta_regiao, {"id_regiao": id_regiao})
-                    nova_regiao = cursor.fetchone()
-                    projeto_atual["REGIAO"] = nova_regiao[0] if nova_regiao else "Desconhecida"
+                    projeto.id_regiao = id_regiao
+                    # O nome já está no cache carregado por listar_opcoes()
+                    projeto.regiao = obter_nome_referencia("TBL_REGIOES_SUSTENTAVEIS", id_regiao) or "Desconhecida"
                     print("\n🟢 Região atualizada com sucesso!")
 
             elif opcao == "6":
                 # Salva as alterações no banco de dados e encerra
-                if projeto_atual != projeto_inicial:
-                    query = """
-                        UPDATE TBL_PROJETOS_SUSTENTAVEIS
-                        SET DESCRICAO = :descricao, CUSTO = :custo, STATUS = :status, 
-                            ID_TIPO_FONTE = :id_tipo_fonte, ID_REGIAO = :id_regiao
-                        WHERE ID_PROJETO = :id_projeto
-                    """
-                    cursor.execute(
-                        query,
-                        {
-                            "descricao": projeto_atual["DESCRICAO"],
-                            "custo": projeto_atual["CUSTO"],
-                            "status": projeto_atual["STATUS"],
-                            "id_tipo_fonte": projeto_atual["ID_TIPO_FONTE"],
-                            "id_regiao": projeto_atual["ID_REGIAO"],
-                            "id_projeto": projeto_atual["ID_PROJETO"],
-                        },
-                    )
-                    conexao.commit()
-                    print("\n🟢 Projeto atualizado com sucesso!")
-                else:
-                    print("\n🔵 Nenhuma alteração foi realizada.")
+                salvar_alteracoes_projeto(repositorio, projeto, "\n🟢 Projeto atualizado com sucesso!")
                 input("\nPressione Enter para continuar...")
                 break
             else:
@@ -338,56 +470,28 @@ def atualizar_projeto() -> None:
             # Pergunta se o usuário deseja alterar mais campos
             alterar_mais = input("\nDeseja modificar mais algum campo? (s/n): ").strip().lower()
             if alterar_mais != "s":
-                if projeto_atual != projeto_inicial:
-                    # Salva alterações
-                    query = """
-                        UPDATE TBL_PROJETOS_SUSTENTAVEIS
-                        SET DESCRICAO = :descricao, CUSTO = :custo, STATUS = :status, 
-                            ID_TIPO_FONTE = :id_tipo_fonte, ID_REGIAO = :id_regiao
-                        WHERE ID_PROJETO = :id_projeto
-                    """
-                    cursor.execute(
-                        query,
-                        {
-                            "descricao": projeto_atual["DESCRICAO"],
-                            "custo": projeto_atual["CUSTO"],
-                            "status": projeto_atual["STATUS"],
-                            "id_tipo_fonte": projeto_atual["ID_TIPO_FONTE"],
-                            "id_regiao": projeto_atual["ID_REGIAO"],
-                            "id_projeto": projeto_atual["ID_PROJETO"],
-                        },
-                    )
-                    conexao.commit()
-                    print("\n🟢 Todas as alterações foram salvas com sucesso!")
-                else:
-                    print("\n🔵 Nenhuma alteração foi realizada.")
+                salvar_alteracoes_projeto(repositorio, projeto, "\n🟢 Todas as alterações foram salvas com sucesso!")
                 input("\nPressione Enter para continuar...")
                 break
 
     except Exception as e:
         # Mensagem de erro em caso de falha
         print(f"\n🔴 Erro ao atualizar projeto: {e}")
+        metricas.registrar_erro("atualizar_projeto", e)
         input("\nPressione Enter para continuar...")
-    finally:
-        fechar_conexao(conexao)  # Fecha a conexão com o Banco de Dados
 
 # Exclui um projeto existente do Banco de Dados
 def excluir_projeto() -> None:
     try:
         limpar_terminal()  # Limpa o terminal para exibição organizada
         print("\n=== Excluindo um projeto ===")
-        conexao = conectarBD()  # Estabelece conexão com o banco de dados
-        if not conexao:
-            return
-        cursor = conexao.cursor()
+        repositorio = obter_repositorio()
 
         # Solicita o ID do projeto a ser excluído
         id_projeto = validar_numero_positivo(input("ID do projeto a ser excluído: "), "ID do Projeto")
 
         # Consulta as informações do projeto para confirmar exclusão
-        consulta = "SELECT DESCRICAO, CUSTO, STATUS FROM TBL_PROJETOS_SUSTENTAVEIS WHERE ID_PROJETO = :id_projeto"
-        cursor.execute(consulta, {"id_projeto": id_projeto})
-        projeto = cursor.fetchone()
+        projeto = repositorio.buscar_projeto(id_projeto)
 
         if not projeto:  # Verifica se o projeto foi encontrado
             print("\n🔴 Projeto com o ID informado não encontrado.")
@@ -395,9 +499,9 @@ def excluir_projeto() -> None:
 
         # Exibe os detalhes do projeto antes de confirmar exclusão
         print("\n=== Informações do Projeto ===")
-        print(f"Descrição: {projeto[0]}")
-        print(f"Custo: R${projeto[1]:,.2f}")
-        print(f"Status: {projeto[2]}")
+        print(f"Descrição: {projeto[1]}")
+        print(f"Custo: R${projeto[2]:,.2f}")
+        print(f"Status: {projeto[3]}")
         print("\nTem certeza que deseja excluir este projeto? (sim/não)")
         
         confirmacao = input("Digite sua escolha: ").strip().lower()
@@ -406,146 +510,659 @@ def excluir_projeto() -> None:
             return
 
         # Realiza a exclusão do projeto no banco de dados
-        query = "DELETE FROM TBL_PROJETOS_SUSTENTAVEIS WHERE ID_PROJETO = :id_projeto"
-        cursor.execute(query, {"id_projeto": id_projeto})
-        conexao.commit()  # Salva a exclusão
+        repositorio.excluir_projeto(id_projeto)
         print("\n🟢 Projeto excluído com sucesso!")
     except Exception as e:
         # Exibe mensagem de erro em caso de falha
         print(f"\n🔴 Erro ao excluir projeto: {e}")
+        metricas.registrar_erro("excluir_projeto", e)
     finally:
-        fechar_conexao(conexao)  # Fecha a conexão com o Banco de Dados
         input("\nPressione Enter para continuar...")
 
+# Busca os projetos em páginas, usando paginação por chave (ID_PROJETO) em vez de OFFSET
+def paginar_projetos(
+    status: str | None = None,
+    tamanho_pagina: int = TAMANHO_LOTE_CONSULTA,
+    arraysize: int | None = None,
+    prefetchrows: int | None = None,
+):
+    try:
+        yield from obter_repositorio().paginar_projetos(status, tamanho_pagina, arraysize, prefetchrows)
+    except Exception as e:
+        # Exibe mensagem de erro caso a consulta falhe
+        print(f"\n🔴 Erro ao consultar projetos: {e}")
+        metricas.registrar_erro("consultar_projetos", e)
+
+# Percorre os projetos um a um, buscando-os do banco em lotes
+def iterar_projetos(status: str | None = None, tamanho_lote: int = TAMANHO_LOTE_CONSULTA, **opcoes_cursor):
+    for pagina in paginar_projetos(status, tamanho_lote, **opcoes_cursor):
+        yield from pagina
+
+# Exibe uma linha de projeto formatada
+def exibir_projeto(projeto: tuple) -> None:
+    print(
+        f"\nID: {projeto[0]} | Descrição: {projeto[1]} | "
+        f"Custo: R${projeto[2]:,.2f} | Status: {projeto[3]} | "
+        f"Tipo de Fonte ID: {projeto[4]} ({projeto[5]}) | Região ID: {projeto[6]} ({projeto[7]})"
+    )
+
 # Consulta os projetos existentes no Banco de Dados
-def consultar_projetos(export: bool = False) -> list:
+def consultar_projetos(export: bool = False):
+    if export:
+        print("\n=== Selecione os projetos que deseja exportar ===")
+    else:
+        limpar_terminal()  # Limpa o terminal para exibição organizada
+        print("\n=== Consultando projetos ===")
+    
+    # Menu de filtro para a consulta de projetos
+    print("1. Todos os projetos")
+    print("2. Apenas os projetos em andamento")
+    print("3. Apenas os projetos concluídos")
+
+    escolha = input("Escolha uma opção (1-3): ").strip()
+    if escolha not in ["1", "2", "3"]:
+        print("\n🔴 Opção inválida.")  # Retorna se a escolha for inválida
+        return (None, []) if export else []
+
+    # Define o filtro de status com base na escolha do usuário
+    status = {"1": None, "2": "Em andamento", "3": "Concluído"}[escolha]
+
+    if export:
+        # Mostra apenas a primeira página como prévia e devolve o status escolhido e o fluxo completo
+        # (os exportadores colunares buscam direto pelo status)
+        primeira_pagina = next(paginar_projetos(status, TAMANHO_PAGINA_TELA), [])
+        if not primeira_pagina:
+            print("\n🔴 Nenhum projeto encontrado.")
+            return status, []
+        print("\n=== Projetos que serão exportados (prévia) ===")
+        for projeto in primeira_pagina:
+            exibir_projeto(projeto)
+        if len(primeira_pagina) == TAMANHO_PAGINA_TELA:
+            print("\n🔵 ... e demais projetos do filtro selecionado.")
+        return status, iterar_projetos(status)
+
+    # Exibe os resultados página por página
+    encontrou = False
+    for numero, pagina in enumerate(paginar_projetos(status, TAMANHO_PAGINA_TELA), start=1):
+        encontrou = True
+        print(f"\n=== Página {numero} ===")
+        for projeto in pagina:
+            exibir_projeto(projeto)
+        if len(pagina) < TAMANHO_PAGINA_TELA:
+            break
+        continuar = input("\nPressione Enter para a próxima página ou 'q' para sair: ").strip().lower()
+        if continuar == "q":
+            break
+    if not encontrou:
+        print("\n🔴 Nenhum projeto encontrado.")  # Exibe mensagem se não houver resultados
+
+    input("\nPressione Enter para continuar...")  # Pausa para visualização dos resultados
+    return []
+
+# Busca projetos pela descrição (por prefixo das palavras, sem diferenciar acentos e maiúsculas)
+def buscar_projetos_descricao() -> None:
+    limpar_terminal()
+    print("\n=== Buscando projetos pela descrição ===")
+    texto = input("Palavras da descrição (ex.: eol norte): ").strip()
     try:
-        if export:
-            print("\n=== Selecione os projetos que deseja exportar ===")
-        else:
-            limpar_terminal()  # Limpa o terminal para exibição organizada
-            print("\n=== Consultando projetos ===")
-        
-        # Menu de filtro para a consulta de projetos
-        print("1. Todos os projetos")
-        print("2. Apenas os projetos em andamento")
-        print("3. Apenas os projetos concluídos")
-
-        escolha = input("Escolha uma opção (1-3): ").strip()
-        if escolha not in ["1", "2", "3"]:
-            print("\n🔴 Opção inválida.")  # Retorna se a escolha for inválida
-            return []
-
-        # Monta a consulta SQL com base na escolha do usuário
-        consulta = """
-            SELECT 
-                p.ID_PROJETO, 
-                p.DESCRICAO, 
-                p.CUSTO, 
-                p.STATUS, 
-                tf.ID_TIPO_FONTE, 
-                tf.NOME AS TIPO_FONTE, 
-                r.ID_REGIAO, 
-                r.NOME AS REGIAO
-            FROM RM556310.TBL_PROJETOS_SUSTENTAVEIS p
-            JOIN TBL_TIPO_FONTES tf ON p.ID_TIPO_FONTE = tf.ID_TIPO_FONTE
-            JOIN TBL_REGIOES_SUSTENTAVEIS r ON p.ID_REGIAO = r.ID_REGIAO
-        """
-        if escolha == "2":
-            consulta += " WHERE p.STATUS = 'Em andamento'"  # Filtra projetos em andamento
-        elif escolha == "3":
-            consulta += " WHERE p.STATUS = 'Concluído'"  # Filtra projetos concluídos
-
-        conexao = conectarBD()  # Conecta ao banco de dados
-        if not conexao:
-            return []
-        cursor = conexao.cursor()
-        cursor.execute(consulta)
-
-        resultados = cursor.fetchall()  # Armazena os resultados da consulta
-        if not resultados:
-            print("\n🔴 Nenhum projeto encontrado.")  # Exibe mensagem se não houver resultados
-        else:
-            if export:
-                print("\n=== Projetos que serão exportados ===")
-            # Exibe os resultados da consulta
-            for projeto in resultados:
-                print(
-                    f"\nID: {projeto[0]} | Descrição: {projeto[1]} | "
-                    f"Custo: R${projeto[2]:,.2f} | Status: {projeto[3]} | "
-                    f"Tipo de Fonte ID: {projeto[4]} ({projeto[5]}) | Região ID: {projeto[6]} ({projeto[7]})"
-                )
+        repositorio = obter_repositorio()
+        ultimo_id, numero = 0, 1
+        while True:
+            pagina = repositorio.buscar_projetos(texto, ultimo_id=ultimo_id, limite=TAMANHO_PAGINA_TELA)
+            if not pagina:
+                if numero == 1:
+                    print("\n🔴 Nenhum projeto encontrado.")
+                break
+            print(f"\n=== Página {numero} ===")
+            for projeto in pagina:
+                exibir_projeto(projeto)
+            if len(pagina) < TAMANHO_PAGINA_TELA:
+                break
+            continuar = input("\nPressione Enter para a próxima página ou 'q' para sair: ").strip().lower()
+            if continuar == "q":
+                break
+            ultimo_id, numero = pagina[-1][0], numero + 1
+    except Exception as e:
+        # Exibe mensagem de erro caso a busca falhe
+        print(f"\n🔴 Erro ao buscar projetos: {e}")
+        metricas.registrar_erro("buscar_projetos", e)
 
-        if not export:
-            input("\nPressione Enter para continuar...")  # Pausa para visualização dos resultados
+    input("\nPressione Enter para continuar...")  # Pausa para visualização dos resultados
 
-        return resultados  # Retorna a lista de resultados
-    finally:
-        fechar_conexao(conexao)  # Fecha a conexão com o Banco de Dados
+# Converte uma linha da consulta para o formato exportado
+def _projeto_para_dict(item) -> dict:
+    if isinstance(item, dict):
+        return item
+    return {
+        "ID_PROJETO": item[0],
+        "DESCRICAO": item[1],
+        "CUSTO": item[2],
+        "STATUS": item[3],
+        "ID_TIPO_FONTE": item[4],  # Apenas o ID
+        "ID_REGIAO": item[6]  # Apenas o ID
+    }
 
-# Exporta projetos selecionados para um arquivo JSON
-def exportar_json(dados: list, nome_arquivo: str = None) -> None:
+# Gera o nome padrão de um arquivo exportado (projetos_<data><extensão>)
+def nome_arquivo_padrao(extensao: str) -> str:
+    hoje = datetime.now().strftime("%Y-%m-%d")
+    return f"projetos_{hoje}{extensao}"
+
+# Serializa um projeto em uma única linha (NDJSON e JSON compacto)
+def _json_compacto(projeto: dict) -> str:
+    return json.dumps(projeto, ensure_ascii=False, separators=(",", ":"))
+
+# Serializa um projeto indentado como item da lista (mantém a indentação do arquivo original)
+def _json_indentado(projeto: dict) -> str:
+    return json.dumps(projeto, indent=4, ensure_ascii=False).replace("\n", "\n    ")
+
+# Grava projetos em um arquivo JSON (lista ou um objeto por linha), em blocos, sem interação com o terminal
+def gravar_json(
+    dados,
+    nome_arquivo: str = None,
+    formato: str = "json",
+    compacto: bool = False,
+    gzip_ativo: bool = False,
+    intervalo_flush: int = INTERVALO_FLUSH_EXPORTACAO,
+) -> dict:
+    if not nome_arquivo:
+        nome_arquivo = nome_arquivo_padrao((".ndjson" if formato == "ndjson" else ".json") + (".gz" if gzip_ativo else ""))
+    estatisticas = {"arquivo": nome_arquivo, "linhas": 0, "bytes": 0, "segundos": 0.0, "linhas_por_segundo": 0.0}
+
+    # NDJSON é sempre compacto: um objeto por linha
+    serializar = _json_compacto if formato == "ndjson" or compacto else _json_indentado
+
+    # Delimitadores: início do arquivo, antes do 1º projeto, entre projetos e final (com e sem projetos)
+    if formato == "ndjson":
+        inicio_arquivo, antes_primeiro, separador, fim, fim_vazio = "", "", "\n", "\n", ""
+    elif compacto:
+        inicio_arquivo, antes_primeiro, separador, fim, fim_vazio = "[", "", ",", "]", "]"
+    else:
+        inicio_arquivo, antes_primeiro, separador, fim, fim_vazio = "[", "\n    ", ",\n    ", "\n]", "]"
+
+    inicio = time.perf_counter()
+    abrir = gzip.open if gzip_ativo else open
+    with abrir(nome_arquivo, "wt", encoding="utf-8") as arquivo:
+        arquivo.write(inicio_arquivo)
+        bloco = []
+        for item in dados:
+            bloco.append(separador if estatisticas["linhas"] else antes_primeiro)
+            bloco.append(serializar(_projeto_para_dict(item)))
+            estatisticas["linhas"] += 1
+
+            # Escreve o bloco acumulado e o envia ao disco
+            if estatisticas["linhas"] % intervalo_flush == 0:
+                arquivo.write("".join(bloco))
+                arquivo.flush()
+                bloco = []
+        arquivo.write("".join(bloco))
+        arquivo.write(fim if estatisticas["linhas"] else fim_vazio)
+
+    # Calcula as estatísticas da exportação
+    estatisticas["segundos"] = time.perf_counter() - inicio
+    estatisticas["bytes"] = os.path.getsize(nome_arquivo)
+    if estatisticas["segundos"] > 0:
+        estatisticas["linhas_por_segundo"] = estatisticas["linhas"] / estatisticas["segundos"]
+    metricas.registrar(f"exportar_{formato}", estatisticas["segundos"], linhas=estatisticas["linhas"], bytes_=estatisticas["bytes"])
+    return estatisticas
+
+# Exporta projetos selecionados para um arquivo JSON (lista ou um objeto por linha)
+def exportar_json(
+    dados,
+    nome_arquivo: str = None,
+    formato: str = "json",
+    compacto: bool = False,
+    gzip_ativo: bool = False,
+    intervalo_flush: int = INTERVALO_FLUSH_EXPORTACAO,
+) -> dict:
+    estatisticas = {}
     try:
-        if not nome_arquivo:
-            hoje = datetime.now().strftime("%Y-%m-%d")  # Gera um nome padrão para o arquivo
-            nome_arquivo = f"projetos_{hoje}.json"
-
-        # Transforma os dados em formato JSON
-        if isinstance(dados, list) and all(isinstance(item, (list, tuple)) for item in dados):
-            dados = [
-                {
-                    "ID_PROJETO": item[0],
-                    "DESCRICAO": item[1],
-                    "CUSTO": item[2],
-                    "STATUS": item[3],
-                    "ID_TIPO_FONTE": item[4],  # Apenas o ID
-                    "ID_REGIAO": item[6]  # Apenas o ID
-                }
-                for item in dados
-            ]
-
-        # Escreve os dados em um arquivo JSON
-        with open(nome_arquivo, "w", encoding="utf-8") as arquivo:
-            json.dump(dados, arquivo, indent=4, ensure_ascii=False)
-        print(f"\n🟢 Dados exportados para o arquivo: {nome_arquivo}")
+        estatisticas = gravar_json(dados, nome_arquivo, formato, compacto, gzip_ativo, intervalo_flush)
+        print(f"\n🟢 Dados exportados para o arquivo: {estatisticas['arquivo']}")
+        print(
+            f"🔵 {estatisticas['linhas']} projetos | {estatisticas['bytes']:,} bytes | "
+            f"{estatisticas['linhas_por_segundo']:,.0f} projetos/s"
+        )
     except Exception as e:
         # Exibe mensagem de erro caso a exportação falhe
         print(f"\n🔴 Erro ao exportar para JSON: {e}")
+        metricas.registrar_erro("exportar_json", e)
     input("\nPressione Enter para continuar...")  # Pausa para visualização da mensagem
+    return estatisticas
+
+# Grava projetos em um arquivo Excel (.xlsx), sem interação com o terminal. Usa o escritor colunar em modo
+# somente escrita (as linhas não ficam em memória) e abre uma nova aba a cada LIMITE_LINHAS_EXCEL linhas.
+# Sem "dados", busca os projetos (opcionalmente de um status) direto em lotes colunares.
+def gravar_excel(dados=None, nome_arquivo: str = None, status: str | None = None) -> dict:
+    return gravar_colunar("xlsx", dados, status, nome_arquivo)
 
 # Exporta projetos selecionados para um arquivo Excel (.xlsx)
-def exportar_DataFrame(dados: list, nome_arquivo: str = None) -> None:
+def exportar_DataFrame(dados=None, nome_arquivo: str = None, status: str | None = None) -> None:
     try:
-        if not nome_arquivo:
-            hoje = datetime.now().strftime("%Y-%m-%d")  # Gera um nome padrão para o arquivo
-            nome_arquivo = f"projetos_{hoje}.xlsx"
-
-        # Converte os dados para um DataFrame do pandas
-        df = pd.DataFrame(
-            [
-                {
-                    "ID_PROJETO": item[0],
-                    "DESCRICAO": item[1],
-                    "CUSTO": item[2],
-                    "STATUS": item[3],
-                    "ID_TIPO_FONTE": item[4],  # Apenas o ID
-                    "ID_REGIAO": item[6]  # Apenas o ID
-                }
-                for item in dados
-            ]
-        )
-
-        # Exporta o DataFrame para um arquivo Excel
-        df.to_excel(nome_arquivo, index=False, engine="openpyxl")
-        print(f"\n🟢 Dados exportados para o arquivo: {nome_arquivo}")
-    except ModuleNotFoundError:
+        estatisticas = gravar_excel(dados, nome_arquivo, status)
+        print(f"\n🟢 Dados exportados para o arquivo: {estatisticas['arquivo']}")
+    except ModuleNotFoundError as e:
         # Mensagem caso a biblioteca necessária não esteja instalada
-        print("\n🔴 O módulo 'openpyxl' não está instalado. Por favor, instale-o usando 'pip install openpyxl'.")
+        print(f"\n🔴 O módulo '{e.name}' não está instalado. Por favor, instale-o usando 'pip install {e.name}'.")
     except Exception as e:
         # Exibe mensagem de erro caso a exportação falhe
         print(f"\n🔴 Erro ao exportar para Excel: {e}")
+        metricas.registrar_erro("exportar_xlsx", e)
     input("\nPressione Enter para continuar...")  # Pausa para visualização
 
+# Busca os projetos direto em lotes colunares (tabelas Arrow), sem criar uma tupla/dict por linha
+def buscar_lotes_colunares(status: str | None = None, tamanho_lote: int = TAMANHO_LOTE_COLUNAR):
+    import pyarrow as pa
+
+    nome = "exportar_projetos_status" if status else "exportar_projetos"
+    parametros = {"status": status} if status else {}
+
+    repositorio = obter_repositorio()
+    conexao = repositorio.conectar()
+    try:
+        consulta = repositorio.comandos.preparar(nome, conexao)
+        if hasattr(conexao, "fetch_df_batches"):
+            # python-oracledb 3+: o driver preenche os buffers colunares diretamente
+            for lote in conexao.fetch_df_batches(consulta, parametros, size=tamanho_lote):
+                yield pa.Table.from_arrays(lote.column_arrays(), names=lote.column_names())
+        else:
+            # Versões anteriores: busca em blocos e transpõe para colunas
+            cursor = conexao.cursor()
+            cursor.arraysize = tamanho_lote
+            cursor.execute(consulta, parametros)
+            while linhas := cursor.fetchmany():
+                yield tabela_arrow_de_linhas(linhas)
+    finally:
+        repositorio.devolver(conexao)
+
+# Monta uma tabela Arrow a partir de um bloco de linhas (tuplas da consulta ou dicts exportados)
+def tabela_arrow_de_linhas(linhas: list):
+    import pyarrow as pa
+
+    if linhas and not isinstance(linhas[0], dict) and len(linhas[0]) == len(COLUNAS_EXPORTACAO):
+        colunas = list(zip(*linhas))  # Linhas já no formato das colunas exportadas
+    else:
+        colunas = list(zip(*(_projeto_para_dict(linha).values() for linha in linhas))) or [()] * len(COLUNAS_EXPORTACAO)
+    return pa.table({nome: list(valores) for nome, valores in zip(COLUNAS_EXPORTACAO, colunas)})
+
+# Agrupa um fluxo de linhas em tabelas Arrow
+def lotes_arrow_de_linhas(dados, tamanho_lote: int = TAMANHO_LOTE_COLUNAR):
+    bloco = []
+    for linha in dados:
+        bloco.append(linha)
+        if len(bloco) >= tamanho_lote:
+            yield tabela_arrow_de_linhas(bloco)
+            bloco = []
+    if bloco:
+        yield tabela_arrow_de_linhas(bloco)
+
+# ----- Escritores colunares: cada formato define abrir/escrever/fechar sobre um dict de estado -----
+
+def _abrir_parquet(nome_arquivo: str, esquema) -> dict:
+    import pyarrow.parquet as pq
+    return {"escritor": pq.ParquetWriter(nome_arquivo, esquema, compression="snappy")}
+
+def _abrir_feather(nome_arquivo: str, esquema) -> dict:
+    import pyarrow as pa
+    # Feather v2 é o formato de arquivo IPC do Arrow
+    return {"escritor": pa.ipc.new_file(nome_arquivo, esquema, options=pa.ipc.IpcWriteOptions(compression="lz4"))}
+
+def _abrir_csv(nome_arquivo: str, esquema) -> dict:
+    import pyarrow.csv as pcsv
+    return {"escritor": pcsv.CSVWriter(nome_arquivo, esquema)}
+
+def _escrever_arrow(estado: dict, tabela) -> None:
+    estado["escritor"].write_table(tabela)
+
+def _fechar_arrow(estado: dict) -> None:
+    estado["escritor"].close()
+
+def _abrir_excel(nome_arquivo: str, esquema) -> dict:
+    from openpyxl import Workbook
+    # Modo somente escrita: as linhas vão para o arquivo sem ficar em memória
+    planilha = Workbook(write_only=True)
+    return {"planilha": planilha, "nome_arquivo": nome_arquivo, "cabecalho": esquema.names, "aba": None, "linhas_aba": 0}
+
+def _escrever_excel(estado: dict, tabela) -> None:
+    colunas = [coluna.to_pylist() for coluna in tabela.columns]
+    for linha in zip(*colunas):
+        # Abre uma nova aba quando a atual atinge o limite do Excel
+        if estado["aba"] is None or estado["linhas_aba"] >= LIMITE_LINHAS_EXCEL:
+            numero = len(estado["planilha"].worksheets) + 1
+            estado["aba"] = estado["planilha"].create_sheet(f"Projetos {numero}")
+            estado["aba"].append(estado["cabecalho"])
+            estado["linhas_aba"] = 0
+        estado["aba"].append(linha)
+        estado["linhas_aba"] += 1
+
+def _fechar_excel(estado: dict) -> None:
+    if not estado["planilha"].worksheets:
+        estado["planilha"].create_sheet("Projetos 1").append(estado["cabecalho"])
+    estado["planilha"].save(estado["nome_arquivo"])
+
+# Formatos disponíveis: extensão e funções abrir/escrever/fechar
+FORMATOS_COLUNARES = {
+    "parquet": (".parquet", _abrir_parquet, _escrever_arrow, _fechar_arrow),
+    "feather": (".feather", _abrir_feather, _escrever_arrow, _fechar_arrow),
+    "csv": (".csv", _abrir_csv, _escrever_arrow, _fechar_arrow),
+    "xlsx": (".xlsx", _abrir_excel, _escrever_excel, _fechar_excel),  # Alternativa lenta, em blocos
+}
+
+# Grava um fluxo de tabelas Arrow no formato escolhido
+def escrever_lotes_colunares(lotes, formato: str, nome_arquivo: str) -> dict:
+    if formato not in FORMATOS_COLUNARES:
+        raise ValueError(f"Formato não suportado: {formato}")
+    _, abrir, escrever, fechar = FORMATOS_COLUNARES[formato]
+
+    estatisticas = {"linhas": 0, "lotes": 0, "bytes": 0, "segundos": 0.0}
+    inicio = time.perf_counter()
+    estado = None
+    esquema = None
+    try:
+        for tabela in lotes:
+            if estado is None:
+                esquema = tabela.schema  # O primeiro lote define o esquema do arquivo
+                estado = abrir(nome_arquivo, esquema)
+            elif tabela.schema != esquema:
+                tabela = tabela.cast(esquema)
+            escrever(estado, tabela)
+            estatisticas["linhas"] += tabela.num_rows
+            estatisticas["lotes"] += 1
+        if estado is None:
+            # Nenhum projeto: grava um arquivo só com o cabeçalho
+            vazia = tabela_arrow_de_linhas([])
+            estado = abrir(nome_arquivo, vazia.schema)
+            escrever(estado, vazia)
+    finally:
+        if estado is not None:
+            fechar(estado)
+
+    estatisticas["segundos"] = time.perf_counter() - inicio
+    estatisticas["bytes"] = os.path.getsize(nome_arquivo)
+    metricas.registrar(f"exportar_{formato}", estatisticas["segundos"], linhas=estatisticas["linhas"], bytes_=estatisticas["bytes"])
+    return estatisticas
+
+# Grava projetos em Parquet, Feather, CSV ou Excel usando lotes colunares, sem interação com o terminal
+def gravar_colunar(formato: str, dados=None, status: str | None = None, nome_arquivo: str = None) -> dict:
+    if formato not in FORMATOS_COLUNARES:
+        raise ValueError(f"Formato não suportado: {formato}")
+    nome_arquivo = nome_arquivo or nome_arquivo_padrao(FORMATOS_COLUNARES[formato][0])
+
+    # Usa as linhas já consultadas, ou busca direto em formato colunar
+    lotes = lotes_arrow_de_linhas(dados) if dados is not None else buscar_lotes_colunares(status)
+    estatisticas = escrever_lotes_colunares(lotes, formato, nome_arquivo)
+    estatisticas["arquivo"] = nome_arquivo
+    return estatisticas
+
+# Exporta projetos para Parquet, Feather, CSV ou Excel usando lotes colunares
+def exportar_colunar(formato: str, dados=None, status: str | None = None, nome_arquivo: str = None) -> dict:
+    estatisticas = {}
+    try:
+        estatisticas = gravar_colunar(formato, dados, status, nome_arquivo)
+        print(f"\n🟢 Dados exportados para o arquivo: {estatisticas['arquivo']}")
+        print(
+            f"🔵 {estatisticas['linhas']} projetos | {estatisticas['bytes']:,} bytes | "
+            f"{estatisticas['segundos']:.2f} s"
+        )
+    except ModuleNotFoundError as e:
+        # Mensagem caso a biblioteca necessária não esteja instalada
+        print(f"\n🔴 O módulo '{e.name}' não está instalado. Por favor, instale-o usando 'pip install {e.name}'.")
+    except Exception as e:
+        # Exibe mensagem de erro caso a exportação falhe
+        print(f"\n🔴 Erro ao exportar para {formato}: {e}")
+        metricas.registrar_erro(f"exportar_{formato}", e)
+    input("\nPressione Enter para continuar...")  # Pausa para visualização
+    return estatisticas
+
+# Exporta projetos selecionados para vários formatos de uma vez (uma única leitura do banco), com manifesto
+def exportar_varios_formatos(dados, formatos: list[str]) -> dict:
+    from exportacao_multipla import exportar_varios  # Importado aqui: o módulo depende deste
+
+    manifesto = {}
+    try:
+        manifesto = exportar_varios(dados, {formato: None for formato in formatos})
+        for arquivo in manifesto["arquivos"]:
+            print(f"\n🟢 {arquivo['linhas']} projetos exportados para o arquivo: {arquivo['arquivo']}")
+        for formato, erro in manifesto["erros"].items():
+            print(f"\n🔴 Erro ao exportar para {formato}: {erro}")
+        print(f"🔵 Manifesto com linhas e somas de verificação: {manifesto['manifesto']}")
+    except Exception as e:
+        # Exibe mensagem de erro caso a exportação falhe
+        print(f"\n🔴 Erro ao exportar: {e}")
+        metricas.registrar_erro("exportar_varios", e)
+    input("\nPressione Enter para continuar...")  # Pausa para visualização
+    return manifesto
+
+# Lê um arquivo JSON (lista de objetos ou um objeto por linha) sem carregá-lo inteiro
+def _ler_linhas_json(nome_arquivo: str, tamanho_bloco: int = 65536):
+    decodificador = json.JSONDecoder()
+    with open(nome_arquivo, "r", encoding="utf-8") as arquivo:
+        buffer = ""
+        fim_arquivo = False
+        while True:
+            # Descarta separadores entre os objetos ("[", ",", "]" e espaços)
+            buffer = buffer.lstrip(" \t\r\n[,]")
+            if not buffer:
+                if fim_arquivo:
+                    return
+                bloco = arquivo.read(tamanho_bloco)
+                fim_arquivo = not bloco
+                buffer += bloco
+                continue
+            try:
+                objeto, fim = decodificador.raw_decode(buffer)
+            except json.JSONDecodeError:
+                # Objeto incompleto: lê mais um bloco do arquivo
+                bloco = arquivo.read(tamanho_bloco)
+                if not bloco:
+                    raise
+                buffer += bloco
+                continue
+            yield objeto
+            buffer = buffer[fim:]
+
+# Lê um arquivo CSV linha a linha
+def _ler_linhas_csv(nome_arquivo: str):
+    with open(nome_arquivo, "r", encoding="utf-8", newline="") as arquivo:
+        yield from csv.DictReader(arquivo)
+
+# Lê uma planilha Excel linha a linha (modo somente leitura do openpyxl)
+def _ler_linhas_excel(nome_arquivo: str):
+    from openpyxl import load_workbook
+
+    planilha = load_workbook(nome_arquivo, read_only=True)
+    try:
+        linhas = planilha.active.iter_rows(values_only=True)
+        cabecalho = next(linhas, None)
+        if cabecalho is None:
+            return
+        for valores in linhas:
+            yield dict(zip(cabecalho, valores))
+    finally:
+        planilha.close()
+
+# Escolhe o leitor adequado à extensão do arquivo
+def ler_linhas_projetos(nome_arquivo: str):
+    extensao = os.path.splitext(nome_arquivo)[1].lower()
+    if extensao in (".json", ".ndjson", ".jsonl"):
+        return _ler_linhas_json(nome_arquivo)
+    if extensao == ".csv":
+        return _ler_linhas_csv(nome_arquivo)
+    if extensao == ".xlsx":
+        return _ler_linhas_excel(nome_arquivo)
+    raise ValueError(f"Formato de arquivo não suportado: {extensao}")
+
+# Valida uma linha importada e a converte para os parâmetros do INSERT
+def validar_linha_projeto(linha: dict, tipos_fonte: dict, regioes: dict, manter_ids: bool = False) -> dict:
+    descricao = str(linha.get("DESCRICAO") or "").strip()
+    if not descricao:
+        raise ValueError("DESCRICAO vazia")
+    if len(descricao) > 255:
+        raise ValueError("DESCRICAO com mais de 255 caracteres")
+
+    try:
+        custo = float(linha.get("CUSTO"))
+    except (TypeError, ValueError):
+        raise ValueError(f"CUSTO inválido: {linha.get('CUSTO')!r}")
+    if custo <= 0:
+        raise ValueError("CUSTO deve ser positivo")
+
+    status = str(linha.get("STATUS") or "").strip()
+    if status not in STATUS_VALIDOS:
+        raise ValueError(f"STATUS inválido: {status!r}")
+
+    # Resolve as chaves estrangeiras contra as tabelas de referência
+    try:
+        id_tipo_fonte = int(linha.get("ID_TIPO_FONTE"))
+        id_regiao = int(linha.get("ID_REGIAO"))
+    except (TypeError, ValueError):
+        raise ValueError("ID_TIPO_FONTE/ID_REGIAO devem ser números inteiros")
+    if id_tipo_fonte not in tipos_fonte:
+        raise ValueError(f"ID_TIPO_FONTE {id_tipo_fonte} não existe")
+    if id_regiao not in regioes:
+        raise ValueError(f"ID_REGIAO {id_regiao} não existe")
+
+    parametros = {
+        "descricao": descricao,
+        "custo": custo,
+        "status": status,
+        "id_tipo_fonte": id_tipo_fonte,
+        "id_regiao": id_regiao,
+    }
+    if manter_ids:
+        # Mantém o ID exportado (a coluna aceita valores explícitos)
+        try:
+            parametros["id_projeto"] = int(linha.get("ID_PROJETO"))
+        except (TypeError, ValueError):
+            raise ValueError(f"ID_PROJETO inválido: {linha.get('ID_PROJETO')!r}")
+    return parametros
+
+# Envia um lote ao banco com executemany(), registrando os erros por linha
+def _inserir_lote(repositorio: Repositorio, lote: list, numeros_linha: list, erros: list, manter_ids: bool) -> int:
+    falhas = repositorio.inserir_projetos(lote, manter_ids)  # Um único round-trip; commit por lote
+    for posicao, mensagem in falhas:
+        erros.append((numeros_linha[posicao], mensagem))
+    return len(lote) - len(falhas)
+
+# Carrega projetos de um arquivo JSON, Excel ou CSV no banco, sem interação com o terminal
+def carregar_arquivo_projetos(
+    nome_arquivo: str,
+    tamanho_lote: int = TAMANHO_LOTE_IMPORTACAO,
+    manter_ids: bool = False,
+    ao_gravar_lote=None,
+) -> dict:
+    resumo = {"lidas": 0, "inseridas": 0, "erros": []}
+
+    # Carrega as tabelas de referência para validar as chaves estrangeiras
+    tipos_fonte = carregar_referencia("TBL_TIPO_FONTES", "ID_TIPO_FONTE", "NOME")
+    regioes = carregar_referencia("TBL_REGIOES_SUSTENTAVEIS", "ID_REGIAO", "NOME")
+    repositorio = obter_repositorio()
+
+    lote, numeros_linha = [], []
+    for numero, linha in enumerate(ler_linhas_projetos(nome_arquivo), start=1):
+        resumo["lidas"] += 1
+        try:
+            lote.append(validar_linha_projeto(linha, tipos_fonte, regioes, manter_ids))
+            numeros_linha.append(numero)
+        except ValueError as e:
+            resumo["erros"].append((numero, str(e)))
+
+        if len(lote) >= tamanho_lote:
+            resumo["inseridas"] += _inserir_lote(repositorio, lote, numeros_linha, resumo["erros"], manter_ids)
+            lote, numeros_linha = [], []
+            if ao_gravar_lote:
+                ao_gravar_lote(resumo)  # Permite acompanhar o progresso
+
+    if lote:
+        resumo["inseridas"] += _inserir_lote(repositorio, lote, numeros_linha, resumo["erros"], manter_ids)
+    return resumo
+
+# Importa projetos de um arquivo JSON, Excel ou CSV no formato gerado pelas exportações
+def importar_projetos(nome_arquivo: str, tamanho_lote: int = TAMANHO_LOTE_IMPORTACAO, manter_ids: bool = False) -> dict:
+    resumo = {"lidas": 0, "inseridas": 0, "erros": []}
+    try:
+        resumo = carregar_arquivo_projetos(
+            nome_arquivo,
+            tamanho_lote,
+            manter_ids,
+            ao_gravar_lote=lambda parcial: print(f"🔵 {parcial['inseridas']} projetos importados até agora..."),
+        )
+        print(f"\n🟢 Importação concluída: {resumo['inseridas']} de {resumo['lidas']} projetos inseridos.")
+        for numero, mensagem in resumo["erros"]:
+            print(f"🔴 Linha {numero}: {mensagem}")
+    except ModuleNotFoundError as e:
+        # Mensagem caso a biblioteca necessária não esteja instalada
+        print(f"\n🔴 O módulo '{e.name}' não está instalado. Por favor, instale-o usando 'pip install {e.name}'.")
+    except Exception as e:
+        # Exibe mensagem de erro caso a importação falhe
+        print(f"\n🔴 Erro ao importar projetos: {e}")
+        metricas.registrar_erro("importar_projetos", e)
+    return resumo
+
+# Exibe os relatórios de custos e emissões (calculados no próprio banco)
+def exibir_relatorios() -> None:
+    limpar_terminal()  # Limpa o terminal para exibição organizada
+    print("\n=== Relatórios ===")
+    print("1. Custos por região")
+    print("2. Custos por tipo de fonte")
+    print("3. Custos por status")
+    print("4. Emissões estimadas por região")
+    print("5. Emissões estimadas por tipo de fonte")
+    print("6. Os 10 projetos mais caros")
+    print("7. Simulação de custos e emissões (cenários)")
+    escolha = input("Escolha uma opção (1-7): ").strip()
+
+    try:
+        repositorio = obter_repositorio()
+        if escolha in ("1", "2", "3"):
+            dimensao = {"1": "regiao", "2": "fonte", "3": "status"}[escolha]
+            print()
+            for grupo in relatorios.custos_por_grupo_resumo(repositorio, (dimensao,)):
+                print(
+                    f"{grupo[dimensao.upper()]}: {grupo['QUANTIDADE']} projetos | "
+                    f"Total: R${grupo['CUSTO_TOTAL']:,.2f} | Média: R${grupo['CUSTO_MEDIO']:,.2f}"
+                )
+        elif escolha in ("4", "5"):
+            dimensao = {"4": "regiao", "5": "fonte"}[escolha]
+            print()
+            for grupo in relatorios.emissoes_por_grupo(repositorio, (dimensao,)):
+                print(
+                    f"{grupo[dimensao.upper()]}: {grupo['QUANTIDADE']} projetos | "
+                    f"Emissão total: {grupo['EMISSAO_TOTAL']:,.2f} | Média por projeto: {grupo['EMISSAO_MEDIA']:,.2f}"
+                )
+        elif escolha == "6":
+            for posicao, projeto in enumerate(relatorios.projetos_mais_caros(repositorio, 10), start=1):
+                print(
+                    f"\n{posicao}. ID: {projeto['ID_PROJETO']} | Descrição: {projeto['DESCRICAO']} | "
+                    f"Custo: R${projeto['CUSTO']:,.2f} | {projeto['TIPO_FONTE']} | {projeto['REGIAO']}"
+                )
+        elif escolha == "7":
+            import simulacao  # NumPy só é carregado quando há simulação
+
+            # Parâmetros em percentual (Enter mantém o padrão)
+            cenarios = int(validar_numero_positivo(input("Quantidade de cenários (10000): ") or "10000", "Cenários"))
+            anos = validar_numero_positivo(input("Anos simulados (1): ") or "1", "Anos")
+            inflacao = float(input("Inflação anual média em % (0): ") or "0") / 100
+            desvio_inflacao = float(input("Desvio da inflação anual em % (0): ") or "0") / 100
+            incerteza = float(input("Incerteza do custo de cada projeto em % (0): ") or "0") / 100
+
+            resultado = simulacao.simular(
+                simulacao.carregar_carteira(repositorio=repositorio), cenarios,
+                inflacao, desvio_inflacao, anos, incerteza_projeto=incerteza,
+            )
+            for linha in simulacao.linhas_resultado(resultado):
+                print(
+                    f"\n{linha['INDICADOR']}: Atual: {linha['BASE']:,.2f} | Média: {linha['MEDIA']:,.2f} | "
+                    f"P5: {linha['P5']:,.2f} | P95: {linha['P95']:,.2f}"
+                )
+            print(f"\n🟢 {resultado['cenarios']} cenários simulados em {resultado['segundos']} s.")
+        else:
+            print("\n🔴 Opção inválida.")
+    except Exception as e:
+        # Exibe mensagem de erro caso o relatório falhe
+        print(f"\n🔴 Erro ao gerar relatório: {e}")
+        metricas.registrar_erro("relatorio", e)
+    input("\nPressione Enter para continuar...")
+
 # Exibe o menu principal
 def exibir_menu() -> None:
     limpar_terminal()  # Limpa o terminal antes de exibir o menu
@@ -556,7 +1173,10 @@ def exibir_menu() -> None:
     print("3. Excluir Projeto pelo ID")
     print("4. Consultar Projetos pelo status")
     print("5. Exportar Projetos para JSON ou DataFrame")
-    print("6. Sair")
+    print("6. Importar Projetos de JSON, Excel ou CSV")
+    print("7. Relatórios de custos e emissões")
+    print("8. Buscar Projetos pela descrição")
+    print("9. Sair")
 
 # Função principal que controla o fluxo do programa
 def main() -> None:
@@ -573,31 +1193,68 @@ def main() -> None:
             consultar_projetos()  # Chama a função para consultar projetos
         elif opcao == "5":
             # Realiza a exportação de projetos
-            projects = consultar_projetos(export=True)
+            status, projects = consultar_projetos(export=True)
             if projects:
                 while True:
                     print("\n=== Exportar Dados ===")
                     print("1. Exportar para JSON")
                     print("2. Exportar para Excel")
-                    export_opcao = input("Escolha uma opção (1-2): ").strip()
-                    if export_opcao == "1":
-                        exportar_json(projects)  # Exporta para JSON
+                    print("3. Exportar para NDJSON (um projeto por linha)")
+                    print("4. Exportar para Parquet")
+                    print("5. Exportar para Feather")
+                    print("6. Exportar para CSV")
+                    print("7. Exportar para vários formatos de uma vez")
+                    export_opcao = input("Escolha uma opção (1-7): ").strip()
+                    if export_opcao in ("1", "3"):
+                        # Opções do arquivo JSON
+                        formato = "ndjson" if export_opcao == "3" else "json"
+                        compacto = formato == "json" and input("Formato compacto, sem indentação? (s/n): ").strip().lower() == "s"
+                        gzip_ativo = input("Compactar com gzip? (s/n): ").strip().lower() == "s"
+                        exportar_json(projects, formato=formato, compacto=compacto, gzip_ativo=gzip_ativo)
                         break
                     elif export_opcao == "2":
-                        exportar_DataFrame(projects)  # Exporta para Excel
+                        exportar_DataFrame(status=status)  # Exporta para Excel (lotes colunares do banco)
+                        break
+                    elif export_opcao in ("4", "5", "6"):
+                        # Exporta em formato colunar, buscando os projetos do status direto em lotes colunares
+                        formato = {"4": "parquet", "5": "feather", "6": "csv"}[export_opcao]
+                        exportar_colunar(formato, status=status)
+                        break
+                    elif export_opcao == "7":
+                        # Uma única leitura do banco alimenta todos os formatos escolhidos
+                        formatos = [
+                            parte.strip().lower()
+                            for parte in input("Formatos separados por vírgula (ex.: json,xlsx,parquet): ").split(",")
+                            if parte.strip()
+                        ]
+                        exportar_varios_formatos(projects, list(dict.fromkeys(formatos)))
                         break
                     else:
                         print("🔴 Opção inválida. Tente novamente.")
             else:
                 print("🔴 Nenhum dado disponível para exportação.")
         elif opcao == "6":
+            # Realiza a importação em lote de projetos
+            nome_arquivo = input("\nCaminho do arquivo a importar: ").strip()
+            if os.path.isfile(nome_arquivo):
+                importar_projetos(nome_arquivo)
+            else:
+                print("🔴 Arquivo não encontrado.")
+            input("\nPressione Enter para continuar...")
+        elif opcao == "7":
+            exibir_relatorios()  # Exibe os relatórios agregados
+        elif opcao == "8":
+            buscar_projetos_descricao()  # Busca textual na descrição dos projetos
+        elif opcao == "9":
             # Finaliza o sistema
             print("\n🟢 Saindo do sistema...")
+            encerrar_pool()  # Libera as conexões mantidas pelo pool
             break
         else:
             # Mensagem para opções inválidas
             print("\n🔴 Opção inválida. Tente novamente.")
             input("\nPressione Enter para continuar...")
 
-# Executa a função principal
-main()
+# Executa a função principal (apenas quando o arquivo é executado diretamente)
+if __name__ == "__main__":
+    main()
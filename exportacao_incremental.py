@@ -0,0 +1,91 @@
+# ================================ Imports ================================
+import os
+import time
+from datetime import datetime
+
+import código_fonte as cf
+import exportacao_multipla
+import metricas
+from repositorio import Repositorio
+
+
+# ============================= Configurações =============================
+
+# Consumidor usado quando nenhum nome de marca d'água é informado
+MARCA_PADRAO = os.getenv("MARCA_EXPORTACAO", "padrao")
+
+# Marca de quem nunca exportou: todos os projetos (inclusive os anteriores à captura, com número 0) entram
+SEM_MARCA = -1
+
+
+# ============================== Subalgoritmos ============================
+
+# Prefixo padrão dos arquivos de uma exportação incremental (com hora, pois pode rodar várias vezes por dia)
+def prefixo_padrao() -> str:
+    return f"projetos_alteracoes_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}"
+
+# Exclusões no formato gravado no arquivo de exclusões
+def _exclusoes_para_dict(blocos):
+    for bloco in blocos:
+        for id_projeto, id_alteracao, excluido_em in bloco:
+            yield {"ID_PROJETO": id_projeto, "ID_ALTERACAO": id_alteracao, "EXCLUIDO_EM": str(excluido_em)}
+
+# Exporta apenas o que mudou desde a marca d'água do consumidor: os projetos inseridos/alterados no formato
+# escolhido e os IDs excluídos em um JSON à parte, com um manifesto da faixa exportada.
+# Quem consome aplica as exclusões e depois as linhas alteradas. A marca só avança depois que os arquivos foram gravados.
+# No Oracle, uma transação aberta durante a exportação pode fazer commit depois de um número menor que a marca:
+# a marca guarda também o instante seguro (início da transação aberta mais antiga), e a exportação seguinte relê
+# tudo o que foi gravado desde ele. As linhas relidas são repetidas; o "upsert" por ID no consumidor as absorve.
+def exportar_alteracoes(
+    formato: str,
+    prefixo: str | None = None,
+    marca: str = MARCA_PADRAO,
+    compacto: bool = False,
+    gzip_ativo: bool = False,
+    avancar: bool = True,
+    tamanho_lote: int = cf.TAMANHO_LOTE_CONSULTA,
+    repositorio: Repositorio | None = None,
+) -> dict:
+    if formato not in exportacao_multipla.FORMATOS_MULTIPLOS:
+        raise ValueError(f"Formato não suportado: {formato}")
+    repositorio = repositorio or cf.obter_repositorio()
+    prefixo = prefixo or prefixo_padrao()
+
+    inicio = time.perf_counter()
+    with metricas.medir("exportar_alteracoes"):
+        # A faixa (desde, ate] é fixada antes da leitura: o que mudar durante a exportação fica para a próxima.
+        # O instante seguro é lido antes do "ate": toda transação ainda não confirmada na leitura grava depois dele.
+        desde, seguro_em = repositorio.ler_marca(marca) or (SEM_MARCA, None)
+        novo_seguro_em = repositorio.instante_seguro()
+        ate = repositorio.ultima_alteracao()
+
+        linhas = (
+            linha for bloco in repositorio.alteracoes_projetos(desde, ate, tamanho_lote, seguro_em) for linha in bloco
+        )
+        alterados = exportacao_multipla.gravar_formato(
+            formato, linhas, prefixo + exportacao_multipla.extensao_formato(formato, gzip_ativo), compacto, gzip_ativo
+        )
+        exclusoes = cf.gravar_json(
+            _exclusoes_para_dict(repositorio.exclusoes_projetos(desde, ate, tamanho_lote, seguro_em)),
+            f"{prefixo}_excluidos.json",
+            compacto=compacto,
+        )
+        manifesto = {
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "marca": marca,
+            "desde": desde,
+            "ate": ate,
+            "releitura_desde": None if seguro_em is None else str(seguro_em),
+            "alterados": alterados["linhas"],
+            "excluidos": exclusoes["linhas"],
+            "segundos": round(time.perf_counter() - inicio, 3),
+            "arquivos": [
+                exportacao_multipla.entrada_manifesto(formato, alterados),
+                exportacao_multipla.entrada_manifesto("json", exclusoes),
+            ],
+            "erros": {},
+        }
+        manifesto = exportacao_multipla.gravar_manifesto(manifesto, f"{prefixo}_manifesto.json")
+        if avancar:
+            repositorio.gravar_marca(marca, ate, novo_seguro_em)
+    return manifesto
@@ -0,0 +1,172 @@
+# ================================ Imports ================================
+import hashlib
+import json
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+
+import código_fonte as cf
+import metricas
+
+
+# ============================= Configurações =============================
+
+# Páginas que cada escritor pode acumular antes de o leitor esperar por ele (limita a memória)
+TAMANHO_FILA_EXPORTACAO = int(os.getenv("TAMANHO_FILA_EXPORTACAO", "8"))
+
+# Formatos aceitos na exportação múltipla
+FORMATOS_MULTIPLOS = ("json", "ndjson", "xlsx", "parquet", "feather", "csv")
+
+# Marcadores enviados pelo leitor aos escritores
+_FIM = object()
+_CANCELADO = object()
+
+
+# ============================== Subalgoritmos ============================
+
+# Extensão padrão do arquivo de cada formato
+def extensao_formato(formato: str, gzip_ativo: bool = False) -> str:
+    if formato in ("json", "ndjson"):
+        return f".{formato}" + (".gz" if gzip_ativo else "")
+    return cf.FORMATOS_COLUNARES[formato][0]
+
+# Linhas recebidas pela fila de um escritor, até o fim da exportação
+def _linhas_da_fila(fila: queue.Queue):
+    while True:
+        pagina = fila.get()
+        if pagina is _FIM:
+            return
+        if pagina is _CANCELADO:
+            raise RuntimeError("Exportação cancelada: falha ao ler os projetos.")
+        yield from pagina
+
+# Esvazia a fila de um escritor que falhou, para o leitor não ficar bloqueado esperando por ele
+def _descartar_fila(fila: queue.Queue) -> None:
+    while fila.get() not in (_FIM, _CANCELADO):
+        pass
+
+# SHA-256 de um arquivo, lido em blocos
+def soma_verificacao(nome_arquivo: str, tamanho_bloco: int = 1_048_576) -> str:
+    soma = hashlib.sha256()
+    with open(nome_arquivo, "rb") as arquivo:
+        while bloco := arquivo.read(tamanho_bloco):
+            soma.update(bloco)
+    return soma.hexdigest()
+
+# Grava linhas de projetos em um arquivo do formato escolhido, retornando as estatísticas do gravador.
+# O arquivo é gravado com um nome temporário e só recebe o nome final quando termina: se a leitura ou a gravação
+# falhar, o arquivo parcial é removido em vez de ficar ao lado dos arquivos completos.
+# O Excel usa o escritor colunar em modo somente escrita, que não guarda as linhas em memória.
+def gravar_formato(formato: str, linhas, nome_arquivo: str | None = None, compacto: bool = False, gzip_ativo: bool = False) -> dict:
+    nome_arquivo = nome_arquivo or cf.nome_arquivo_padrao(extensao_formato(formato, gzip_ativo))
+    temporario = f"{nome_arquivo}.parcial"
+    try:
+        if formato in ("json", "ndjson"):
+            estatisticas = cf.gravar_json(linhas, temporario, formato, compacto, gzip_ativo)
+        else:
+            estatisticas = cf.gravar_colunar(formato, dados=linhas, nome_arquivo=temporario)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+    os.replace(temporario, nome_arquivo)
+    return {**estatisticas, "arquivo": nome_arquivo}
+
+# Entrada do manifesto de um arquivo gerado (com a soma de verificação)
+def entrada_manifesto(formato: str, estatisticas: dict) -> dict:
+    return {
+        "formato": formato,
+        "arquivo": estatisticas["arquivo"],
+        "linhas": estatisticas["linhas"],
+        "bytes": estatisticas["bytes"],
+        "sha256": soma_verificacao(estatisticas["arquivo"]),
+        "segundos": round(estatisticas["segundos"], 3),
+    }
+
+# Grava o manifesto (JSON) e retorna o seu conteúdo com o nome do arquivo
+def gravar_manifesto(manifesto: dict, nome_manifesto: str | None = None) -> dict:
+    nome_manifesto = nome_manifesto or cf.nome_arquivo_padrao("_manifesto.json")
+    with open(nome_manifesto, "w", encoding="utf-8") as arquivo:
+        json.dump(manifesto, arquivo, ensure_ascii=False, indent=2)
+    return {**manifesto, "manifesto": nome_manifesto}
+
+# Grava um formato a partir das linhas da fila e calcula a soma de verificação do arquivo gerado
+def _escrever_formato(formato: str, nome_arquivo: str | None, fila: queue.Queue, compacto: bool, gzip_ativo: bool) -> dict:
+    linhas = _linhas_da_fila(fila)
+    try:
+        estatisticas = gravar_formato(formato, linhas, nome_arquivo, compacto, gzip_ativo)
+    except BaseException:
+        if linhas.gi_frame is not None:  # O escritor parou antes do fim das linhas: libera o leitor
+            _descartar_fila(fila)
+        raise
+    return entrada_manifesto(formato, estatisticas)
+
+# Exporta as mesmas linhas para vários formatos em uma única leitura.
+# "destinos" mapeia formato -> arquivo (None = nome padrão). Cada escritor roda em uma thread e recebe as
+# páginas por uma fila limitada: um escritor lento (Excel) faz o leitor esperar em vez de acumular tudo em memória.
+# Se a leitura falhar, nenhum arquivo é deixado; se um escritor falhar, os demais formatos são gravados.
+def exportar_varios(
+    dados,
+    destinos: dict,
+    nome_manifesto: str | None = None,
+    compacto: bool = False,
+    gzip_ativo: bool = False,
+    tamanho_pagina: int = cf.TAMANHO_LOTE_CONSULTA,
+    tamanho_fila: int = TAMANHO_FILA_EXPORTACAO,
+) -> dict:
+    invalidos = [formato for formato in destinos if formato not in FORMATOS_MULTIPLOS]
+    if invalidos or not destinos:
+        raise ValueError(f"Formato não suportado: {', '.join(invalidos) or '(nenhum)'}")
+
+    inicio = time.perf_counter()
+    filas = {formato: queue.Queue(maxsize=tamanho_fila) for formato in destinos}
+    linhas_lidas = 0
+    with metricas.medir("exportar_varios"), ThreadPoolExecutor(max_workers=len(destinos), thread_name_prefix="exportacao") as executor:
+        futuros = {
+            formato: executor.submit(_escrever_formato, formato, nome_arquivo, filas[formato], compacto, gzip_ativo)
+            for formato, nome_arquivo in destinos.items()
+        }
+        try:
+            # Lê os projetos uma única vez e entrega cada página a todos os escritores
+            linhas = iter(dados)
+            while pagina := list(islice(linhas, tamanho_pagina)):
+                linhas_lidas += len(pagina)
+                for fila in filas.values():
+                    fila.put(pagina)  # Bloqueia enquanto a fila do escritor estiver cheia
+        except BaseException:
+            for fila in filas.values():
+                fila.put(_CANCELADO)
+            raise
+        for fila in filas.values():
+            fila.put(_FIM)
+
+        arquivos, erros = [], {}
+        for formato, futuro in futuros.items():
+            try:
+                arquivos.append(futuro.result())
+            except Exception as e:
+                erros[formato] = str(e)
+
+    manifesto = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "linhas_lidas": linhas_lidas,
+        "segundos": round(time.perf_counter() - inicio, 3),
+        "arquivos": arquivos,
+        "erros": erros,
+    }
+    return gravar_manifesto(manifesto, nome_manifesto)
+
+# Confere os arquivos listados em um manifesto (existência e soma de verificação), retornando as divergências
+def verificar_manifesto(nome_manifesto: str) -> list[str]:
+    with open(nome_manifesto, "r", encoding="utf-8") as arquivo:
+        manifesto = json.load(arquivo)
+    divergencias = []
+    for entrada in manifesto["arquivos"]:
+        if not os.path.exists(entrada["arquivo"]):
+            divergencias.append(f"{entrada['arquivo']}: arquivo não encontrado")
+        elif soma_verificacao(entrada["arquivo"]) != entrada["sha256"]:
+            divergencias.append(f"{entrada['arquivo']}: soma de verificação diferente")
+    return divergencias
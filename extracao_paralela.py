@@ -0,0 +1,156 @@
+# ================================ Imports ================================
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import código_fonte as cf
+import exportacao_multipla
+import metricas
+from repositorio import Repositorio
+
+
+# ============================= Configurações =============================
+
+# Faixas lidas ao mesmo tempo, cada uma em uma conexão própria (no Oracle, limitado pelo tamanho do pool)
+GRAU_PARALELISMO = int(os.getenv("GRAU_PARALELISMO", str(cf.POOL_MAX)))
+
+# Páginas que uma faixa pode ler adiantado enquanto espera a sua vez na leitura em ordem
+PAGINAS_ADIANTADAS = int(os.getenv("PAGINAS_ADIANTADAS", "4"))
+
+# Intervalo (s) em que uma leitura bloqueada verifica se a extração foi interrompida
+_INTERVALO_VERIFICACAO = 0.1
+
+# Marcador de fim de uma faixa
+_FIM = object()
+
+
+# ============================== Subalgoritmos ============================
+
+# Leitores simultâneos efetivos. No Oracle, cada faixa prende uma conexão do pool enquanto espera a sua vez na
+# fila: acima de POOL_MAX, faixas seguintes podem tomar todas as conexões e a faixa que o consumidor espera
+# falharia por tempo de espera na aquisição.
+def limitar_paralelismo(repositorio: Repositorio, paralelismo: int) -> int:
+    if repositorio.dialeto == "oracle":
+        return max(1, min(paralelismo, cf.POOL_MAX))
+    return max(1, paralelismo)
+
+# Divide os projetos em faixas de ID_PROJETO (por padrão, uma por leitor)
+def calcular_particoes(repositorio: Repositorio, partes: int, status: str | None = None) -> list[dict]:
+    return [
+        {"parte": parte, "id_inicial": id_inicial, "id_final": id_final, "linhas": quantidade}
+        for parte, id_inicial, id_final, quantidade in repositorio.particoes_projetos(partes, status)
+    ]
+
+# Páginas de uma faixa de IDs, lidas em uma conexão própria
+def paginas_da_particao(repositorio: Repositorio, particao: dict, status: str | None, tamanho_lote: int):
+    return repositorio.paginar_projetos(
+        status, tamanho_lote, ultimo_id=particao["id_inicial"] - 1, id_final=particao["id_final"]
+    )
+
+# Coloca um item na fila, desistindo se a extração for interrompida (o consumidor parou de ler)
+def _colocar(fila: queue.Queue, item, interrompido: threading.Event) -> bool:
+    while not interrompido.is_set():
+        try:
+            fila.put(item, timeout=_INTERVALO_VERIFICACAO)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+# Lê uma faixa inteira para a sua fila (o erro, se houver, vai pela fila para o consumidor)
+def _ler_particao(repositorio, particao, status, tamanho_lote, fila, interrompido) -> None:
+    try:
+        paginas = paginas_da_particao(repositorio, particao, status, tamanho_lote)
+        try:
+            for pagina in paginas:
+                if not _colocar(fila, pagina, interrompido):
+                    return
+        finally:
+            paginas.close()  # Devolve a conexão
+        _colocar(fila, _FIM, interrompido)
+    except Exception as e:
+        _colocar(fila, e, interrompido)
+
+# Percorre os projetos em ordem de ID, lendo várias faixas ao mesmo tempo em conexões separadas.
+# A faixa atual é entregue enquanto as seguintes já são lidas, cada uma com no máximo "adiantadas" páginas em memória.
+def extrair_em_ordem(
+    status: str | None = None,
+    paralelismo: int = GRAU_PARALELISMO,
+    tamanho_lote: int = cf.TAMANHO_LOTE_CONSULTA,
+    adiantadas: int = PAGINAS_ADIANTADAS,
+    repositorio: Repositorio | None = None,
+):
+    repositorio = repositorio or cf.obter_repositorio()
+    paralelismo = limitar_paralelismo(repositorio, paralelismo)
+    particoes = calcular_particoes(repositorio, paralelismo, status)
+    filas = [queue.Queue(maxsize=adiantadas) for _ in particoes]
+    interrompido = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=paralelismo, thread_name_prefix="extracao")
+    try:
+        # As faixas entram no pool em ordem: a faixa sendo entregue sempre já começou a ser lida
+        for particao, fila in zip(particoes, filas):
+            executor.submit(_ler_particao, repositorio, particao, status, tamanho_lote, fila, interrompido)
+        for fila in filas:
+            while (pagina := fila.get()) is not _FIM:
+                if isinstance(pagina, Exception):
+                    raise pagina
+                yield from pagina
+    finally:
+        interrompido.set()  # Libera as leituras bloqueadas se o consumidor parar antes do fim
+        executor.shutdown(wait=True)
+
+# Exporta cada faixa de IDs para um arquivo próprio, lendo e gravando as faixas em paralelo, com manifesto
+def exportar_particoes(
+    formato: str,
+    prefixo: str | None = None,
+    status: str | None = None,
+    paralelismo: int = GRAU_PARALELISMO,
+    partes: int | None = None,
+    nome_manifesto: str | None = None,
+    compacto: bool = False,
+    gzip_ativo: bool = False,
+    tamanho_lote: int = cf.TAMANHO_LOTE_CONSULTA,
+    repositorio: Repositorio | None = None,
+) -> dict:
+    if formato not in exportacao_multipla.FORMATOS_MULTIPLOS:
+        raise ValueError(f"Formato não suportado: {formato}")
+    repositorio = repositorio or cf.obter_repositorio()
+    paralelismo = limitar_paralelismo(repositorio, paralelismo)  # Mais partes que leitores: as demais esperam na fila
+    prefixo = prefixo or os.path.splitext(cf.nome_arquivo_padrao(""))[0]
+    extensao = exportacao_multipla.extensao_formato(formato, gzip_ativo)
+
+    # Grava uma faixa: as linhas vêm direto da sua própria conexão
+    def exportar_particao(particao: dict) -> dict:
+        paginas = paginas_da_particao(repositorio, particao, status, tamanho_lote)
+        linhas = (linha for pagina in paginas for linha in pagina)
+        nome_arquivo = f"{prefixo}_parte{particao['parte']:03d}{extensao}"
+        try:
+            estatisticas = exportacao_multipla.gravar_formato(formato, linhas, nome_arquivo, compacto, gzip_ativo)
+        finally:
+            paginas.close()  # Devolve a conexão mesmo se a gravação falhar
+        return {**exportacao_multipla.entrada_manifesto(formato, estatisticas), "id_inicial": particao["id_inicial"], "id_final": particao["id_final"]}
+
+    inicio = time.perf_counter()
+    with metricas.medir(f"exportar_particoes_{formato}"):
+        particoes = calcular_particoes(repositorio, partes or paralelismo, status)
+        with ThreadPoolExecutor(max_workers=paralelismo, thread_name_prefix="extracao") as executor:
+            futuros = [executor.submit(exportar_particao, particao) for particao in particoes]
+        arquivos, erros = [], {}
+        for particao, futuro in zip(particoes, futuros):
+            try:
+                arquivos.append(futuro.result())
+            except Exception as e:
+                erros[f"parte{particao['parte']:03d}"] = str(e)
+
+    manifesto = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "linhas_lidas": sum(arquivo["linhas"] for arquivo in arquivos),
+        "segundos": round(time.perf_counter() - inicio, 3),
+        "paralelismo": paralelismo,
+        "arquivos": arquivos,
+        "erros": erros,
+    }
+    return exportacao_multipla.gravar_manifesto(manifesto, nome_manifesto or f"{prefixo}_manifesto.json")
@@ -0,0 +1,90 @@
+# ================================ Imports ================================
+import argparse
+import random
+import time
+
+from repositorio import Repositorio, criar_repositorio_sqlite
+
+
+# ============================= Configurações =============================
+
+# Dados de referência usados na geração
+TIPOS_FONTE = ["Solar", "Eólica", "Hidrelétrica", "Biomassa", "Geotérmica"]
+REGIOES = ["Norte", "Nordeste", "Centro-Oeste", "Sudeste", "Sul"]
+
+# Fatores de emissão (tCO2e) por tipo de fonte, na mesma ordem de TIPOS_FONTE
+EMISSOES = [41.0, 11.0, 24.0, 230.0, 38.0]
+
+# Palavras usadas para montar descrições variadas
+PALAVRAS_DESCRICAO = [
+    "Usina", "Parque", "Instalação", "Projeto", "Comunitária", "Rural", "Urbana",
+    "Geração", "Energia", "Distribuída", "Sustentável", "Cooperativa", "Escolas",
+    "Hospitais", "Regiões", "Carentes", "Ampliação", "Modernização", "Piloto",
+]
+
+
+# ============================== Subalgoritmos ============================
+
+# Popula as tabelas de referência e de emissões (apenas se estiverem vazias)
+def popular_referencias(repositorio: Repositorio) -> tuple[list[int], list[int]]:
+    if not repositorio.listar_referencia("TBL_TIPO_FONTES"):
+        repositorio.inserir_referencia("TBL_TIPO_FONTES", TIPOS_FONTE)
+    if not repositorio.listar_referencia("TBL_REGIOES_SUSTENTAVEIS"):
+        repositorio.inserir_referencia("TBL_REGIOES_SUSTENTAVEIS", REGIOES)
+
+    ids_tipo_fonte = [linha[0] for linha in repositorio.listar_referencia("TBL_TIPO_FONTES")]
+    ids_regiao = [linha[0] for linha in repositorio.listar_referencia("TBL_REGIOES_SUSTENTAVEIS")]
+    if not repositorio.listar_emissoes():
+        repositorio.inserir_emissoes(
+            [{"id_tipo_fonte": id_tipo, "emissao": emissao} for id_tipo, emissao in zip(ids_tipo_fonte, EMISSOES)]
+        )
+    return ids_tipo_fonte, ids_regiao
+
+# Gera um lote de projetos aleatórios
+def gerar_lote_projetos(quantidade: int, ids_tipo_fonte: list[int], ids_regiao: list[int], gerador: random.Random) -> list[dict]:
+    return [
+        {
+            "descricao": " ".join(gerador.sample(PALAVRAS_DESCRICAO, 4)),
+            "custo": round(gerador.uniform(1_000, 5_000_000), 2),
+            "status": gerador.choice(("Em andamento", "Concluído")),
+            "id_tipo_fonte": gerador.choice(ids_tipo_fonte),
+            "id_regiao": gerador.choice(ids_regiao),
+        }
+        for _ in range(quantidade)
+    ]
+
+# Popula o banco com a quantidade de projetos pedida, em lotes
+def popular_projetos(repositorio: Repositorio, total: int, tamanho_lote: int = 10_000, semente: int = 42) -> None:
+    gerador = random.Random(semente)
+    ids_tipo_fonte, ids_regiao = popular_referencias(repositorio)
+
+    inicio = time.perf_counter()
+    for inseridos in range(0, total, tamanho_lote):
+        quantidade = min(tamanho_lote, total - inseridos)
+        repositorio.inserir_projetos(gerar_lote_projetos(quantidade, ids_tipo_fonte, ids_regiao, gerador))
+        print(f"🔵 {inseridos + quantidade:,} de {total:,} projetos gerados...", end="\r")
+    segundos = time.perf_counter() - inicio
+    print(f"\n🟢 {total:,} projetos gerados em {segundos:.1f} s ({total / max(segundos, 1e-9):,.0f} projetos/s)")
+
+# Gera dados sintéticos para testes e benchmarks
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gera projetos sintéticos para testes e benchmarks.")
+    parser.add_argument("--backend", choices=("sqlite", "oracle"), default="sqlite", help="Banco a ser populado")
+    parser.add_argument("--sqlite", default="projetos.db", help="Arquivo SQLite (backend sqlite)")
+    parser.add_argument("--projetos", type=int, default=100_000, help="Quantidade de projetos a gerar")
+    parser.add_argument("--lote", type=int, default=10_000, help="Projetos por executemany()")
+    parser.add_argument("--semente", type=int, default=42, help="Semente do gerador aleatório")
+    args = parser.parse_args()
+
+    if args.backend == "sqlite":
+        repositorio = criar_repositorio_sqlite(args.sqlite)
+    else:
+        # Pool Oracle configurado no código-fonte (mesmo com BACKEND_BD=sqlite)
+        import código_fonte
+        repositorio = código_fonte.criar_repositorio_pool_oracle()
+    popular_projetos(repositorio, args.projetos, args.lote, args.semente)
+
+
+# Executa o gerador
+if __name__ == "__main__":
+    main()
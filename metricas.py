@@ -0,0 +1,373 @@
+# ================================ Imports ================================
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+
+# ============================= Configurações =============================
+
+# Liga a coleta de métricas ao iniciar (desligada, cada medição custa apenas uma verificação)
+METRICAS_ATIVAS = os.getenv("METRICAS", "0") == "1"
+
+# Arquivo JSON (um objeto por linha) que recebe cada operação medida; vazio = sem registro
+METRICAS_LOG = os.getenv("METRICAS_LOG", "")
+
+# Limites (em segundos) dos baldes dos histogramas de latência
+LIMITES_HISTOGRAMA = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Prefixo dos nomes das métricas no formato Prometheus
+PREFIXO_PROMETHEUS = "projetos"
+
+
+# ================================ Estado =================================
+
+_ativo = METRICAS_ATIVAS
+_lock = threading.Lock()
+_operacoes: dict[str, dict] = {}  # nome -> contadores e baldes do histograma
+_arquivo_log = None
+_sequencia = itertools.count(1)  # IDs das medições (next() é atômico no CPython)
+_medicao_atual = contextvars.ContextVar("medicao_atual", default=None)  # Operação em andamento (por thread/tarefa)
+
+
+# Contadores vazios de uma operação
+def _novos_contadores() -> dict:
+    return {
+        "contagem": 0,
+        "segundos": 0.0,
+        "erros": 0,
+        "idas": 0,
+        "linhas": 0,
+        "bytes": 0,
+        "baldes": [0] * (len(LIMITES_HISTOGRAMA) + 1),  # O último balde é o +Inf
+    }
+
+# Soma valores nos contadores de uma operação
+def _acumular(operacao: str, segundos: float | None = None, erro: bool = False, idas: int = 0, linhas: int = 0, bytes_: int = 0) -> None:
+    with _lock:
+        contadores = _operacoes.get(operacao)
+        if contadores is None:
+            contadores = _operacoes[operacao] = _novos_contadores()
+        if segundos is not None:
+            contadores["contagem"] += 1
+            contadores["segundos"] += segundos
+            indice = 0
+            while indice < len(LIMITES_HISTOGRAMA) and segundos > LIMITES_HISTOGRAMA[indice]:
+                indice += 1
+            contadores["baldes"][indice] += 1
+        contadores["erros"] += erro
+        contadores["idas"] += idas
+        contadores["linhas"] += linhas
+        contadores["bytes"] += bytes_
+
+# Grava uma linha no registro JSON (se configurado)
+def _registrar_log(entrada: dict) -> None:
+    global _arquivo_log
+    with _lock:
+        if _arquivo_log is None:
+            if not METRICAS_LOG:
+                return
+            _arquivo_log = open(METRICAS_LOG, "a", encoding="utf-8", buffering=1)  # Uma linha por escrita
+        _arquivo_log.write(json.dumps(entrada, ensure_ascii=False, default=str) + "\n")
+
+
+# Linha do registro JSON de uma operação (com o rastro: ID da medição e da medição em que ela começou)
+def _entrada_log(
+    operacao: str,
+    segundos: float | None,
+    idas: int,
+    linhas: int,
+    bytes_: int,
+    erro: BaseException | None = None,
+    id_medicao: int | None = None,
+    pai: int | None = None,
+) -> dict:
+    entrada = {
+        "data": datetime.now().isoformat(timespec="milliseconds"),
+        "operacao": operacao,
+        "id": id_medicao,
+        "pai": pai,
+        "segundos": round(segundos, 6) if segundos is not None else None,
+        "idas": idas,
+        "linhas": linhas,
+        "bytes": bytes_,
+    }
+    if erro is not None:
+        entrada["erro"] = f"{type(erro).__name__}: {erro}"
+    return entrada
+
+
+# =============================== Medições ================================
+
+# Medição de uma operação: tempo, idas e voltas ao banco, linhas lidas e bytes gravados.
+# As medições aninhadas formam um rastro (cada uma guarda o ID da medição em que começou).
+class Medicao:
+    __slots__ = ("operacao", "id", "pai", "inicio", "idas", "linhas_lidas", "bytes_gravados", "_token")
+
+    def __init__(self, operacao: str):
+        self.operacao = operacao
+        self.idas = self.linhas_lidas = self.bytes_gravados = 0
+
+    def __enter__(self) -> "Medicao":
+        pai = _medicao_atual.get()
+        self.pai = pai.id if pai else None
+        self.id = next(_sequencia)
+        self._token = _medicao_atual.set(self)
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, erro, rastro) -> bool:
+        segundos = time.perf_counter() - self.inicio
+        _medicao_atual.reset(self._token)
+        _acumular(self.operacao, segundos, erro is not None, self.idas, self.linhas_lidas, self.bytes_gravados)
+        if METRICAS_LOG:
+            _registrar_log(
+                _entrada_log(self.operacao, segundos, self.idas, self.linhas_lidas, self.bytes_gravados, erro, self.id, self.pai)
+            )
+        return False  # Não suprime a exceção
+
+    # Conta idas e voltas ao banco
+    def ida(self, quantidade: int = 1) -> None:
+        self.idas += quantidade
+
+    # Conta linhas lidas do banco
+    def linhas(self, quantidade: int) -> None:
+        self.linhas_lidas += quantidade
+
+    # Conta bytes gravados
+    def bytes(self, quantidade: int) -> None:
+        self.bytes_gravados += quantidade
+
+
+# Medição que não faz nada (usada com as métricas desligadas)
+class _MedicaoNula:
+    __slots__ = ()
+    operacao = None
+
+    def __enter__(self) -> "_MedicaoNula":
+        return self
+
+    def __exit__(self, tipo, erro, rastro) -> bool:
+        return False
+
+    def ida(self, quantidade: int = 1) -> None:
+        pass
+
+    def linhas(self, quantidade: int) -> None:
+        pass
+
+    def bytes(self, quantidade: int) -> None:
+        pass
+
+
+MEDICAO_NULA = _MedicaoNula()
+
+
+# Mede uma operação em um bloco "with" (com as métricas desligadas, retorna uma medição que não faz nada)
+def medir(operacao: str):
+    if not _ativo:
+        return MEDICAO_NULA
+    return Medicao(operacao)
+
+# Soma idas e voltas, linhas e bytes a uma operação sem medir tempo
+def contar(operacao: str, idas: int = 0, linhas: int = 0, bytes_: int = 0) -> None:
+    if _ativo:
+        _acumular(operacao, idas=idas, linhas=linhas, bytes_=bytes_)
+
+# Registra uma operação já medida por quem a executou (por exemplo, uma exportação que calcula o próprio tempo)
+def registrar(operacao: str, segundos: float, idas: int = 0, linhas: int = 0, bytes_: int = 0) -> None:
+    if not _ativo:
+        return
+    _acumular(operacao, segundos, False, idas, linhas, bytes_)
+    if METRICAS_LOG:
+        medicao = _medicao_atual.get()
+        _registrar_log(_entrada_log(operacao, segundos, idas, linhas, bytes_, pai=medicao.id if medicao else None))
+
+# Registra um erro tratado (que foi apenas exibido ao usuário) em uma operação
+def registrar_erro(operacao: str, erro: BaseException) -> None:
+    if not _ativo:
+        return
+    _acumular(operacao, erro=True)
+    if METRICAS_LOG:
+        _registrar_log(_entrada_log(operacao, None, 0, 0, 0, erro))
+
+# Nome da operação em andamento no contexto atual (ou None)
+def operacao_atual() -> str | None:
+    medicao = _medicao_atual.get()
+    return medicao.operacao if medicao else None
+
+
+# ============================ Conexões medidas ===========================
+
+# Cursor que conta as idas e voltas e as linhas buscadas, atribuindo-as ao comando que as gerou
+class CursorMedido:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._operacao = "sql"
+
+    # Guarda a operação que executou o comando e conta a ida e volta nela (as buscas vêm depois, fora da medição)
+    def _contar_execucao(self) -> None:
+        medicao = _medicao_atual.get()
+        if medicao:
+            self._operacao = medicao.operacao
+            medicao.ida()
+        else:
+            self._operacao = "sql"
+            contar(self._operacao, idas=1)
+
+    def execute(self, sql: str, parametros=None, **kwargs):
+        self._contar_execucao()
+        return self._cursor.execute(sql, parametros or {}, **kwargs)
+
+    def executemany(self, sql: str, parametros, **kwargs):
+        self._contar_execucao()  # Um executemany envia o lote inteiro de uma vez
+        return self._cursor.executemany(sql, parametros, **kwargs)
+
+    def fetchone(self):
+        linha = self._cursor.fetchone()
+        contar(self._operacao, idas=1, linhas=linha is not None)
+        return linha
+
+    def fetchmany(self, *args, **kwargs):
+        linhas = self._cursor.fetchmany(*args, **kwargs)
+        contar(self._operacao, idas=1, linhas=len(linhas))
+        return linhas
+
+    def fetchall(self):
+        linhas = self._cursor.fetchall()
+        # O driver busca "arraysize" linhas por ida e volta
+        contar(self._operacao, idas=max(1, -(-len(linhas) // max(self._cursor.arraysize, 1))), linhas=len(linhas))
+        return linhas
+
+    def __iter__(self):
+        for linha in self._cursor:
+            contar(self._operacao, linhas=1)
+            yield linha
+
+    # Os demais atributos (arraysize, description, rowcount...) vão direto para o cursor real
+    def __getattr__(self, nome):
+        return getattr(self._cursor, nome)
+
+    def __setattr__(self, nome, valor):
+        if nome.startswith("_"):
+            object.__setattr__(self, nome, valor)
+        else:
+            setattr(self._cursor, nome, valor)
+
+
+# Conexão que entrega cursores medidos
+class ConexaoMedida:
+    def __init__(self, conexao):
+        self._conexao = conexao
+
+    # Identifica a sessão real no cache de comandos (e não este invólucro, recriado a cada empréstimo)
+    @property
+    def _impl(self):
+        return getattr(self._conexao, "_impl", self._conexao)
+
+    def cursor(self, *args, **kwargs):
+        return CursorMedido(self._conexao.cursor(*args, **kwargs))
+
+    def __getattr__(self, nome):
+        return getattr(self._conexao, nome)
+
+
+# Envolve uma conexão emprestada para medir o seu uso (sem efeito com as métricas desligadas)
+def medir_conexao(conexao):
+    return ConexaoMedida(conexao) if _ativo and conexao is not None else conexao
+
+# Retorna a conexão real por trás de uma conexão medida
+def conexao_real(conexao):
+    return conexao._conexao if isinstance(conexao, ConexaoMedida) else conexao
+
+
+# ============================= Controle e saída ==========================
+
+# Liga a coleta de métricas (opcionalmente gravando cada operação em um arquivo JSON)
+def ativar(arquivo_log: str | None = None) -> None:
+    global _ativo, METRICAS_LOG
+    if arquivo_log:
+        METRICAS_LOG = arquivo_log
+    _ativo = True
+
+# Desliga a coleta de métricas (os valores já coletados são mantidos)
+def desativar() -> None:
+    global _ativo
+    _ativo = False
+
+# Indica se a coleta está ligada
+def ativas() -> bool:
+    return _ativo
+
+# Apaga os valores coletados
+def zerar() -> None:
+    with _lock:
+        _operacoes.clear()
+
+# Cópia dos valores coletados por operação
+def instantaneo() -> dict[str, dict]:
+    with _lock:
+        return {nome: {**contadores, "baldes": list(contadores["baldes"])} for nome, contadores in _operacoes.items()}
+
+# Estima um percentil da latência a partir dos baldes do histograma (limite superior do balde)
+def percentil(contadores: dict, fracao: float) -> float | None:
+    if not contadores["contagem"]:
+        return None
+    alvo, acumulado = fracao * contadores["contagem"], 0
+    for limite, quantidade in zip(LIMITES_HISTOGRAMA + (float("inf"),), contadores["baldes"]):
+        acumulado += quantidade
+        if acumulado >= alvo:
+            return limite
+    return float("inf")
+
+# Resumo das métricas em JSON (uma entrada por operação)
+def texto_json() -> str:
+    operacoes = []
+    for nome, contadores in sorted(instantaneo().items()):
+        operacoes.append({
+            "operacao": nome,
+            **{chave: valor for chave, valor in contadores.items() if chave != "baldes"},
+            "p50": percentil(contadores, 0.50),
+            "p95": percentil(contadores, 0.95),
+            "p99": percentil(contadores, 0.99),
+            "histograma": dict(zip([str(limite) for limite in LIMITES_HISTOGRAMA] + ["+Inf"], contadores["baldes"])),
+        })
+    return json.dumps({"data": datetime.now().isoformat(timespec="seconds"), "operacoes": operacoes}, ensure_ascii=False, indent=2)
+
+# Escapa um valor de rótulo no formato Prometheus
+def _rotulo(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+# Métricas no formato de texto do Prometheus
+def texto_prometheus() -> str:
+    operacoes = sorted(instantaneo().items())
+    nome = f"{PREFIXO_PROMETHEUS}_operacao_segundos"
+    linhas = [f"# HELP {nome} Latência das operações.", f"# TYPE {nome} histogram"]
+    for operacao, contadores in operacoes:
+        if not contadores["contagem"]:
+            continue
+        rotulo = _rotulo(operacao)
+        acumulado = 0
+        for limite, quantidade in zip(LIMITES_HISTOGRAMA, contadores["baldes"]):
+            acumulado += quantidade
+            linhas.append(f'{nome}_bucket{{operacao="{rotulo}",le="{limite}"}} {acumulado}')
+        linhas.append(f'{nome}_bucket{{operacao="{rotulo}",le="+Inf"}} {contadores["contagem"]}')
+        linhas.append(f'{nome}_sum{{operacao="{rotulo}"}} {contadores["segundos"]:.6f}')
+        linhas.append(f'{nome}_count{{operacao="{rotulo}"}} {contadores["contagem"]}')
+
+    contadores_totais = (
+        ("erros", "Operações que terminaram com exceção."),
+        ("idas", "Idas e voltas ao banco de dados."),
+        ("linhas", "Linhas lidas do banco de dados."),
+        ("bytes", "Bytes gravados."),
+    )
+    for chave, descricao in contadores_totais:
+        nome = f"{PREFIXO_PROMETHEUS}_operacao_{chave}_total"
+        linhas += [f"# HELP {nome} {descricao}", f"# TYPE {nome} counter"]
+        for operacao, contadores in operacoes:
+            if contadores[chave]:
+                linhas.append(f'{nome}{{operacao="{_rotulo(operacao)}"}} {contadores[chave]}')
+    return "\n".join(linhas) + "\n"
@@ -0,0 +1,358 @@
+# ================================ Imports ================================
+import argparse
+
+from repositorio import COMANDOS, Repositorio, criar_repositorio_sqlite
+
+
+# ============================= Configurações =============================
+
+# Tabela que registra as migrações já aplicadas
+TABELA_VERSAO = "TBL_VERSAO_ESQUEMA"
+
+# Criação da tabela de versões em cada dialeto
+CRIAR_TABELA_VERSAO = {
+    "oracle": f"""
+        CREATE TABLE {TABELA_VERSAO} (
+            VERSAO NUMBER(*, 0) PRIMARY KEY,
+            DESCRICAO VARCHAR2(255) NOT NULL,
+            APLICADA_EM TIMESTAMP DEFAULT SYSTIMESTAMP NOT NULL
+        )
+    """,
+    "sqlite": f"""
+        CREATE TABLE IF NOT EXISTS {TABELA_VERSAO} (
+            VERSAO INTEGER PRIMARY KEY,
+            DESCRICAO VARCHAR(255) NOT NULL,
+            APLICADA_EM TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
+        )
+    """,
+}
+
+# Verifica se uma tabela existe em cada dialeto
+TABELA_EXISTE = {
+    "oracle": "SELECT COUNT(*) FROM USER_TABLES WHERE TABLE_NAME = :tabela",
+    "sqlite": "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = :tabela",
+}
+
+# Erros do Oracle que indicam que o objeto já existe (migração aplicada fora deste módulo)
+ERROS_JA_EXISTE = ("ORA-00955", "ORA-01408", "ORA-01430", "ORA-02264", "ORA-02275", "DRG-10701")
+
+# Migrações em ordem: (versão, descrição, comandos por dialeto)
+MIGRACOES = [
+    (
+        1,
+        "Índices do filtro de status e das chaves estrangeiras",
+        {
+            # (STATUS, ID_PROJETO) atende o filtro de status já na ordem da paginação por chave
+            "oracle": [
+                "CREATE INDEX IDX_PROJETOS_STATUS ON TBL_PROJETOS_SUSTENTAVEIS (STATUS, ID_PROJETO)",
+                "CREATE INDEX IDX_PROJETOS_TIPO_FONTE ON TBL_PROJETOS_SUSTENTAVEIS (ID_TIPO_FONTE)",
+                "CREATE INDEX IDX_PROJETOS_REGIAO ON TBL_PROJETOS_SUSTENTAVEIS (ID_REGIAO)",
+                "CREATE INDEX IDX_EMISSOES_TIPO_FONTE ON TBL_EMISSOES_CARBONO (ID_TIPO_FONTE)",
+            ],
+            "sqlite": [
+                "CREATE INDEX IF NOT EXISTS IDX_PROJETOS_STATUS ON TBL_PROJETOS_SUSTENTAVEIS (STATUS, ID_PROJETO)",
+                "CREATE INDEX IF NOT EXISTS IDX_PROJETOS_TIPO_FONTE ON TBL_PROJETOS_SUSTENTAVEIS (ID_TIPO_FONTE)",
+                "CREATE INDEX IF NOT EXISTS IDX_PROJETOS_REGIAO ON TBL_PROJETOS_SUSTENTAVEIS (ID_REGIAO)",
+                "CREATE INDEX IF NOT EXISTS IDX_EMISSOES_TIPO_FONTE ON TBL_EMISSOES_CARBONO (ID_TIPO_FONTE)",
+                "ANALYZE",  # Estatísticas para o planejador escolher os índices
+            ],
+        },
+    ),
+    (
+        2,
+        "Restrição dos valores de STATUS",
+        {
+            # O SQLite não permite incluir restrições em tabelas existentes
+            "oracle": [
+                "ALTER TABLE TBL_PROJETOS_SUSTENTAVEIS ADD CONSTRAINT CK_PROJETO_STATUS"
+                " CHECK (STATUS IN ('Em andamento', 'Concluído'))",
+            ],
+            "sqlite": [],
+        },
+    ),
+    (
+        3,
+        "Coluna VERSAO para controle de concorrência otimista",
+        {
+            "oracle": ["ALTER TABLE TBL_PROJETOS_SUSTENTAVEIS ADD VERSAO NUMBER(*, 0) DEFAULT 1 NOT NULL"],
+            "sqlite": ["ALTER TABLE TBL_PROJETOS_SUSTENTAVEIS ADD COLUMN VERSAO INTEGER NOT NULL DEFAULT 1"],
+        },
+    ),
+    (
+        4,
+        "Índice textual da descrição (sem acentos e maiúsculas, com prefixos)",
+        {
+            # Oracle Text: BASE_LETTER remove os acentos, o índice de prefixos atende "eol%" e SYNC (ON COMMIT)
+            # mantém o índice em dia a cada transação
+            "oracle": [
+                """
+                BEGIN
+                    CTX_DDL.CREATE_PREFERENCE('PROJETOS_LEXER', 'BASIC_LEXER');
+                    CTX_DDL.SET_ATTRIBUTE('PROJETOS_LEXER', 'BASE_LETTER', 'YES');
+                    CTX_DDL.SET_ATTRIBUTE('PROJETOS_LEXER', 'MIXED_CASE', 'NO');
+                    CTX_DDL.CREATE_PREFERENCE('PROJETOS_WORDLIST', 'BASIC_WORDLIST');
+                    CTX_DDL.SET_ATTRIBUTE('PROJETOS_WORDLIST', 'PREFIX_INDEX', 'TRUE');
+                    CTX_DDL.SET_ATTRIBUTE('PROJETOS_WORDLIST', 'PREFIX_MIN_LENGTH', '1');
+                    CTX_DDL.SET_ATTRIBUTE('PROJETOS_WORDLIST', 'PREFIX_MAX_LENGTH', '8');
+                END;
+                """,
+                "CREATE INDEX IDX_PROJETOS_DESCRICAO ON TBL_PROJETOS_SUSTENTAVEIS (DESCRICAO)"
+                " INDEXTYPE IS CTXSYS.CONTEXT PARAMETERS ('LEXER PROJETOS_LEXER WORDLIST PROJETOS_WORDLIST"
+                " STOPLIST CTXSYS.EMPTY_STOPLIST SYNC (ON COMMIT)')",
+            ],
+            # SQLite: tabela FTS5 sobre a própria tabela de projetos (sem copiar o texto), mantida por gatilhos
+            "sqlite": [
+                "CREATE VIRTUAL TABLE IF NOT EXISTS TBL_BUSCA_PROJETOS USING fts5("
+                "DESCRICAO, content='TBL_PROJETOS_SUSTENTAVEIS', content_rowid='ID_PROJETO',"
+                " tokenize='unicode61 remove_diacritics 2', prefix='1 2 3')",
+                """
+                CREATE TRIGGER IF NOT EXISTS TRG_BUSCA_PROJETOS_INSERIR AFTER INSERT ON TBL_PROJETOS_SUSTENTAVEIS BEGIN
+                    INSERT INTO TBL_BUSCA_PROJETOS (rowid, DESCRICAO) VALUES (new.ID_PROJETO, new.DESCRICAO);
+                END
+                """,
+                """
+                CREATE TRIGGER IF NOT EXISTS TRG_BUSCA_PROJETOS_EXCLUIR AFTER DELETE ON TBL_PROJETOS_SUSTENTAVEIS BEGIN
+                    INSERT INTO TBL_BUSCA_PROJETOS (TBL_BUSCA_PROJETOS, rowid, DESCRICAO)
+                    VALUES ('delete', old.ID_PROJETO, old.DESCRICAO);
+                END
+                """,
+                """
+                CREATE TRIGGER IF NOT EXISTS TRG_BUSCA_PROJETOS_ATUALIZAR AFTER UPDATE OF DESCRICAO ON TBL_PROJETOS_SUSTENTAVEIS
+                BEGIN
+                    INSERT INTO TBL_BUSCA_PROJETOS (TBL_BUSCA_PROJETOS, rowid, DESCRICAO)
+                    VALUES ('delete', old.ID_PROJETO, old.DESCRICAO);
+                    INSERT INTO TBL_BUSCA_PROJETOS (rowid, DESCRICAO) VALUES (new.ID_PROJETO, new.DESCRICAO);
+                END
+                """,
+                "INSERT INTO TBL_BUSCA_PROJETOS (TBL_BUSCA_PROJETOS) VALUES ('rebuild')",  # Indexa os projetos existentes
+            ],
+        },
+    ),
+    (
+        5,
+        "Captura de alterações: número de alteração, exclusões e marcas d'água da exportação incremental",
+        {
+            # Toda inclusão/alteração recebe o próximo número da sequência; cada exclusão deixa um registro
+            # (com um número da mesma sequência) em TBL_PROJETOS_EXCLUIDOS. Projetos anteriores ficam com 0.
+            "oracle": [
+                "CREATE SEQUENCE SEQ_ALTERACOES_PROJETOS CACHE 1000",
+                "ALTER TABLE TBL_PROJETOS_SUSTENTAVEIS ADD (ID_ALTERACAO NUMBER(*, 0) DEFAULT 0 NOT NULL, ALTERADO_EM TIMESTAMP)",
+                "CREATE INDEX IDX_PROJETOS_ALTERACAO ON TBL_PROJETOS_SUSTENTAVEIS (ID_ALTERACAO, ID_PROJETO)",
+                """
+                CREATE TABLE TBL_PROJETOS_EXCLUIDOS (
+                    ID_ALTERACAO NUMBER(*, 0) PRIMARY KEY,
+                    ID_PROJETO NUMBER(*, 0) NOT NULL,
+                    EXCLUIDO_EM TIMESTAMP DEFAULT SYSTIMESTAMP NOT NULL
+                )
+                """,
+                """
+                CREATE TABLE TBL_MARCAS_EXPORTACAO (
+                    NOME VARCHAR2(100) PRIMARY KEY,
+                    ID_ALTERACAO NUMBER(*, 0) NOT NULL,
+                    ATUALIZADA_EM TIMESTAMP DEFAULT SYSTIMESTAMP NOT NULL
+                )
+                """,
+                """
+                CREATE OR REPLACE TRIGGER TRG_ALTERACAO_PROJETO
+                BEFORE INSERT OR UPDATE ON TBL_PROJETOS_SUSTENTAVEIS FOR EACH ROW
+                BEGIN
+                    :new.ID_ALTERACAO := SEQ_ALTERACOES_PROJETOS.NEXTVAL;
+                    :new.ALTERADO_EM := SYSTIMESTAMP;
+                END;
+                """,
+                """
+                CREATE OR REPLACE TRIGGER TRG_EXCLUSAO_PROJETO
+                AFTER DELETE ON TBL_PROJETOS_SUSTENTAVEIS FOR EACH ROW
+                BEGIN
+                    INSERT INTO TBL_PROJETOS_EXCLUIDOS (ID_ALTERACAO, ID_PROJETO)
+                    VALUES (SEQ_ALTERACOES_PROJETOS.NEXTVAL, :old.ID_PROJETO);
+                END;
+                """,
+            ],
+            # SQLite: a sequência é uma tabela de uma linha (as escritas já são serializadas)
+            "sqlite": [
+                "ALTER TABLE TBL_PROJETOS_SUSTENTAVEIS ADD COLUMN ID_ALTERACAO INTEGER NOT NULL DEFAULT 0",
+                "ALTER TABLE TBL_PROJETOS_SUSTENTAVEIS ADD COLUMN ALTERADO_EM TIMESTAMP",
+                "CREATE INDEX IF NOT EXISTS IDX_PROJETOS_ALTERACAO ON TBL_PROJETOS_SUSTENTAVEIS (ID_ALTERACAO, ID_PROJETO)",
+                "CREATE TABLE IF NOT EXISTS TBL_SEQUENCIA_ALTERACOES (ULTIMO INTEGER NOT NULL)",
+                "INSERT INTO TBL_SEQUENCIA_ALTERACOES (ULTIMO) SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM TBL_SEQUENCIA_ALTERACOES)",
+                """
+                CREATE TABLE IF NOT EXISTS TBL_PROJETOS_EXCLUIDOS (
+                    ID_ALTERACAO INTEGER PRIMARY KEY,
+                    ID_PROJETO INTEGER NOT NULL,
+                    EXCLUIDO_EM TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
+                )
+                """,
+                """
+                CREATE TABLE IF NOT EXISTS TBL_MARCAS_EXPORTACAO (
+                    NOME VARCHAR(100) PRIMARY KEY,
+                    ID_ALTERACAO INTEGER NOT NULL,
+                    ATUALIZADA_EM TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
+                )
+                """,
+                # O UPDATE feito pelos gatilhos só altera ID_ALTERACAO/ALTERADO_EM, então não dispara o gatilho de alteração
+                """
+                CREATE TRIGGER IF NOT EXISTS TRG_ALTERACAO_PROJETO_INSERIR AFTER INSERT ON TBL_PROJETOS_SUSTENTAVEIS BEGIN
+                    UPDATE TBL_SEQUENCIA_ALTERACOES SET ULTIMO = ULTIMO + 1;
+                    UPDATE TBL_PROJETOS_SUSTENTAVEIS
+                    SET ID_ALTERACAO = (SELECT ULTIMO FROM TBL_SEQUENCIA_ALTERACOES), ALTERADO_EM = CURRENT_TIMESTAMP
+                    WHERE ID_PROJETO = new.ID_PROJETO;
+                END
+                """,
+                """
+                CREATE TRIGGER IF NOT EXISTS TRG_ALTERACAO_PROJETO_ATUALIZAR
+                AFTER UPDATE OF DESCRICAO, CUSTO, STATUS, ID_TIPO_FONTE, ID_REGIAO, VERSAO ON TBL_PROJETOS_SUSTENTAVEIS
+                BEGIN
+                    UPDATE TBL_SEQUENCIA_ALTERACOES SET ULTIMO = ULTIMO + 1;
+                    UPDATE TBL_PROJETOS_SUSTENTAVEIS
+                    SET ID_ALTERACAO = (SELECT ULTIMO FROM TBL_SEQUENCIA_ALTERACOES), ALTERADO_EM = CURRENT_TIMESTAMP
+                    WHERE ID_PROJETO = new.ID_PROJETO;
+                END
+                """,
+                """
+                CREATE TRIGGER IF NOT EXISTS TRG_EXCLUSAO_PROJETO AFTER DELETE ON TBL_PROJETOS_SUSTENTAVEIS BEGIN
+                    UPDATE TBL_SEQUENCIA_ALTERACOES SET ULTIMO = ULTIMO + 1;
+                    INSERT INTO TBL_PROJETOS_EXCLUIDOS (ID_ALTERACAO, ID_PROJETO)
+                    VALUES ((SELECT ULTIMO FROM TBL_SEQUENCIA_ALTERACOES), old.ID_PROJETO);
+                END
+                """,
+            ],
+        },
+    ),
+    (
+        6,
+        "Instante seguro das marcas d'água (releitura de commits atrasados na exportação incremental)",
+        {
+            # Marcas anteriores ficam sem instante: a primeira exportação depois da migração não relê nada
+            "oracle": [
+                "ALTER TABLE TBL_MARCAS_EXPORTACAO ADD SEGURO_EM TIMESTAMP",
+                "CREATE INDEX IDX_PROJETOS_ALTERADO_EM ON TBL_PROJETOS_SUSTENTAVEIS (ALTERADO_EM)",
+                "CREATE INDEX IDX_EXCLUIDOS_EXCLUIDO_EM ON TBL_PROJETOS_EXCLUIDOS (EXCLUIDO_EM)",
+            ],
+            "sqlite": [
+                "ALTER TABLE TBL_MARCAS_EXPORTACAO ADD COLUMN SEGURO_EM TIMESTAMP",
+                "CREATE INDEX IF NOT EXISTS IDX_PROJETOS_ALTERADO_EM ON TBL_PROJETOS_SUSTENTAVEIS (ALTERADO_EM)",
+                "CREATE INDEX IF NOT EXISTS IDX_EXCLUIDOS_EXCLUIDO_EM ON TBL_PROJETOS_EXCLUIDOS (EXCLUIDO_EM)",
+            ],
+        },
+    ),
+    (
+        7,
+        "Tabela de resumo por região, tipo de fonte e status (criada e preenchida com os projetos existentes)",
+        {
+            # Única definição da tabela de resumo (o script cria só as tabelas originais); o resumo é reconstruído do zero
+            "oracle": [
+                """
+                CREATE TABLE TBL_RESUMO_PROJETOS (
+                    ID_REGIAO NUMBER(*, 0) NOT NULL,
+                    ID_TIPO_FONTE NUMBER(*, 0) NOT NULL,
+                    STATUS VARCHAR2(50) NOT NULL,
+                    QUANTIDADE NUMBER(*, 0) NOT NULL,
+                    CUSTO_TOTAL NUMBER(15,2) NOT NULL,
+                    CONSTRAINT PK_RESUMO_PROJETOS PRIMARY KEY (ID_REGIAO, ID_TIPO_FONTE, STATUS)
+                )
+                """,
+                COMANDOS["limpar_resumo"],
+                COMANDOS["reconstruir_resumo"],
+            ],
+            "sqlite": [
+                """
+                CREATE TABLE IF NOT EXISTS TBL_RESUMO_PROJETOS (
+                    ID_REGIAO INTEGER NOT NULL,
+                    ID_TIPO_FONTE INTEGER NOT NULL,
+                    STATUS VARCHAR(50) NOT NULL,
+                    QUANTIDADE INTEGER NOT NULL,
+                    CUSTO_TOTAL REAL NOT NULL,
+                    CONSTRAINT PK_RESUMO_PROJETOS PRIMARY KEY (ID_REGIAO, ID_TIPO_FONTE, STATUS)
+                )
+                """,
+                COMANDOS["limpar_resumo"],
+                COMANDOS["reconstruir_resumo"],
+            ],
+        },
+    ),
+]
+
+
+# ============================== Subalgoritmos ============================
+
+# Cria a tabela de versões, se ainda não existir
+def criar_tabela_versao(repositorio: Repositorio) -> None:
+    with repositorio.conexao() as conexao:
+        cursor = conexao.cursor()
+        cursor.execute(TABELA_EXISTE[repositorio.dialeto], {"tabela": TABELA_VERSAO})
+        if not cursor.fetchone()[0]:
+            cursor.execute(CRIAR_TABELA_VERSAO[repositorio.dialeto])
+            conexao.commit()
+
+# Retorna as versões já aplicadas
+def versoes_aplicadas(repositorio: Repositorio) -> set[int]:
+    criar_tabela_versao(repositorio)
+    with repositorio.conexao() as conexao:
+        cursor = conexao.cursor()
+        cursor.execute(f"SELECT VERSAO FROM {TABELA_VERSAO}")
+        return {linha[0] for linha in cursor.fetchall()}
+
+# Retorna a maior versão aplicada (0 se nenhuma)
+def versao_atual(repositorio: Repositorio) -> int:
+    return max(versoes_aplicadas(repositorio), default=0)
+
+# Executa um comando da migração, tolerando objetos que já existem no Oracle
+def _executar_comando(cursor, comando: str) -> None:
+    try:
+        cursor.execute(comando)
+    except Exception as e:
+        if not any(codigo in str(e) for codigo in ERROS_JA_EXISTE):
+            raise
+
+# Aplica as migrações pendentes em ordem (até a versão pedida), retornando as versões aplicadas
+def aplicar_migracoes(repositorio: Repositorio, ate: int | None = None, verbose: bool = False) -> list[int]:
+    aplicadas = versoes_aplicadas(repositorio)
+    novas = []
+    for versao, descricao, comandos in MIGRACOES:
+        if versao in aplicadas or (ate is not None and versao > ate):
+            continue
+        with repositorio.conexao() as conexao:
+            cursor = conexao.cursor()
+            for comando in comandos[repositorio.dialeto]:
+                _executar_comando(cursor, comando)
+            cursor.execute(
+                f"INSERT INTO {TABELA_VERSAO} (VERSAO, DESCRICAO) VALUES (:versao, :descricao)",
+                {"versao": versao, "descricao": descricao},
+            )
+            conexao.commit()
+        novas.append(versao)
+        if verbose:
+            print(f"🟢 Migração {versao} aplicada: {descricao}")
+    return novas
+
+# Aplica as migrações de esquema pela linha de comando
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Aplica as migrações de esquema pendentes.")
+    parser.add_argument("--backend", choices=("sqlite", "oracle"), default="sqlite", help="Banco a ser migrado")
+    parser.add_argument("--sqlite", default="projetos.db", help="Arquivo SQLite (backend sqlite)")
+    parser.add_argument("--ate", type=int, help="Aplica apenas até esta versão")
+    parser.add_argument("--status", action="store_true", help="Apenas mostra as migrações aplicadas e pendentes")
+    args = parser.parse_args()
+
+    if args.backend == "sqlite":
+        repositorio = criar_repositorio_sqlite(args.sqlite, migrar=False)
+    else:
+        # Pool Oracle configurado no código-fonte (mesmo com BACKEND_BD=sqlite)
+        import código_fonte
+        repositorio = código_fonte.criar_repositorio_pool_oracle()
+
+    if args.status:
+        aplicadas = versoes_aplicadas(repositorio)
+        for versao, descricao, _ in MIGRACOES:
+            print(f"{'🟢 aplicada' if versao in aplicadas else '🔴 pendente'}  {versao}: {descricao}")
+        return
+
+    novas = aplicar_migracoes(repositorio, args.ate, verbose=True)
+    if not novas:
+        print(f"🔵 Esquema já está na versão {versao_atual(repositorio)}.")
+
+
+# Executa as migrações
+if __name__ == "__main__":
+    main()
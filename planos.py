@@ -0,0 +1,254 @@
+# ================================ Imports ================================
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+import relatorios
+from repositorio import Repositorio, criar_repositorio_sqlite
+
+
+# ============================= Configurações =============================
+
+# Arquivo com o histórico das capturas (uma entrada por execução)
+ARQUIVO_HISTORICO = "planos_consultas.json"
+
+# Quantas vezes o tempo médio pode crescer em relação à captura anterior antes de alertar
+FATOR_REGRESSAO = 2.0
+
+# Diferença mínima (ms) para considerar regressão de tempo (abaixo disso é ruído de medição)
+DIFERENCA_MINIMA_MS = 1.0
+
+# Comandos que têm plano de execução
+COMANDOS_COM_PLANO = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "MERGE")
+
+
+# ============================== Rastreamento =============================
+
+# Cursor que mede e registra cada comando executado
+class CursorRastreado:
+    def __init__(self, cursor, registro: dict):
+        self._cursor = cursor
+        self._registro = registro
+
+    # Registra o comando, os parâmetros da primeira execução e o tempo gasto
+    def _registrar(self, sql: str, parametros, segundos: float) -> None:
+        chave = normalizar_sql(sql)
+        entrada = self._registro.setdefault(chave, {"sql": chave, "parametros": parametros, "execucoes": 0, "segundos": 0.0})
+        entrada["execucoes"] += 1
+        entrada["segundos"] += segundos
+
+    def execute(self, sql: str, parametros=None, **kwargs):
+        inicio = time.perf_counter()
+        resultado = self._cursor.execute(sql, parametros or {}, **kwargs)
+        self._registrar(sql, parametros or {}, time.perf_counter() - inicio)
+        return resultado
+
+    def executemany(self, sql: str, parametros, **kwargs):
+        inicio = time.perf_counter()
+        resultado = self._cursor.executemany(sql, parametros, **kwargs)
+        self._registrar(sql, parametros[0] if parametros else {}, time.perf_counter() - inicio)
+        return resultado
+
+    # Os demais atributos (fetch*, arraysize, description...) vão direto para o cursor real
+    def __getattr__(self, nome):
+        return getattr(self._cursor, nome)
+
+    def __setattr__(self, nome, valor):
+        if nome.startswith("_"):
+            object.__setattr__(self, nome, valor)
+        else:
+            setattr(self._cursor, nome, valor)
+
+
+# Conexão que entrega cursores rastreados
+class ConexaoRastreada:
+    def __init__(self, conexao, registro: dict):
+        self._conexao = conexao
+        self._registro = registro
+
+    def cursor(self):
+        return CursorRastreado(self._conexao.cursor(), self._registro)
+
+    def __getattr__(self, nome):
+        return getattr(self._conexao, nome)
+
+
+# Rastreia todos os comandos que o repositório executar durante um bloco "with"
+@contextmanager
+def rastrear(repositorio: Repositorio):
+    registro = {}
+    conectar_original, devolver_original = repositorio._conectar, repositorio._devolver
+
+    def conectar():
+        conexao = conectar_original()
+        return ConexaoRastreada(conexao, registro) if conexao is not None else None
+
+    def devolver(conexao):
+        devolver_original(conexao._conexao)
+
+    repositorio._conectar, repositorio._devolver = conectar, devolver
+    try:
+        yield registro
+    finally:
+        repositorio._conectar, repositorio._devolver = conectar_original, devolver_original
+
+
+# ============================== Subalgoritmos ============================
+
+# Normaliza o texto de um comando (espaços) para agrupar execuções iguais
+def normalizar_sql(sql: str) -> str:
+    return re.sub(r"\s+", " ", sql).strip()
+
+# Identificador curto e estável de um comando
+def identificador_sql(sql: str) -> str:
+    return hashlib.sha1(sql.encode("utf-8")).hexdigest()[:12]
+
+# Captura o plano de execução de um comando no dialeto do repositório
+def capturar_plano(repositorio: Repositorio, sql: str, parametros: dict) -> list[str]:
+    with repositorio.conexao() as conexao:
+        cursor = conexao.cursor()
+        if repositorio.dialeto == "oracle":
+            # O EXPLAIN PLAN não executa o comando; as variáveis só precisam estar presentes
+            id_plano = uuid.uuid4().hex[:30]
+            cursor.execute(f"EXPLAIN PLAN SET STATEMENT_ID = '{id_plano}' FOR {sql}", parametros)
+            cursor.execute(
+                "SELECT PLAN_TABLE_OUTPUT FROM TABLE(DBMS_XPLAN.DISPLAY(NULL, :id_plano, 'TYPICAL'))",
+                {"id_plano": id_plano},
+            )
+            plano = [linha[0] for linha in cursor.fetchall()]
+            cursor.execute("DELETE FROM PLAN_TABLE WHERE STATEMENT_ID = :id_plano", {"id_plano": id_plano})
+            conexao.commit()
+            return plano
+
+        # SQLite: linhas (id, pai, não usado, detalhe) em árvore
+        cursor.execute("EXPLAIN QUERY PLAN " + sql, parametros)
+        niveis, plano = {0: -1}, []
+        for id_no, pai, _, detalhe in cursor.fetchall():
+            niveis[id_no] = niveis.get(pai, -1) + 1
+            plano.append("  " * niveis[id_no] + detalhe)
+        return plano
+
+# Executa as consultas de leitura que a aplicação faz (sem alterar dados)
+def executar_carga(repositorio: Repositorio, repeticoes: int = 3) -> None:
+    for _ in range(repeticoes):
+        repositorio.listar_referencia("TBL_TIPO_FONTES")
+        repositorio.listar_referencia("TBL_REGIOES_SUSTENTAVEIS")
+        repositorio.versao_referencia("TBL_TIPO_FONTES")
+        repositorio.listar_emissoes()
+        repositorio.contar_projetos()
+        repositorio.contar_projetos("Concluído")
+        for status in (None, "Em andamento", "Concluído"):
+            paginas = repositorio.paginar_projetos(status, 1000)
+            primeira = next(paginas, [])
+            next(paginas, None)  # Segunda página: continua a partir do último ID
+            paginas.close()
+            if primeira:
+                repositorio.buscar_projeto(primeira[-1][0])
+        list(relatorios.custos_por_grupo(repositorio, ("regiao", "fonte")))
+        list(relatorios.custos_por_grupo(repositorio, ("status",), "Em andamento"))
+        list(relatorios.custos_por_grupo_resumo(repositorio, ("regiao", "fonte")))
+        list(relatorios.emissoes_por_grupo(repositorio, ("regiao",)))
+        list(relatorios.projetos_mais_caros(repositorio, 10))
+        list(relatorios.projetos_mais_caros(repositorio, 10, "Concluído"))
+
+# Executa a carga rastreada e captura o plano e o tempo de cada comando
+def capturar(repositorio: Repositorio, repeticoes: int = 3) -> dict:
+    with rastrear(repositorio) as registro:
+        executar_carga(repositorio, repeticoes)
+
+    consultas = {}
+    for sql, entrada in registro.items():
+        if sql.split(" ", 1)[0].upper() not in COMANDOS_COM_PLANO:
+            continue
+        try:
+            plano = capturar_plano(repositorio, sql, entrada["parametros"])
+        except Exception as e:
+            plano = [f"(plano indisponível: {e})"]
+        consultas[identificador_sql(sql)] = {
+            "sql": sql,
+            "execucoes": entrada["execucoes"],
+            "tempo_medio_ms": round(entrada["segundos"] * 1000 / entrada["execucoes"], 3),
+            "plano": plano,
+        }
+    return {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "dialeto": repositorio.dialeto,
+        "consultas": consultas,
+    }
+
+# Compara uma captura com a anterior, retornando os alertas de plano alterado ou tempo maior
+def comparar_capturas(anterior: dict, atual: dict, fator: float = FATOR_REGRESSAO) -> list[str]:
+    alertas = []
+    for chave, consulta in atual["consultas"].items():
+        antes = anterior["consultas"].get(chave)
+        if not antes:
+            continue
+        if antes["plano"] != consulta["plano"]:
+            alertas.append(f"Plano alterado [{chave}]: {consulta['sql'][:80]}")
+        if (
+            consulta["tempo_medio_ms"] > antes["tempo_medio_ms"] * fator
+            and consulta["tempo_medio_ms"] - antes["tempo_medio_ms"] >= DIFERENCA_MINIMA_MS
+        ):
+            alertas.append(
+                f"Tempo {consulta['tempo_medio_ms'] / antes['tempo_medio_ms']:.1f}x maior "
+                f"({antes['tempo_medio_ms']:.2f} → {consulta['tempo_medio_ms']:.2f} ms) [{chave}]: {consulta['sql'][:80]}"
+            )
+    return alertas
+
+# Lê o histórico de capturas
+def ler_historico(nome_arquivo: str = ARQUIVO_HISTORICO) -> list[dict]:
+    if not os.path.exists(nome_arquivo):
+        return []
+    with open(nome_arquivo, "r", encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+# Acrescenta uma captura ao histórico
+def gravar_historico(captura: dict, nome_arquivo: str = ARQUIVO_HISTORICO) -> None:
+    historico = ler_historico(nome_arquivo)
+    historico.append(captura)
+    with open(nome_arquivo, "w", encoding="utf-8") as arquivo:
+        json.dump(historico, arquivo, ensure_ascii=False, indent=2)
+
+# Captura os planos pela linha de comando e compara com a última captura do mesmo banco
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Captura o plano e o tempo das consultas da aplicação.")
+    parser.add_argument("--backend", choices=("sqlite", "oracle"), default="sqlite", help="Banco analisado")
+    parser.add_argument("--sqlite", default="projetos.db", help="Arquivo SQLite (backend sqlite)")
+    parser.add_argument("--historico", default=ARQUIVO_HISTORICO, help="Arquivo JSON com as capturas anteriores")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Vezes que cada consulta é executada")
+    parser.add_argument("--fator", type=float, default=FATOR_REGRESSAO, help="Aumento de tempo considerado regressão")
+    parser.add_argument("--mostrar", action="store_true", help="Exibe o plano de cada consulta")
+    args = parser.parse_args()
+
+    if args.backend == "sqlite":
+        repositorio = criar_repositorio_sqlite(args.sqlite)
+    else:
+        # Pool Oracle configurado no código-fonte (mesmo com BACKEND_BD=sqlite)
+        import código_fonte
+        repositorio = código_fonte.criar_repositorio_pool_oracle()
+
+    captura = capturar(repositorio, args.repeticoes)
+    for chave, consulta in captura["consultas"].items():
+        print(f"🔵 [{chave}] {consulta['execucoes']}x, {consulta['tempo_medio_ms']:.2f} ms: {consulta['sql'][:90]}")
+        if args.mostrar:
+            print("\n".join("      " + linha for linha in consulta["plano"]))
+
+    anteriores = [c for c in ler_historico(args.historico) if c["dialeto"] == captura["dialeto"]]
+    alertas = comparar_capturas(anteriores[-1], captura, args.fator) if anteriores else []
+    gravar_historico(captura, args.historico)
+    for alerta in alertas:
+        print(f"🔴 {alerta}")
+    if not alertas:
+        print(f"🟢 {len(captura['consultas'])} consulta(s) capturada(s) sem regressões.")
+    return 1 if alertas else 0
+
+
+# Executa a captura
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,80 @@
+# ============================= Configurações =============================
+
+# Campos editáveis de um projeto e as colunas correspondentes no banco
+COLUNAS_EDITAVEIS = {
+    "descricao": "DESCRICAO",
+    "custo": "CUSTO",
+    "status": "STATUS",
+    "id_tipo_fonte": "ID_TIPO_FONTE",
+    "id_regiao": "ID_REGIAO",
+}
+
+
+# =============================== Projeto =================================
+
+# Registro de um projeto que sabe quais campos foram alterados desde que foi lido do banco
+class Projeto:
+    __slots__ = (
+        "id_projeto", "descricao", "custo", "status", "id_tipo_fonte", "tipo_fonte",
+        "id_regiao", "regiao", "versao", "_originais",
+    )
+
+    def __init__(
+        self,
+        id_projeto: int,
+        descricao: str,
+        custo: float,
+        status: str,
+        id_tipo_fonte: int,
+        tipo_fonte: str | None,
+        id_regiao: int,
+        regiao: str | None,
+        versao: int,
+    ):
+        self.id_projeto = id_projeto
+        self.descricao = descricao
+        self.custo = custo
+        self.status = status
+        self.id_tipo_fonte = id_tipo_fonte
+        self.tipo_fonte = tipo_fonte
+        self.id_regiao = id_regiao
+        self.regiao = regiao
+        self.versao = versao
+        self.marcar_salvo(versao)
+
+    # Cria o registro a partir de uma linha da consulta de projetos (com a versão na última coluna)
+    @classmethod
+    def de_linha(cls, linha: tuple) -> "Projeto":
+        return cls(*linha[:9])
+
+    # Valores dos campos editáveis como foram lidos (ou salvos pela última vez)
+    @property
+    def originais(self) -> dict:
+        return dict(self._originais)
+
+    # Campos editáveis alterados e seus novos valores (voltar ao valor original desfaz a alteração)
+    @property
+    def alterados(self) -> dict:
+        return {
+            campo: getattr(self, campo)
+            for campo, original in self._originais.items()
+            if getattr(self, campo) != original
+        }
+
+    # Indica se há alterações a salvar
+    @property
+    def alterado(self) -> bool:
+        return bool(self.alterados)
+
+    # Considera o estado atual como salvo no banco (com a nova versão)
+    def marcar_salvo(self, versao: int) -> None:
+        self.versao = versao
+        self._originais = {campo: getattr(self, campo) for campo in COLUNAS_EDITAVEIS}
+
+    # Valores de todos os campos editáveis (parâmetros do INSERT/UPDATE)
+    def dados(self) -> dict:
+        return {campo: getattr(self, campo) for campo in COLUNAS_EDITAVEIS}
+
+    def __repr__(self) -> str:
+        alterados = f", alterados={sorted(self.alterados)}" if self.alterado else ""
+        return f"Projeto(id_projeto={self.id_projeto}, versao={self.versao}{alterados})"
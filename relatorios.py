@@ -0,0 +1,142 @@
+# ================================ Imports ================================
+from repositorio import LIMITE_LINHAS, Repositorio
+
+
+# ============================= Configurações =============================
+
+# Dimensões disponíveis para agrupamento: expressão (ID e nome) usada no SELECT/GROUP BY
+DIMENSOES = {
+    "regiao": ("r.ID_REGIAO", "r.NOME"),
+    "fonte": ("tf.ID_TIPO_FONTE", "tf.NOME"),
+    "status": ("p.STATUS", "p.STATUS"),
+}
+
+# Junções comuns a todos os relatórios
+JUNCOES_PROJETOS = """
+    FROM TBL_PROJETOS_SUSTENTAVEIS p
+    JOIN TBL_TIPO_FONTES tf ON p.ID_TIPO_FONTE = tf.ID_TIPO_FONTE
+    JOIN TBL_REGIOES_SUSTENTAVEIS r ON p.ID_REGIAO = r.ID_REGIAO
+"""
+
+# Fator de emissão por tipo de fonte (média, caso a fonte tenha mais de um registro)
+FATORES_EMISSAO = """
+    LEFT JOIN (
+        SELECT ID_TIPO_FONTE, AVG(EMISSAO) AS FATOR
+        FROM TBL_EMISSOES_CARBONO
+        GROUP BY ID_TIPO_FONTE
+    ) e ON e.ID_TIPO_FONTE = p.ID_TIPO_FONTE
+"""
+
+
+# ============================== Subalgoritmos ============================
+
+# Nome do comando de um relatório (um por combinação de dimensões e filtro, cada um com texto fixo)
+def _nome_comando(relatorio: str, dimensoes: tuple[str, ...] = (), status: str | None = None) -> str:
+    return f"{relatorio}[{','.join(dimensoes)}]" + ("+status" if status else "")
+
+# Registra e executa uma consulta, devolvendo as linhas como dicts à medida que chegam do banco
+def _executar(repositorio: Repositorio, nome: str, consulta: str, parametros: dict, tamanho_lote: int = 500):
+    repositorio.comandos.registrar(nome, consulta)
+    with repositorio.conexao() as conexao:
+        cursor = conexao.cursor()
+        cursor.arraysize = tamanho_lote
+        repositorio.comandos.executar(cursor, nome, parametros)
+        colunas = [descricao[0].upper() for descricao in cursor.description]
+        while linhas := cursor.fetchmany():
+            for linha in linhas:
+                yield dict(zip(colunas, linha))
+
+# Monta as colunas e o GROUP BY a partir das dimensões pedidas
+def _agrupamento(dimensoes: tuple[str, ...]) -> tuple[str, str]:
+    if not dimensoes:
+        raise ValueError("Informe ao menos uma dimensão de agrupamento.")
+    colunas, grupo = [], []
+    for dimensao in dimensoes:
+        if dimensao not in DIMENSOES:
+            raise ValueError(f"Dimensão inválida: {dimensao} (use {', '.join(DIMENSOES)})")
+        expressao_id, expressao_nome = DIMENSOES[dimensao]
+        if expressao_id == expressao_nome:
+            colunas.append(f"{expressao_nome} AS {dimensao.upper()}")
+            grupo.append(expressao_nome)
+        else:
+            colunas.append(f"{expressao_id} AS ID_{dimensao.upper()}, {expressao_nome} AS {dimensao.upper()}")
+            grupo.extend((expressao_id, expressao_nome))
+    return ", ".join(colunas), ", ".join(grupo)
+
+# Monta o filtro opcional de status
+def _filtro_status(status: str | None) -> tuple[str, dict]:
+    if status:
+        return " WHERE p.STATUS = :status", {"status": status}
+    return "", {}
+
+# Quantidade, custo total e custo médio dos projetos, agrupados pelas dimensões pedidas
+def custos_por_grupo(repositorio: Repositorio, dimensoes: tuple[str, ...] = ("regiao",), status: str | None = None):
+    colunas, grupo = _agrupamento(dimensoes)
+    filtro, parametros = _filtro_status(status)
+    consulta = f"""
+        SELECT {colunas},
+               COUNT(*) AS QUANTIDADE,
+               SUM(p.CUSTO) AS CUSTO_TOTAL,
+               AVG(p.CUSTO) AS CUSTO_MEDIO
+        {JUNCOES_PROJETOS}{filtro}
+        GROUP BY {grupo}
+        ORDER BY CUSTO_TOTAL DESC
+    """
+    return _executar(repositorio, _nome_comando("custos_por_grupo", dimensoes, status), consulta, parametros)
+
+# Mesmo resultado de custos_por_grupo(), lido do resumo mantido incrementalmente (custo O(grupos))
+def custos_por_grupo_resumo(repositorio: Repositorio, dimensoes: tuple[str, ...] = ("regiao",), status: str | None = None):
+    colunas, grupo = _agrupamento(dimensoes)
+    filtro, parametros = _filtro_status(status)
+    # O resumo usa o apelido "p" para aproveitar as mesmas expressões das dimensões
+    consulta = f"""
+        SELECT {colunas},
+               SUM(p.QUANTIDADE) AS QUANTIDADE,
+               SUM(p.CUSTO_TOTAL) AS CUSTO_TOTAL,
+               SUM(p.CUSTO_TOTAL) / SUM(p.QUANTIDADE) AS CUSTO_MEDIO
+        FROM TBL_RESUMO_PROJETOS p
+        JOIN TBL_TIPO_FONTES tf ON p.ID_TIPO_FONTE = tf.ID_TIPO_FONTE
+        JOIN TBL_REGIOES_SUSTENTAVEIS r ON p.ID_REGIAO = r.ID_REGIAO{filtro}
+        GROUP BY {grupo}
+        ORDER BY CUSTO_TOTAL DESC
+    """
+    return _executar(repositorio, _nome_comando("custos_por_grupo_resumo", dimensoes, status), consulta, parametros)
+
+# Emissões estimadas de cada projeto (fator de emissão do seu tipo de fonte)
+def emissoes_por_projeto(repositorio: Repositorio, status: str | None = None, tamanho_lote: int = 1000):
+    filtro, parametros = _filtro_status(status)
+    consulta = f"""
+        SELECT p.ID_PROJETO, p.DESCRICAO, tf.NOME AS TIPO_FONTE, r.NOME AS REGIAO,
+               p.CUSTO, COALESCE(e.FATOR, 0) AS EMISSAO_ESTIMADA
+        {JUNCOES_PROJETOS}{FATORES_EMISSAO}{filtro}
+        ORDER BY p.ID_PROJETO
+    """
+    return _executar(repositorio, _nome_comando("emissoes_por_projeto", (), status), consulta, parametros, tamanho_lote)
+
+# Emissões estimadas totais e médias, agrupadas pelas dimensões pedidas
+def emissoes_por_grupo(repositorio: Repositorio, dimensoes: tuple[str, ...] = ("regiao",), status: str | None = None):
+    colunas, grupo = _agrupamento(dimensoes)
+    filtro, parametros = _filtro_status(status)
+    consulta = f"""
+        SELECT {colunas},
+               COUNT(*) AS QUANTIDADE,
+               SUM(COALESCE(e.FATOR, 0)) AS EMISSAO_TOTAL,
+               AVG(COALESCE(e.FATOR, 0)) AS EMISSAO_MEDIA,
+               SUM(p.CUSTO) AS CUSTO_TOTAL
+        {JUNCOES_PROJETOS}{FATORES_EMISSAO}{filtro}
+        GROUP BY {grupo}
+        ORDER BY EMISSAO_TOTAL DESC
+    """
+    return _executar(repositorio, _nome_comando("emissoes_por_grupo", dimensoes, status), consulta, parametros)
+
+# Os N projetos mais caros (o banco ordena e corta; só N linhas trafegam)
+def projetos_mais_caros(repositorio: Repositorio, n: int = 10, status: str | None = None):
+    filtro, parametros = _filtro_status(status)
+    parametros["limite"] = n
+    consulta = f"""
+        SELECT p.ID_PROJETO, p.DESCRICAO, p.CUSTO, p.STATUS, tf.NOME AS TIPO_FONTE, r.NOME AS REGIAO
+        {JUNCOES_PROJETOS}{filtro}
+        ORDER BY p.CUSTO DESC, p.ID_PROJETO
+        {LIMITE_LINHAS[repositorio.dialeto]}
+    """
+    return _executar(repositorio, _nome_comando("projetos_mais_caros", (), status), consulta, parametros, n)
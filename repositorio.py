@@ -0,0 +1,1017 @@
+# ================================ Imports ================================
+import json
+import os
+import queue
+import re
+import sqlite3
+import unicodedata
+import uuid
+from contextlib import contextmanager
+
+import metricas
+from comandos import TAMANHO_CACHE_COMANDOS, RegistroComandos
+from projeto import COLUNAS_EDITAVEIS, Projeto
+
+
+# ============================= Configurações =============================
+
+# Script com a criação das tabelas (mesmo arquivo usado no Oracle)
+SCRIPT_TABELAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "script_das_tabelas.sql")
+
+# Conexões SQLite ociosas mantidas abertas para reuso (evita reabrir o arquivo e perder o cache de comandos)
+SQLITE_CONEXOES_OCIOSAS = int(os.getenv("SQLITE_CONEXOES_OCIOSAS", "8"))
+
+# Janela (s) relida pela exportação incremental no Oracle quando GV$TRANSACTION não pode ser consultada
+JANELA_TRANSACOES_S = int(os.getenv("JANELA_TRANSACOES_S", "3600"))
+
+# Tabelas de referência aceitas e suas colunas (id, nome)
+TABELAS_REFERENCIA = {
+    "TBL_TIPO_FONTES": ("ID_TIPO_FONTE", "NOME"),
+    "TBL_REGIOES_SUSTENTAVEIS": ("ID_REGIAO", "NOME"),
+}
+
+# Consulta base dos projetos (com os nomes do tipo de fonte e da região)
+CONSULTA_PROJETOS = """
+    SELECT
+        p.ID_PROJETO,
+        p.DESCRICAO,
+        p.CUSTO,
+        p.STATUS,
+        tf.ID_TIPO_FONTE,
+        tf.NOME AS TIPO_FONTE,
+        r.ID_REGIAO,
+        r.NOME AS REGIAO
+    FROM TBL_PROJETOS_SUSTENTAVEIS p
+    JOIN TBL_TIPO_FONTES tf ON p.ID_TIPO_FONTE = tf.ID_TIPO_FONTE
+    JOIN TBL_REGIOES_SUSTENTAVEIS r ON p.ID_REGIAO = r.ID_REGIAO
+"""
+
+# Soma (ou subtrai) um delta no resumo de um grupo (região, tipo de fonte, status), criando o grupo se preciso
+ATUALIZAR_RESUMO = {
+    "oracle": """
+        MERGE INTO TBL_RESUMO_PROJETOS r
+        USING (SELECT :id_regiao AS ID_REGIAO, :id_tipo_fonte AS ID_TIPO_FONTE, :status AS STATUS FROM DUAL) d
+        ON (r.ID_REGIAO = d.ID_REGIAO AND r.ID_TIPO_FONTE = d.ID_TIPO_FONTE AND r.STATUS = d.STATUS)
+        WHEN MATCHED THEN UPDATE SET
+            r.QUANTIDADE = r.QUANTIDADE + :quantidade,
+            r.CUSTO_TOTAL = r.CUSTO_TOTAL + :custo
+        WHEN NOT MATCHED THEN INSERT (ID_REGIAO, ID_TIPO_FONTE, STATUS, QUANTIDADE, CUSTO_TOTAL)
+            VALUES (:id_regiao, :id_tipo_fonte, :status, :quantidade, :custo)
+    """,
+    "sqlite": """
+        INSERT INTO TBL_RESUMO_PROJETOS (ID_REGIAO, ID_TIPO_FONTE, STATUS, QUANTIDADE, CUSTO_TOTAL)
+        VALUES (:id_regiao, :id_tipo_fonte, :status, :quantidade, :custo)
+        ON CONFLICT (ID_REGIAO, ID_TIPO_FONTE, STATUS) DO UPDATE SET
+            QUANTIDADE = QUANTIDADE + excluded.QUANTIDADE,
+            CUSTO_TOTAL = CUSTO_TOTAL + excluded.CUSTO_TOTAL
+    """,
+}
+
+# Totais recalculados a partir da tabela de projetos (usado na reconciliação do resumo)
+RESUMO_RECALCULADO = """
+    SELECT ID_REGIAO, ID_TIPO_FONTE, STATUS, COUNT(*) AS QUANTIDADE, SUM(CUSTO) AS CUSTO_TOTAL
+    FROM TBL_PROJETOS_SUSTENTAVEIS
+    GROUP BY ID_REGIAO, ID_TIPO_FONTE, STATUS
+"""
+
+# Trava a linha do projeto até o fim da transação (o SQLite já serializa as escritas)
+TRAVAR_LINHA = {"oracle": " FOR UPDATE", "sqlite": ""}
+
+# Limite de linhas em cada dialeto
+LIMITE_LINHAS = {
+    "oracle": "FETCH FIRST :limite ROWS ONLY",
+    "sqlite": "LIMIT :limite",
+}
+
+# Colunas da tabela de projetos na ordem das exportações
+COLUNAS_PROJETO = "ID_PROJETO, DESCRICAO, CUSTO, STATUS, ID_TIPO_FONTE, ID_REGIAO"
+
+# Próxima página de projetos a partir do último ID lido (paginação por chave)
+PAGINAR_PROJETOS = CONSULTA_PROJETOS + " WHERE p.ID_PROJETO > :ultimo_id{filtro} ORDER BY p.ID_PROJETO {limite}"
+
+# Filtros aceitos na paginação de projetos (combinados com AND; cada combinação usada vira um comando)
+FILTROS_PAGINACAO = {
+    "status": "p.STATUS = :status",
+    "id_regiao": "p.ID_REGIAO = :id_regiao",
+    "id_tipo_fonte": "p.ID_TIPO_FONTE = :id_tipo_fonte",
+    "id_final": "p.ID_PROJETO <= :id_final",  # Fim de uma faixa de IDs (extração particionada)
+}
+
+# Divide os projetos em faixas contíguas de ID_PROJETO com quantidades iguais (uma leitura do índice da chave)
+PARTICOES_PROJETOS = """
+    SELECT PARTE, MIN(ID_PROJETO), MAX(ID_PROJETO), COUNT(*)
+    FROM (
+        SELECT ID_PROJETO, NTILE(:partes) OVER (ORDER BY ID_PROJETO) AS PARTE
+        FROM TBL_PROJETOS_SUSTENTAVEIS{filtro}
+    ) t
+    GROUP BY PARTE
+    ORDER BY PARTE
+"""
+
+# Busca textual na descrição: projetos com todas as palavras (por prefixo), sem diferenciar acentos e maiúsculas.
+# No Oracle, o índice Oracle Text IDX_PROJETOS_DESCRICAO; no SQLite, a tabela FTS5 TBL_BUSCA_PROJETOS (migração 4).
+BUSCAR_PROJETOS = {
+    "oracle": CONSULTA_PROJETOS + " WHERE CONTAINS(p.DESCRICAO, :consulta) > 0 AND p.ID_PROJETO > :ultimo_id{filtro}"
+    " ORDER BY p.ID_PROJETO " + LIMITE_LINHAS["oracle"],
+    # A ordem já vem do índice FTS5 (por rowid), sem ordenar as ocorrências
+    "sqlite": CONSULTA_PROJETOS.replace(
+        "FROM TBL_PROJETOS_SUSTENTAVEIS p",
+        "FROM TBL_BUSCA_PROJETOS b\n    JOIN TBL_PROJETOS_SUSTENTAVEIS p ON p.ID_PROJETO = b.rowid",
+    )
+    + " WHERE TBL_BUSCA_PROJETOS MATCH :consulta AND b.rowid > :ultimo_id{filtro} ORDER BY b.rowid " + LIMITE_LINHAS["sqlite"],
+}
+
+# Maior número de alteração já usado (projetos alterados e excluídos compartilham a mesma sequência).
+# As marcas entram no MAX para o valor não recuar depois que as exclusões já exportadas são removidas.
+ULTIMA_ALTERACAO = """
+    SELECT COALESCE(MAX(ID_ALTERACAO), 0) FROM (
+        SELECT MAX(ID_ALTERACAO) AS ID_ALTERACAO FROM TBL_PROJETOS_SUSTENTAVEIS
+        UNION ALL
+        SELECT MAX(ID_ALTERACAO) FROM TBL_PROJETOS_EXCLUIDOS
+        UNION ALL
+        SELECT MAX(ID_ALTERACAO) FROM TBL_MARCAS_EXPORTACAO
+    ) t
+"""
+
+# Instante a partir do qual uma transação ainda aberta pode ter gravado alterações.
+# No Oracle, o número de alteração é tirado da sequência na escrita, não no commit: uma transação aberta pode
+# confirmar depois um número menor que o MAX já lido. Ela começou depois do início da transação aberta mais antiga,
+# então tudo o que foi gravado desde então é relido na exportação seguinte (1 s de folga: START_DATE é um DATE).
+# No SQLite as escritas são serializadas e o número é tirado dentro da transação, então basta o instante atual.
+INSTANTE_SEGURO = {
+    "oracle": """
+        SELECT LEAST(
+            CAST(SYSTIMESTAMP AS TIMESTAMP),
+            COALESCE(CAST(MIN(START_DATE) AS TIMESTAMP), CAST(SYSTIMESTAMP AS TIMESTAMP))
+        ) - INTERVAL '1' SECOND
+        FROM GV$TRANSACTION
+    """,
+    "sqlite": "SELECT CURRENT_TIMESTAMP",
+}
+
+# Grava a marca d'água de um consumidor da exportação incremental (com o seu instante seguro), criando-a se preciso
+GRAVAR_MARCA = {
+    "oracle": """
+        MERGE INTO TBL_MARCAS_EXPORTACAO m
+        USING (SELECT :nome AS NOME FROM DUAL) d
+        ON (m.NOME = d.NOME)
+        WHEN MATCHED THEN UPDATE
+            SET m.ID_ALTERACAO = :id_alteracao, m.SEGURO_EM = :seguro_em, m.ATUALIZADA_EM = SYSTIMESTAMP
+        WHEN NOT MATCHED THEN INSERT (NOME, ID_ALTERACAO, SEGURO_EM) VALUES (:nome, :id_alteracao, :seguro_em)
+    """,
+    "sqlite": """
+        INSERT INTO TBL_MARCAS_EXPORTACAO (NOME, ID_ALTERACAO, SEGURO_EM) VALUES (:nome, :id_alteracao, :seguro_em)
+        ON CONFLICT (NOME) DO UPDATE
+        SET ID_ALTERACAO = excluded.ID_ALTERACAO, SEGURO_EM = excluded.SEGURO_EM, ATUALIZADA_EM = CURRENT_TIMESTAMP
+    """,
+}
+
+# Projeto com a versão da linha (controle de concorrência otimista) na última coluna
+CONSULTA_PROJETO_VERSAO = CONSULTA_PROJETOS.replace("r.NOME AS REGIAO", "r.NOME AS REGIAO,\n        p.VERSAO")
+
+
+# Outro usuário alterou (ou excluiu) o projeto depois que ele foi lido
+class ConflitoDeVersao(Exception):
+    pass
+
+
+# Critérios de seleção das operações em lote (combinados com AND), com o texto em cada dialeto
+CRITERIOS_SELECAO = {
+    # A lista de IDs vai em uma única variável: coleção no Oracle, array JSON no SQLite
+    "ids": {
+        "oracle": "ID_PROJETO IN (SELECT COLUMN_VALUE FROM TABLE(:ids))",
+        "sqlite": "ID_PROJETO IN (SELECT value FROM json_each(:ids))",
+    },
+    "intervalo": "ID_PROJETO BETWEEN :id_inicial AND :id_final",
+    "status": "STATUS = :filtro_status",
+    "id_regiao": "ID_REGIAO = :filtro_id_regiao",
+    "id_tipo_fonte": "ID_TIPO_FONTE = :filtro_id_tipo_fonte",
+}
+
+# Colunas que podem ser alteradas nas atualizações em lote
+COLUNAS_ATUALIZACAO_LOTE = {"status": "STATUS", "id_regiao": "ID_REGIAO", "id_tipo_fonte": "ID_TIPO_FONTE"}
+
+# Tipo de coleção do Oracle usado para enviar listas de IDs
+TIPO_LISTA_IDS = "SYS.ODCINUMBERLIST"
+
+# Comandos SQL nomeados usados pelo repositório (texto fixo; valores sempre por variáveis de ligação)
+COMANDOS = {
+    # Tabelas de referência: um comando por tabela, pois o nome da tabela não pode ser uma variável
+    **{
+        f"listar_referencia:{tabela}": f"SELECT {campo_id}, {campo_nome} FROM {tabela} ORDER BY {campo_id}"
+        for tabela, (campo_id, campo_nome) in TABELAS_REFERENCIA.items()
+    },
+    **{
+        f"versao_referencia:{tabela}": f"SELECT COUNT(*), MAX({campo_id}) FROM {tabela}"
+        for tabela, (campo_id, _) in TABELAS_REFERENCIA.items()
+    },
+    **{
+        f"inserir_referencia:{tabela}": f"INSERT INTO {tabela} ({campo_nome}) VALUES (:nome)"
+        for tabela, (_, campo_nome) in TABELAS_REFERENCIA.items()
+    },
+    "listar_emissoes": "SELECT ID_EMISSAO, ID_TIPO_FONTE, EMISSAO FROM TBL_EMISSOES_CARBONO ORDER BY ID_EMISSAO",
+    "inserir_emissoes": "INSERT INTO TBL_EMISSOES_CARBONO (ID_TIPO_FONTE, EMISSAO) VALUES (:id_tipo_fonte, :emissao)",
+
+    # Projetos
+    "buscar_projeto": CONSULTA_PROJETOS + " WHERE p.ID_PROJETO = :id_projeto",
+    "carregar_projeto": CONSULTA_PROJETO_VERSAO + " WHERE p.ID_PROJETO = :id_projeto",
+    "inserir_projeto": """
+        INSERT INTO TBL_PROJETOS_SUSTENTAVEIS (DESCRICAO, CUSTO, STATUS, ID_TIPO_FONTE, ID_REGIAO)
+        VALUES (:descricao, :custo, :status, :id_tipo_fonte, :id_regiao)
+    """,
+    "inserir_projeto_retornando": {
+        # O Oracle devolve o ID gerado pela coluna IDENTITY; no SQLite ele vem de cursor.lastrowid
+        "oracle": """
+            INSERT INTO TBL_PROJETOS_SUSTENTAVEIS (DESCRICAO, CUSTO, STATUS, ID_TIPO_FONTE, ID_REGIAO)
+            VALUES (:descricao, :custo, :status, :id_tipo_fonte, :id_regiao)
+            RETURNING ID_PROJETO INTO :id_novo
+        """,
+        "sqlite": """
+            INSERT INTO TBL_PROJETOS_SUSTENTAVEIS (DESCRICAO, CUSTO, STATUS, ID_TIPO_FONTE, ID_REGIAO)
+            VALUES (:descricao, :custo, :status, :id_tipo_fonte, :id_regiao)
+        """,
+    },
+    "inserir_projeto_com_id": """
+        INSERT INTO TBL_PROJETOS_SUSTENTAVEIS (ID_PROJETO, DESCRICAO, CUSTO, STATUS, ID_TIPO_FONTE, ID_REGIAO)
+        VALUES (:id_projeto, :descricao, :custo, :status, :id_tipo_fonte, :id_regiao)
+    """,
+    "atualizar_projeto": """
+        UPDATE TBL_PROJETOS_SUSTENTAVEIS
+        SET DESCRICAO = :descricao, CUSTO = :custo, STATUS = :status,
+            ID_TIPO_FONTE = :id_tipo_fonte, ID_REGIAO = :id_regiao, VERSAO = VERSAO + 1
+        WHERE ID_PROJETO = :id_projeto
+    """,
+    "excluir_projeto": "DELETE FROM TBL_PROJETOS_SUSTENTAVEIS WHERE ID_PROJETO = :id_projeto",
+    "grupo_atual": {
+        dialeto: "SELECT ID_REGIAO, ID_TIPO_FONTE, STATUS, CUSTO FROM TBL_PROJETOS_SUSTENTAVEIS"
+        " WHERE ID_PROJETO = :id_projeto" + travar
+        for dialeto, travar in TRAVAR_LINHA.items()
+    },
+    "contar_projetos": "SELECT COUNT(*) FROM TBL_PROJETOS_SUSTENTAVEIS",
+    "contar_projetos_status": "SELECT COUNT(*) FROM TBL_PROJETOS_SUSTENTAVEIS WHERE STATUS = :status",
+    "paginar_projetos": {
+        dialeto: PAGINAR_PROJETOS.format(filtro="", limite=limite) for dialeto, limite in LIMITE_LINHAS.items()
+    },
+    "paginar_projetos_status": {
+        dialeto: PAGINAR_PROJETOS.format(filtro=" AND p.STATUS = :status", limite=limite)
+        for dialeto, limite in LIMITE_LINHAS.items()
+    },
+    "buscar_projetos": {dialeto: consulta.format(filtro="") for dialeto, consulta in BUSCAR_PROJETOS.items()},
+    "buscar_projetos_status": {
+        dialeto: consulta.format(filtro=" AND p.STATUS = :status") for dialeto, consulta in BUSCAR_PROJETOS.items()
+    },
+    "particoes_projetos": PARTICOES_PROJETOS.format(filtro=""),
+    "particoes_projetos_status": PARTICOES_PROJETOS.format(filtro=" WHERE STATUS = :status"),
+    # Alterações (captura de mudanças): projetos inseridos/alterados e exclusões em uma faixa de números de alteração
+    "ultima_alteracao": ULTIMA_ALTERACAO,
+    "instante_seguro": INSTANTE_SEGURO,
+    "instante_seguro_janela": "SELECT CAST(SYSTIMESTAMP AS TIMESTAMP) - NUMTODSINTERVAL(:segundos, 'SECOND') FROM DUAL",
+    # Além da faixa de números, relê o que foi gravado desde o instante seguro da marca (commits atrasados)
+    "alteracoes_projetos": CONSULTA_PROJETOS + " WHERE (p.ID_ALTERACAO > :desde OR p.ALTERADO_EM >= :seguro_em)"
+    " AND p.ID_ALTERACAO <= :ate ORDER BY p.ID_ALTERACAO, p.ID_PROJETO",
+    # Uma exclusão seguida de nova inclusão com o mesmo ID (importação com IDs) já aparece como alteração
+    "exclusoes_projetos": """
+        SELECT e.ID_PROJETO, e.ID_ALTERACAO, e.EXCLUIDO_EM
+        FROM TBL_PROJETOS_EXCLUIDOS e
+        WHERE (e.ID_ALTERACAO > :desde OR e.EXCLUIDO_EM >= :seguro_em) AND e.ID_ALTERACAO <= :ate
+          AND NOT EXISTS (SELECT 1 FROM TBL_PROJETOS_SUSTENTAVEIS p WHERE p.ID_PROJETO = e.ID_PROJETO)
+        ORDER BY e.ID_ALTERACAO
+    """,
+    "ler_marca": "SELECT ID_ALTERACAO, SEGURO_EM FROM TBL_MARCAS_EXPORTACAO WHERE NOME = :nome",
+    "listar_marcas": "SELECT NOME, ID_ALTERACAO, ATUALIZADA_EM FROM TBL_MARCAS_EXPORTACAO ORDER BY NOME",
+    "gravar_marca": GRAVAR_MARCA,
+    # Exclusões já lidas por todos os consumidores (e fora da releitura de todos eles) não são mais necessárias
+    "limpar_exclusoes": "DELETE FROM TBL_PROJETOS_EXCLUIDOS"
+    " WHERE ID_ALTERACAO <= (SELECT MIN(ID_ALTERACAO) FROM TBL_MARCAS_EXPORTACAO)"
+    " AND EXCLUIDO_EM < (SELECT MIN(COALESCE(SEGURO_EM, ATUALIZADA_EM)) FROM TBL_MARCAS_EXPORTACAO)",
+
+    # Carteira para as simulações: só as colunas usadas, sem JOIN
+    "carteira_projetos": "SELECT CUSTO, ID_REGIAO, ID_TIPO_FONTE FROM TBL_PROJETOS_SUSTENTAVEIS",
+    "carteira_projetos_status": "SELECT CUSTO, ID_REGIAO, ID_TIPO_FONTE FROM TBL_PROJETOS_SUSTENTAVEIS WHERE STATUS = :status",
+
+    # Exportações: as colunas exportadas estão todas na tabela de projetos, então não há JOIN
+    "exportar_projetos": f"SELECT {COLUNAS_PROJETO} FROM TBL_PROJETOS_SUSTENTAVEIS ORDER BY ID_PROJETO",
+    "exportar_projetos_status": f"SELECT {COLUNAS_PROJETO} FROM TBL_PROJETOS_SUSTENTAVEIS WHERE STATUS = :status ORDER BY ID_PROJETO",
+
+    # Resumo por região, tipo de fonte e status
+    "atualizar_resumo": ATUALIZAR_RESUMO,
+    "excluir_resumo_vazio": """
+        DELETE FROM TBL_RESUMO_PROJETOS
+        WHERE ID_REGIAO = :id_regiao AND ID_TIPO_FONTE = :id_tipo_fonte AND STATUS = :status
+          AND QUANTIDADE = 0
+    """,
+    "listar_resumo": "SELECT ID_REGIAO, ID_TIPO_FONTE, STATUS, QUANTIDADE, CUSTO_TOTAL FROM TBL_RESUMO_PROJETOS"
+    " ORDER BY ID_REGIAO, ID_TIPO_FONTE, STATUS",
+    "resumo_recalculado": RESUMO_RECALCULADO,
+    "limpar_resumo": "DELETE FROM TBL_RESUMO_PROJETOS",
+    "reconstruir_resumo": "INSERT INTO TBL_RESUMO_PROJETOS (ID_REGIAO, ID_TIPO_FONTE, STATUS, QUANTIDADE, CUSTO_TOTAL) "
+    + RESUMO_RECALCULADO,
+}
+
+
+# ============================== Subalgoritmos ============================
+
+# Lê o script de criação das tabelas (salvo em Latin-1) e separa os comandos
+def ler_script_tabelas(caminho: str = SCRIPT_TABELAS) -> list[str]:
+    with open(caminho, "r", encoding="latin-1") as arquivo:
+        script = arquivo.read()
+    script = re.sub(r"--[^\n]*", "", script)  # Remove os comentários
+    return [comando.strip() for comando in script.split(";") if comando.strip()]
+
+# Traduz um comando DDL do Oracle para o SQLite
+def traduzir_ddl_sqlite(comando: str) -> str:
+    # Colunas IDENTITY viram o ROWID do SQLite
+    comando = re.sub(
+        r"NUMBER\(\*,\s*0\)\s+GENERATED BY DEFAULT ON NULL AS IDENTITY PRIMARY KEY",
+        "INTEGER PRIMARY KEY",
+        comando,
+        flags=re.IGNORECASE,
+    )
+    comando = re.sub(r"NUMBER\(\*,\s*0\)", "INTEGER", comando, flags=re.IGNORECASE)
+    comando = re.sub(r"NUMBER\(\d+,\s*[1-9]\d*\)", "REAL", comando, flags=re.IGNORECASE)
+    comando = re.sub(r"NUMBER\(\d+(,\s*0)?\)", "INTEGER", comando, flags=re.IGNORECASE)
+    comando = re.sub(r"VARCHAR2\((\d+)\)", r"VARCHAR(\1)", comando, flags=re.IGNORECASE)
+    return comando
+
+# Cria as tabelas do script em uma conexão SQLite (ignorando as que já existem)
+def criar_tabelas_sqlite(conexao: sqlite3.Connection, caminho: str = SCRIPT_TABELAS) -> None:
+    for comando in ler_script_tabelas(caminho):
+        comando = traduzir_ddl_sqlite(comando)
+        comando = re.sub(r"^CREATE TABLE\s+", "CREATE TABLE IF NOT EXISTS ", comando, flags=re.IGNORECASE)
+        conexao.execute(comando)
+    conexao.commit()
+
+
+# Palavras de uma busca textual, sem acentos e em minúsculas ("Eólica  NORTE" -> ["eolica", "norte"])
+def palavras_busca(texto: str) -> list[str]:
+    decomposto = unicodedata.normalize("NFKD", texto.lower())
+    sem_acentos = "".join(caractere for caractere in decomposto if not unicodedata.combining(caractere))
+    return re.findall(r"[0-9a-z]+", sem_acentos)
+
+# Expressão de busca por prefixo de cada palavra no dialeto (todas as palavras precisam aparecer)
+def expressao_busca(palavras: list[str], dialeto: str) -> str:
+    if dialeto == "oracle":
+        return " AND ".join(f"{palavra}%" for palavra in palavras)  # Usa o índice de prefixos do Oracle Text
+    return " ".join(f'"{palavra}"*' for palavra in palavras)  # FTS5: palavras separadas por espaço = AND
+
+
+# Acumula o delta de um projeto no grupo (região, tipo de fonte, status) do resumo
+def somar_delta(deltas: dict, id_regiao, id_tipo_fonte, status, quantidade: int, custo: float) -> None:
+    delta = deltas.setdefault((id_regiao, id_tipo_fonte, status), [0, 0.0])
+    delta[0] += quantidade
+    delta[1] += custo
+
+# Parâmetros dos deltas por grupo e dos grupos que podem ter ficado vazios
+def parametros_resumo(deltas: dict[tuple, list]) -> tuple[list[dict], list[dict]]:
+    parametros = [
+        {"id_regiao": grupo[0], "id_tipo_fonte": grupo[1], "status": grupo[2], "quantidade": quantidade, "custo": custo}
+        for grupo, (quantidade, custo) in deltas.items()
+        if quantidade or custo
+    ]
+    vazios = [
+        {"id_regiao": p["id_regiao"], "id_tipo_fonte": p["id_tipo_fonte"], "status": p["status"]}
+        for p in parametros
+        if p["quantidade"] < 0
+    ]
+    return parametros, vazios
+
+# Registra o UPDATE dos campos alterados do projeto e retorna o nome do comando e os parâmetros
+# (usado pelos repositórios síncrono e assíncrono)
+def comando_salvar(comandos: RegistroComandos, projeto: Projeto, alterados: dict) -> tuple[str, dict]:
+    campos = sorted(alterados, key=list(COLUNAS_EDITAVEIS).index)
+    nome = f"salvar_projeto[{','.join(campos)}]"
+    comandos.registrar(
+        nome,
+        "UPDATE TBL_PROJETOS_SUSTENTAVEIS SET "
+        + ", ".join(f"{COLUNAS_EDITAVEIS[campo]} = :{campo}" for campo in campos)
+        + ", VERSAO = VERSAO + 1 WHERE ID_PROJETO = :id_projeto AND VERSAO = :versao",
+    )
+    return nome, {**alterados, "id_projeto": projeto.id_projeto, "versao": projeto.versao}
+
+# Deltas do resumo ao salvar o projeto (vazio se nenhum campo do resumo mudou)
+def deltas_salvar(projeto: Projeto, alterados: dict) -> dict:
+    deltas = {}
+    if {"custo", "status", "id_tipo_fonte", "id_regiao"} & set(alterados):
+        # A versão conferida garante que os valores originais ainda eram os do banco
+        originais = projeto.originais
+        somar_delta(deltas, originais["id_regiao"], originais["id_tipo_fonte"], originais["status"], -1, -originais["custo"])
+        somar_delta(deltas, projeto.id_regiao, projeto.id_tipo_fonte, projeto.status, 1, projeto.custo)
+    return deltas
+
+# Exceção de conflito ao salvar um projeto cuja versão mudou no banco
+def conflito_de_versao(projeto: Projeto) -> ConflitoDeVersao:
+    return ConflitoDeVersao(f"O projeto {projeto.id_projeto} foi alterado ou excluído por outro usuário desde que foi lido.")
+
+
+# ============================== Repositório ==============================
+
+# Acesso aos dados de projetos, tipos de fonte, regiões e emissões, independente do banco
+class Repositorio:
+    def __init__(self, conectar, devolver, dialeto: str, tamanho_cache: int = TAMANHO_CACHE_COMANDOS):
+        self._conectar = conectar  # Função que empresta uma conexão DB-API
+        self._devolver = devolver  # Função que devolve/fecha a conexão
+        self.dialeto = dialeto  # "oracle" ou "sqlite"
+        self.comandos = RegistroComandos(dialeto, tamanho_cache)  # Comandos SQL nomeados e seus contadores
+        self.comandos.registrar_todos(COMANDOS)
+
+    # Empresta uma conexão (levanta exceção se não for possível)
+    def conectar(self):
+        with metricas.medir("bd_conectar"):
+            conexao = self._conectar()
+            if conexao is None:
+                raise ConnectionError("Não foi possível conectar ao banco de dados.")
+        return metricas.medir_conexao(conexao)  # Com as métricas ligadas, conta idas e voltas e linhas
+
+    # Devolve uma conexão emprestada
+    def devolver(self, conexao) -> None:
+        if conexao is not None:
+            self._devolver(metricas.conexao_real(conexao))
+
+    # Empresta uma conexão durante um bloco "with"
+    @contextmanager
+    def conexao(self):
+        conexao = self.conectar()
+        try:
+            yield conexao
+        finally:
+            self.devolver(conexao)
+
+    # ----------------------- Tabelas de referência -----------------------
+
+    # Retorna as linhas (id, nome) de uma tabela de referência
+    def listar_referencia(self, tabela: str) -> list[tuple]:
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            self.comandos.executar(cursor, f"listar_referencia:{tabela}")
+            return cursor.fetchall()
+
+    # Retorna a "versão" de uma tabela de referência (quantidade de linhas e maior ID)
+    def versao_referencia(self, tabela: str) -> tuple:
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            self.comandos.executar(cursor, f"versao_referencia:{tabela}")
+            return tuple(cursor.fetchone())
+
+    # Insere nomes em uma tabela de referência
+    def inserir_referencia(self, tabela: str, nomes: list[str]) -> None:
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            self.comandos.executar_muitos(cursor, f"inserir_referencia:{tabela}", [{"nome": nome} for nome in nomes])
+            conexao.commit()
+
+    # Retorna os fatores de emissão (ID_EMISSAO, ID_TIPO_FONTE, EMISSAO)
+    def listar_emissoes(self) -> list[tuple]:
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            self.comandos.executar(cursor, "listar_emissoes")
+            return cursor.fetchall()
+
+    # Insere fatores de emissão ({"id_tipo_fonte": ..., "emissao": ...})
+    def inserir_emissoes(self, emissoes: list[dict]) -> None:
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            self.comandos.executar_muitos(cursor, "inserir_emissoes", emissoes)
+            conexao.commit()
+
+    # ------------------------------ Projetos ------------------------------
+
+    # Busca um projeto pelo ID (mesmas colunas da consulta de projetos)
+    def buscar_projeto(self, id_projeto: int) -> tuple | None:
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            self.comandos.executar(cursor, "buscar_projeto", {"id_projeto": id_projeto})
+            return cursor.fetchone()
+
+    # Aplica no resumo os deltas acumulados por grupo, na mesma transação da alteração dos projetos
+    def _aplicar_deltas_resumo(self, cursor, deltas: dict[tuple, list]) -> None:
+        parametros, vazios = parametros_resumo(deltas)
+        if parametros:
+            self.comandos.executar_muitos(cursor, "atualizar_resumo", parametros)
+        if vazios:
+            # Grupos que ficaram vazios saem do resumo
+            self.comandos.executar_muitos(cursor, "excluir_resumo_vazio", vazios)
+
+    # Lê (e trava) a região, o tipo de fonte, o status e o custo atuais de um projeto
+    def _grupo_atual(self, cursor, id_projeto: int) -> tuple | None:
+        self.comandos.executar(cursor, "grupo_atual", {"id_projeto": id_projeto})
+        return cursor.fetchone()
+
+    # Insere um projeto, retornando o ID gerado
+    def inserir_projeto(self, dados: dict) -> int:
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            if self.dialeto == "oracle":
+                id_novo = cursor.var(int)
+                self.comandos.executar(cursor, "inserir_projeto_retornando", {**dados, "id_novo": id_novo})
+                id_projeto = id_novo.getvalue()[0]
+            else:
+                self.comandos.executar(cursor, "inserir_projeto_retornando", dados)
+                id_projeto = cursor.lastrowid
+            deltas = {}
+            somar_delta(deltas, dados["id_regiao"], dados["id_tipo_fonte"], dados["status"], 1, dados["custo"])
+            self._aplicar_deltas_resumo(cursor, deltas)
+            conexao.commit()
+            return id_projeto
+
+    # Insere um lote de projetos com executemany(), retornando os erros por posição no lote
+    def inserir_projetos(self, lote: list[dict], manter_ids: bool = False) -> list[tuple[int, str]]:
+        nome = "inserir_projeto_com_id" if manter_ids else "inserir_projeto"
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            if self.dialeto == "oracle":
+                # Um único round-trip; as linhas com erro são reportadas sem abortar o lote
+                self.comandos.executar_muitos(cursor, nome, lote, batcherrors=True)
+                erros = [(erro.offset, erro.message) for erro in cursor.getbatcherrors()]
+            else:
+                erros = []
+                try:
+                    self.comandos.executar_muitos(cursor, nome, lote)
+                except sqlite3.Error:
+                    # O SQLite não tem batcherrors: refaz o lote linha a linha
+                    conexao.rollback()
+                    for posicao, parametros in enumerate(lote):
+                        try:
+                            self.comandos.executar(cursor, nome, parametros)
+                        except sqlite3.Error as e:
+                            erros.append((posicao, str(e)))
+
+            # Atualiza o resumo apenas com as linhas que entraram
+            com_erro = {posicao for posicao, _ in erros}
+            deltas = {}
+            for posicao, dados in enumerate(lote):
+                if posicao not in com_erro:
+                    somar_delta(deltas, dados["id_regiao"], dados["id_tipo_fonte"], dados["status"], 1, dados["custo"])
+            self._aplicar_deltas_resumo(cursor, deltas)
+            conexao.commit()
+            return erros
+
+    # Atualiza as colunas de um projeto
+    def atualizar_projeto(self, id_projeto: int, dados: dict) -> int:
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            anterior = self._grupo_atual(cursor, id_projeto)
+            if not anterior:
+                return 0
+            self.comandos.executar(
+                cursor,
+                "atualizar_projeto",
+                {
+                    "descricao": dados["descricao"],
+                    "custo": dados["custo"],
+                    "status": dados["status"],
+                    "id_tipo_fonte": dados["id_tipo_fonte"],
+                    "id_regiao": dados["id_regiao"],
+                    "id_projeto": id_projeto,
+                },
+            )
+            alteradas = cursor.rowcount
+
+            # Move o projeto do grupo antigo para o novo no resumo
+            deltas = {}
+            somar_delta(deltas, anterior[0], anterior[1], anterior[2], -1, -anterior[3])
+            somar_delta(deltas, dados["id_regiao"], dados["id_tipo_fonte"], dados["status"], 1, dados["custo"])
+            self._aplicar_deltas_resumo(cursor, deltas)
+            conexao.commit()
+            return alteradas
+
+    # Carrega um projeto como registro com controle de alterações e versão
+    def carregar_projeto(self, id_projeto: int) -> Projeto | None:
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            self.comandos.executar(cursor, "carregar_projeto", {"id_projeto": id_projeto})
+            linha = cursor.fetchone()
+            return Projeto.de_linha(linha) if linha else None
+
+    # Grava apenas os campos alterados do projeto, se a versão no banco ainda for a que foi lida
+    def salvar_projeto(self, projeto: Projeto) -> bool:
+        alterados = projeto.alterados
+        if not alterados:
+            return False  # Nada a gravar
+
+        nome, parametros = comando_salvar(self.comandos, projeto, alterados)
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            self.comandos.executar(cursor, nome, parametros)
+            if cursor.rowcount == 0:
+                conexao.rollback()
+                raise conflito_de_versao(projeto)
+            self._aplicar_deltas_resumo(cursor, deltas_salvar(projeto, alterados))
+            conexao.commit()
+        projeto.marcar_salvo(projeto.versao + 1)
+        return True
+
+    # Exclui um projeto
+    def excluir_projeto(self, id_projeto: int) -> int:
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            anterior = self._grupo_atual(cursor, id_projeto)
+            if not anterior:
+                return 0
+            self.comandos.executar(cursor, "excluir_projeto", {"id_projeto": id_projeto})
+            excluidas = cursor.rowcount
+
+            deltas = {}
+            somar_delta(deltas, anterior[0], anterior[1], anterior[2], -1, -anterior[3])
+            self._aplicar_deltas_resumo(cursor, deltas)
+            conexao.commit()
+            return excluidas
+
+    # -------------------------- Operações em lote --------------------------
+
+    # Monta o WHERE e os parâmetros de uma seleção de projetos (lista de IDs, intervalo e/ou filtro)
+    def _selecao(
+        self,
+        conexao,
+        ids: list[int] | None = None,
+        id_inicial: int | None = None,
+        id_final: int | None = None,
+        filtro: dict | None = None,
+    ) -> tuple[str, str, dict]:
+        criterios, parametros = [], {}
+        if ids is not None:
+            criterios.append("ids")
+            ids = [int(id_projeto) for id_projeto in ids]
+            if self.dialeto == "oracle":
+                parametros["ids"] = conexao.gettype(TIPO_LISTA_IDS).newobject(ids)
+            else:
+                parametros["ids"] = json.dumps(ids)
+        if id_inicial is not None or id_final is not None:
+            criterios.append("intervalo")
+            parametros["id_inicial"] = id_inicial if id_inicial is not None else 0
+            parametros["id_final"] = id_final if id_final is not None else 2**53
+        for campo, valor in (filtro or {}).items():
+            if campo not in COLUNAS_ATUALIZACAO_LOTE:
+                raise ValueError(f"Filtro inválido: {campo} (use {', '.join(COLUNAS_ATUALIZACAO_LOTE)})")
+            if valor is not None:
+                criterios.append(campo)
+                parametros[f"filtro_{campo}"] = valor
+        if not criterios:
+            raise ValueError("Informe os IDs, um intervalo de IDs ou um filtro (operações sem critério não são permitidas).")
+
+        where = " AND ".join(
+            criterio[self.dialeto] if isinstance(criterio, dict) else criterio
+            for criterio in (CRITERIOS_SELECAO[nome] for nome in criterios)
+        )
+        return ",".join(criterios), where, parametros
+
+    # Trava os projetos selecionados e retorna os seus totais por grupo (região, tipo de fonte, status)
+    def _grupos_selecionados(self, cursor, chave: str, where: str, parametros: dict) -> list[tuple]:
+        if self.dialeto == "oracle":
+            # As linhas são travadas já na abertura do cursor, sem precisar buscá-las
+            self.comandos.registrar(
+                f"travar_projetos[{chave}]",
+                f"SELECT ID_PROJETO FROM TBL_PROJETOS_SUSTENTAVEIS WHERE {where} FOR UPDATE",
+            )
+            self.comandos.executar(cursor, f"travar_projetos[{chave}]", parametros)
+        self.comandos.registrar(
+            f"grupos_projetos[{chave}]",
+            "SELECT ID_REGIAO, ID_TIPO_FONTE, STATUS, COUNT(*), SUM(CUSTO)"
+            f" FROM TBL_PROJETOS_SUSTENTAVEIS WHERE {where} GROUP BY ID_REGIAO, ID_TIPO_FONTE, STATUS",
+        )
+        self.comandos.executar(cursor, f"grupos_projetos[{chave}]", parametros)
+        return cursor.fetchall()
+
+    # Altera status, região e/ou tipo de fonte de vários projetos em um único UPDATE, retornando a quantidade alterada
+    def atualizar_projetos(
+        self,
+        alteracoes: dict,
+        ids: list[int] | None = None,
+        id_inicial: int | None = None,
+        id_final: int | None = None,
+        filtro: dict | None = None,
+    ) -> int:
+        alteracoes = {campo: valor for campo, valor in alteracoes.items() if valor is not None}
+        invalidas = set(alteracoes) - set(COLUNAS_ATUALIZACAO_LOTE)
+        if invalidas or not alteracoes:
+            raise ValueError(f"Informe ao menos um campo a alterar ({', '.join(COLUNAS_ATUALIZACAO_LOTE)}).")
+        if ids is not None and not ids:
+            return 0
+
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            chave, where, parametros = self._selecao(conexao, ids, id_inicial, id_final, filtro)
+            grupos = self._grupos_selecionados(cursor, chave, where, parametros)
+            if not grupos:
+                return 0
+
+            campos = sorted(alteracoes)
+            nome = f"atualizar_projetos[{','.join(campos)}|{chave}]"
+            self.comandos.registrar(
+                nome,
+                "UPDATE TBL_PROJETOS_SUSTENTAVEIS SET "
+                + ", ".join(f"{COLUNAS_ATUALIZACAO_LOTE[campo]} = :novo_{campo}" for campo in campos)
+                + f", VERSAO = VERSAO + 1 WHERE {where}",
+            )
+            self.comandos.executar(
+                cursor, nome, {**parametros, **{f"novo_{campo}": alteracoes[campo] for campo in campos}}
+            )
+            alteradas = cursor.rowcount
+
+            # Cada grupo antigo passa, inteiro, para o grupo com os novos valores
+            deltas = {}
+            for id_regiao, id_tipo_fonte, status, quantidade, custo in grupos:
+                somar_delta(deltas, id_regiao, id_tipo_fonte, status, -quantidade, -custo)
+                somar_delta(
+                    deltas,
+                    alteracoes.get("id_regiao", id_regiao),
+                    alteracoes.get("id_tipo_fonte", id_tipo_fonte),
+                    alteracoes.get("status", status),
+                    quantidade,
+                    custo,
+                )
+            self._aplicar_deltas_resumo(cursor, deltas)
+            conexao.commit()
+            return alteradas
+
+    # Exclui vários projetos em um único DELETE, retornando a quantidade excluída
+    def excluir_projetos(
+        self,
+        ids: list[int] | None = None,
+        id_inicial: int | None = None,
+        id_final: int | None = None,
+        filtro: dict | None = None,
+    ) -> int:
+        if ids is not None and not ids:
+            return 0
+
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            chave, where, parametros = self._selecao(conexao, ids, id_inicial, id_final, filtro)
+            grupos = self._grupos_selecionados(cursor, chave, where, parametros)
+            if not grupos:
+                return 0
+
+            nome = f"excluir_projetos[{chave}]"
+            self.comandos.registrar(nome, f"DELETE FROM TBL_PROJETOS_SUSTENTAVEIS WHERE {where}")
+            self.comandos.executar(cursor, nome, parametros)
+            excluidas = cursor.rowcount
+
+            deltas = {}
+            for id_regiao, id_tipo_fonte, status, quantidade, custo in grupos:
+                somar_delta(deltas, id_regiao, id_tipo_fonte, status, -quantidade, -custo)
+            self._aplicar_deltas_resumo(cursor, deltas)
+            conexao.commit()
+            return excluidas
+
+    # ------------------------------- Resumo -------------------------------
+
+    # Lê o resumo mantido incrementalmente (uma linha por grupo)
+    def listar_resumo(self) -> list[tuple]:
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            self.comandos.executar(cursor, "listar_resumo")
+            return cursor.fetchall()
+
+    # Compara o resumo com os totais recalculados e, se pedido, reconstrói o resumo
+    def reconciliar_resumo(self, corrigir: bool = True, tolerancia: float = 0.005) -> list[dict]:
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            self.comandos.executar(cursor, "resumo_recalculado")
+            esperado = {linha[:3]: (linha[3], float(linha[4])) for linha in cursor.fetchall()}
+            self.comandos.executar(cursor, "listar_resumo")
+            atual = {linha[:3]: (linha[3], float(linha[4])) for linha in cursor.fetchall()}
+
+            # Lista os grupos com quantidade ou custo divergente
+            divergencias = []
+            for grupo in sorted(set(esperado) | set(atual), key=str):
+                quantidade_esperada, custo_esperado = esperado.get(grupo, (0, 0.0))
+                quantidade_atual, custo_atual = atual.get(grupo, (0, 0.0))
+                if quantidade_esperada != quantidade_atual or abs(custo_esperado - custo_atual) > tolerancia:
+                    divergencias.append({
+                        "ID_REGIAO": grupo[0],
+                        "ID_TIPO_FONTE": grupo[1],
+                        "STATUS": grupo[2],
+                        "QUANTIDADE_RESUMO": quantidade_atual,
+                        "QUANTIDADE_REAL": quantidade_esperada,
+                        "CUSTO_RESUMO": custo_atual,
+                        "CUSTO_REAL": custo_esperado,
+                    })
+
+            if corrigir and divergencias:
+                # Reconstrói o resumo inteiro em uma única transação
+                self.comandos.executar(cursor, "limpar_resumo")
+                self.comandos.executar(cursor, "reconstruir_resumo")
+                conexao.commit()
+            return divergencias
+
+    # Conta os projetos (opcionalmente de um status)
+    def contar_projetos(self, status: str | None = None) -> int:
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            if status:
+                self.comandos.executar(cursor, "contar_projetos_status", {"status": status})
+            else:
+                self.comandos.executar(cursor, "contar_projetos")
+            return cursor.fetchone()[0]
+
+    # Uma página de projetos cuja descrição contém todas as palavras da busca (prefixos, sem acentos/maiúsculas)
+    def buscar_projetos(
+        self, texto: str, status: str | None = None, ultimo_id: int = 0, limite: int = 20
+    ) -> list[tuple]:
+        palavras = palavras_busca(texto)
+        if not palavras:
+            raise ValueError("Informe ao menos uma palavra para a busca.")
+        parametros = {"consulta": expressao_busca(palavras, self.dialeto), "ultimo_id": ultimo_id, "limite": limite}
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            cursor.arraysize = limite
+            if status:
+                self.comandos.executar(cursor, "buscar_projetos_status", {**parametros, "status": status})
+            else:
+                self.comandos.executar(cursor, "buscar_projetos", parametros)
+            return cursor.fetchall()
+
+    # ------------------------ Captura de alterações ------------------------
+
+    # Maior número de alteração já atribuído (0 se nenhum projeto foi alterado desde a migração)
+    def ultima_alteracao(self) -> int:
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            self.comandos.executar(cursor, "ultima_alteracao")
+            return cursor.fetchone()[0]
+
+    # Instante a partir do qual transações ainda abertas podem ter gravado alterações (ver INSTANTE_SEGURO).
+    # Sem permissão de leitura em GV$TRANSACTION, relê uma janela fixa de JANELA_TRANSACOES_S segundos.
+    def instante_seguro(self):
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            try:
+                self.comandos.executar(cursor, "instante_seguro")
+            except Exception as e:
+                if self.dialeto != "oracle":
+                    raise
+                metricas.registrar_erro("instante_seguro", e)
+                self.comandos.executar(cursor, "instante_seguro_janela", {"segundos": JANELA_TRANSACOES_S})
+            return cursor.fetchone()[0]
+
+    # Executa um comando e entrega as linhas em blocos, em uma única conexão
+    def _blocos(self, nome: str, parametros: dict, tamanho_lote: int):
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            cursor.arraysize = tamanho_lote
+            self.comandos.executar(cursor, nome, parametros)
+            while bloco := cursor.fetchmany():
+                yield bloco
+
+    # Projetos inseridos ou alterados com número de alteração em (desde, ate] ou gravados desde "seguro_em",
+    # em ordem de alteração
+    def alteracoes_projetos(self, desde: int, ate: int, tamanho_lote: int = 1000, seguro_em=None):
+        return self._blocos("alteracoes_projetos", {"desde": desde, "ate": ate, "seguro_em": seguro_em}, tamanho_lote)
+
+    # Projetos excluídos em (desde, ate] ou desde "seguro_em": blocos de (ID_PROJETO, ID_ALTERACAO, EXCLUIDO_EM)
+    def exclusoes_projetos(self, desde: int, ate: int, tamanho_lote: int = 1000, seguro_em=None):
+        return self._blocos("exclusoes_projetos", {"desde": desde, "ate": ate, "seguro_em": seguro_em}, tamanho_lote)
+
+    # Marca d'água de um consumidor, (último número exportado, instante seguro), ou None se ainda não exportou
+    def ler_marca(self, nome: str) -> tuple | None:
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            self.comandos.executar(cursor, "ler_marca", {"nome": nome})
+            return cursor.fetchone()
+
+    # Marcas d'água de todos os consumidores: [(nome, id_alteracao, atualizada_em)]
+    def listar_marcas(self) -> list[tuple]:
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            self.comandos.executar(cursor, "listar_marcas")
+            return cursor.fetchall()
+
+    # Avança a marca d'água de um consumidor (e o instante a partir do qual a próxima exportação relê)
+    def gravar_marca(self, nome: str, id_alteracao: int, seguro_em=None) -> None:
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            self.comandos.executar(
+                cursor, "gravar_marca", {"nome": nome, "id_alteracao": id_alteracao, "seguro_em": seguro_em}
+            )
+            conexao.commit()
+
+    # Remove as exclusões que todos os consumidores já exportaram, retornando a quantidade removida
+    def limpar_exclusoes(self) -> int:
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            self.comandos.executar(cursor, "limpar_exclusoes")
+            removidas = cursor.rowcount
+            conexao.commit()
+            return removidas
+
+    # Custo, região e tipo de fonte de cada projeto (opcionalmente de um status), em blocos: entrada das simulações
+    def carteira_projetos(self, status: str | None = None, tamanho_lote: int = 10000):
+        if status:
+            return self._blocos("carteira_projetos_status", {"status": status}, tamanho_lote)
+        return self._blocos("carteira_projetos", {}, tamanho_lote)
+
+    # Faixas de ID_PROJETO com quantidades iguais de projetos: [(parte, id_inicial, id_final, quantidade)]
+    def particoes_projetos(self, partes: int, status: str | None = None) -> list[tuple]:
+        if partes < 1:
+            raise ValueError("A quantidade de partes deve ser positiva.")
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            if status:
+                self.comandos.executar(cursor, "particoes_projetos_status", {"partes": partes, "status": status})
+            else:
+                self.comandos.executar(cursor, "particoes_projetos", {"partes": partes})
+            return cursor.fetchall()
+
+    # Busca os projetos em páginas, usando paginação por chave (ID_PROJETO) em vez de OFFSET
+    def paginar_projetos(
+        self,
+        status: str | None = None,
+        tamanho_pagina: int = 1000,
+        arraysize: int | None = None,
+        prefetchrows: int | None = None,
+        ultimo_id: int = 0,
+        id_regiao: int | None = None,
+        id_tipo_fonte: int | None = None,
+        id_final: int | None = None,
+    ):
+        # Cada página continua a partir do último ID lido, sem reler as anteriores
+        nome = "paginar_projetos_status" if status else "paginar_projetos"
+        filtros = {"id_regiao": id_regiao, "id_tipo_fonte": id_tipo_fonte, "id_final": id_final}
+        filtros = {campo: valor for campo, valor in filtros.items() if valor is not None}
+        if filtros:
+            # Filtros por região/tipo de fonte/faixa de IDs: um comando por combinação usada
+            criterios = (["status"] if status else []) + list(filtros)
+            nome = f"paginar_projetos[{','.join(criterios)}]"
+            self.comandos.registrar(nome, {
+                dialeto: PAGINAR_PROJETOS.format(
+                    filtro="".join(f" AND {FILTROS_PAGINACAO[campo]}" for campo in criterios),
+                    limite=limite,
+                )
+                for dialeto, limite in LIMITE_LINHAS.items()
+            })
+
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            # Por padrão, a página inteira chega em uma única ida ao banco
+            cursor.arraysize = arraysize or tamanho_pagina
+            if hasattr(cursor, "prefetchrows"):
+                cursor.prefetchrows = prefetchrows if prefetchrows is not None else tamanho_pagina + 1
+
+            while True:
+                parametros = {"ultimo_id": ultimo_id, "limite": tamanho_pagina}
+                if status:
+                    parametros["status"] = status
+                parametros.update(filtros)
+                self.comandos.executar(cursor, nome, parametros)
+                pagina = cursor.fetchall()  # No máximo 'tamanho_pagina' linhas
+                if not pagina:
+                    return
+                yield pagina
+                if len(pagina) < tamanho_pagina:
+                    return  # Última página
+                ultimo_id = pagina[-1][0]
+
+
+# ============================== Fábricas =================================
+
+# Cria o repositório sobre conexões Oracle (por exemplo, emprestadas de um pool)
+def criar_repositorio_oracle(conectar, devolver, tamanho_cache: int = TAMANHO_CACHE_COMANDOS) -> Repositorio:
+    return Repositorio(conectar, devolver, "oracle", tamanho_cache)
+
+# Cria o repositório sobre um arquivo SQLite (ou um banco em memória com ":memory:")
+def criar_repositorio_sqlite(
+    caminho: str = ":memory:",
+    script: str = SCRIPT_TABELAS,
+    migrar: bool = True,
+    tamanho_cache: int = TAMANHO_CACHE_COMANDOS,
+    conexoes_ociosas: int = SQLITE_CONEXOES_OCIOSAS,
+) -> Repositorio:
+    if caminho == ":memory:":
+        # Banco em memória compartilhado entre as conexões deste processo
+        uri = f"file:projetos_{uuid.uuid4().hex}?mode=memory&cache=shared"
+    else:
+        uri = f"file:{os.path.abspath(caminho)}"
+
+    # Pool simples: as conexões devolvidas ficam ociosas (as mais recentes são reusadas primeiro)
+    ociosas = queue.LifoQueue(maxsize=conexoes_ociosas)
+
+    def abrir() -> sqlite3.Connection:
+        conexao = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=tamanho_cache)
+        conexao.execute("PRAGMA foreign_keys = ON")
+        return conexao
+
+    def conectar() -> sqlite3.Connection:
+        try:
+            return ociosas.get_nowait()
+        except queue.Empty:
+            return abrir()
+
+    def devolver(conexao: sqlite3.Connection) -> None:
+        if conexao.in_transaction:
+            conexao.rollback()  # Não deixa uma transação pendente para o próximo uso
+        try:
+            ociosas.put_nowait(conexao)
+        except queue.Full:
+            repositorio.comandos.descartar(conexao)  # A conexão fechada leva junto o seu cache de comandos
+            conexao.close()
+
+    # Mantém uma conexão aberta para o banco em memória não ser descartado
+    ancora = abrir()
+    criar_tabelas_sqlite(ancora, script)
+    repositorio = Repositorio(conectar, devolver, "sqlite", tamanho_cache)
+    repositorio._ancora = ancora
+    if migrar:
+        # Índices e demais alterações de esquema posteriores ao script
+        from migracoes import aplicar_migracoes
+        aplicar_migracoes(repositorio)
+    return repositorio
@@ -0,0 +1,366 @@
+# ================================ Imports ================================
+import asyncio
+import threading
+import time
+import weakref
+
+import código_fonte as cf
+import metricas
+from comandos import RegistroComandos
+from projeto import Projeto
+from repositorio import (
+    COMANDOS,
+    ConflitoDeVersao,
+    Repositorio,
+    comando_salvar,
+    conflito_de_versao,
+    deltas_salvar,
+    parametros_resumo,
+    somar_delta,
+)
+
+
+# ============================= Configurações =============================
+
+# Pools assíncronos do Oracle, um por laço de eventos: cada pool fica preso ao laço que o criou, e quem usa o
+# serviço no próprio asyncio.run() não pode reaproveitar o pool do laço da API síncrona (nem o contrário).
+# As chaves são fracas: o pool de um laço descartado sai do mapa junto com ele.
+_pools_async = weakref.WeakKeyDictionary()
+_pools_async_lock = threading.Lock()  # A criação do pool não aguarda nada, então um lock comum basta
+
+# Repositório assíncrono do backend configurado, por laço de eventos
+_repositorios_async = weakref.WeakKeyDictionary()
+
+# Laço de eventos em uma thread dedicada, usado pela API síncrona
+_laco = None
+_laco_lock = threading.Lock()
+
+
+# ===================== Repositório assíncrono (Oracle) ===================
+
+# Mesmas operações do Repositorio, sobre conexões assíncronas do python-oracledb
+class RepositorioOracleAsync:
+    dialeto = "oracle"
+
+    def __init__(self, pool):
+        self._pool = pool
+        self.comandos = RegistroComandos("oracle", cf.TAMANHO_CACHE_COMANDOS)  # Mesmos comandos nomeados do síncrono
+        self.comandos.registrar_todos(COMANDOS)
+
+    # Executa um comando nomeado em um cursor assíncrono
+    async def _executar(self, cursor, nome: str, parametros: dict | None = None) -> None:
+        with metricas.medir("sql:" + nome) as medicao:
+            medicao.ida()
+            await cursor.execute(self.comandos.preparar(nome, cursor.connection), parametros or {})
+
+    # Executa um comando nomeado para vários conjuntos de parâmetros
+    async def _executar_muitos(self, cursor, nome: str, parametros: list, **kwargs) -> None:
+        with metricas.medir("sql:" + nome) as medicao:
+            medicao.ida()
+            await cursor.executemany(self.comandos.preparar(nome, cursor.connection), parametros, **kwargs)
+
+    # Aplica os deltas no resumo, na mesma transação
+    async def _aplicar_deltas_resumo(self, cursor, deltas: dict) -> None:
+        parametros, vazios = parametros_resumo(deltas)
+        if parametros:
+            await self._executar_muitos(cursor, "atualizar_resumo", parametros)
+        if vazios:
+            await self._executar_muitos(cursor, "excluir_resumo_vazio", vazios)
+
+    # Executa uma consulta e retorna todas as linhas
+    async def _buscar_todas(self, nome: str, parametros: dict | None = None) -> list[tuple]:
+        async with self._pool.acquire() as conexao:
+            cursor = conexao.cursor()
+            await self._executar(cursor, nome, parametros)
+            linhas = await cursor.fetchall()
+            metricas.contar("sql:" + nome, idas=1, linhas=len(linhas))
+            return linhas
+
+    async def listar_referencia(self, tabela: str) -> list[tuple]:
+        return await self._buscar_todas(f"listar_referencia:{tabela}")
+
+    async def versao_referencia(self, tabela: str) -> tuple:
+        return tuple((await self._buscar_todas(f"versao_referencia:{tabela}"))[0])
+
+    async def buscar_projeto(self, id_projeto: int) -> tuple | None:
+        linhas = await self._buscar_todas("buscar_projeto", {"id_projeto": id_projeto})
+        return linhas[0] if linhas else None
+
+    async def carregar_projeto(self, id_projeto: int) -> Projeto | None:
+        linhas = await self._buscar_todas("carregar_projeto", {"id_projeto": id_projeto})
+        return Projeto.de_linha(linhas[0]) if linhas else None
+
+    async def contar_projetos(self, status: str | None = None) -> int:
+        if status:
+            return (await self._buscar_todas("contar_projetos_status", {"status": status}))[0][0]
+        return (await self._buscar_todas("contar_projetos"))[0][0]
+
+    async def inserir_projeto(self, dados: dict) -> int:
+        async with self._pool.acquire() as conexao:
+            cursor = conexao.cursor()
+            id_novo = cursor.var(int)
+            await self._executar(cursor, "inserir_projeto_retornando", {**dados, "id_novo": id_novo})
+            deltas = {}
+            somar_delta(deltas, dados["id_regiao"], dados["id_tipo_fonte"], dados["status"], 1, dados["custo"])
+            await self._aplicar_deltas_resumo(cursor, deltas)
+            await conexao.commit()
+            return id_novo.getvalue()[0]
+
+    async def salvar_projeto(self, projeto: Projeto) -> bool:
+        alterados = projeto.alterados
+        if not alterados:
+            return False
+        nome, parametros = comando_salvar(self.comandos, projeto, alterados)
+        async with self._pool.acquire() as conexao:
+            cursor = conexao.cursor()
+            await self._executar(cursor, nome, parametros)
+            if cursor.rowcount == 0:
+                await conexao.rollback()
+                raise conflito_de_versao(projeto)
+            await self._aplicar_deltas_resumo(cursor, deltas_salvar(projeto, alterados))
+            await conexao.commit()
+        projeto.marcar_salvo(projeto.versao + 1)
+        return True
+
+    async def excluir_projeto(self, id_projeto: int) -> int:
+        async with self._pool.acquire() as conexao:
+            cursor = conexao.cursor()
+            await self._executar(cursor, "grupo_atual", {"id_projeto": id_projeto})
+            anterior = await cursor.fetchone()
+            if not anterior:
+                return 0
+            await self._executar(cursor, "excluir_projeto", {"id_projeto": id_projeto})
+            excluidas = cursor.rowcount
+            deltas = {}
+            somar_delta(deltas, anterior[0], anterior[1], anterior[2], -1, -anterior[3])
+            await self._aplicar_deltas_resumo(cursor, deltas)
+            await conexao.commit()
+            return excluidas
+
+    # Páginas de projetos por chave (ID_PROJETO), como no repositório síncrono
+    async def paginar_projetos(self, status: str | None = None, tamanho_pagina: int = 1000, ultimo_id: int = 0):
+        nome = "paginar_projetos_status" if status else "paginar_projetos"
+        async with self._pool.acquire() as conexao:
+            cursor = conexao.cursor()
+            cursor.arraysize = tamanho_pagina
+            cursor.prefetchrows = tamanho_pagina + 1
+            while True:
+                parametros = {"ultimo_id": ultimo_id, "limite": tamanho_pagina}
+                if status:
+                    parametros["status"] = status
+                await self._executar(cursor, nome, parametros)
+                pagina = await cursor.fetchall()
+                metricas.contar("sql:" + nome, idas=1, linhas=len(pagina))
+                if not pagina:
+                    return
+                yield pagina
+                if len(pagina) < tamanho_pagina:
+                    return
+                ultimo_id = pagina[-1][0]
+
+
+# =============== Repositório assíncrono sobre o síncrono (SQLite) =========
+
+# O SQLite não tem driver assíncrono na biblioteca padrão: cada operação roda em uma thread auxiliar
+class RepositorioEmThread:
+    def __init__(self, repositorio: Repositorio):
+        self._repositorio = repositorio
+        self.dialeto = repositorio.dialeto
+        self.comandos = repositorio.comandos
+
+    # Qualquer método do repositório vira uma corrotina executada fora do laço de eventos
+    def __getattr__(self, nome):
+        metodo = getattr(self._repositorio, nome)
+
+        async def executar(*args, **kwargs):
+            return await asyncio.to_thread(metodo, *args, **kwargs)
+
+        return executar
+
+    async def paginar_projetos(self, status: str | None = None, tamanho_pagina: int = 1000, ultimo_id: int = 0):
+        paginas = self._repositorio.paginar_projetos(status, tamanho_pagina, ultimo_id=ultimo_id)
+        try:
+            while (pagina := await asyncio.to_thread(next, paginas, None)) is not None:
+                yield pagina
+        finally:
+            await asyncio.to_thread(paginas.close)
+
+
+# ============================== Subalgoritmos ============================
+
+# Cria (uma única vez por laço de eventos) o pool assíncrono do Oracle
+async def obter_pool_async():
+    import oracledb
+
+    laco = asyncio.get_running_loop()
+    with _pools_async_lock:
+        pool = _pools_async.get(laco)
+        if pool is None:
+            pool = _pools_async[laco] = oracledb.create_pool_async(
+                user=cf.DB_USUARIO,
+                password=cf.DB_SENHA,
+                dsn=cf.DB_DSN,
+                min=cf.POOL_MIN,
+                max=cf.POOL_MAX,
+                increment=cf.POOL_INCREMENTO,
+                getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                wait_timeout=int(cf.POOL_TIMEOUT_AQUISICAO * 1000),
+                stmtcachesize=cf.TAMANHO_CACHE_COMANDOS,
+            )
+        return pool
+
+# Retorna o repositório assíncrono do backend configurado para o laço de eventos em uso
+async def obter_repositorio_async():
+    laco = asyncio.get_running_loop()
+    repositorio = _repositorios_async.get(laco)
+    if repositorio is None:
+        if cf.BACKEND_BD == "sqlite":
+            repositorio = RepositorioEmThread(cf.obter_repositorio())
+        else:
+            repositorio = RepositorioOracleAsync(await obter_pool_async())
+        _repositorios_async[laco] = repositorio
+    return repositorio
+
+# Encerra o pool assíncrono do laço de eventos em uso (quem roda o serviço no próprio laço chama antes de encerrá-lo)
+async def encerrar_pool_async() -> None:
+    laco = asyncio.get_running_loop()
+    with _pools_async_lock:
+        pool = _pools_async.pop(laco, None)
+        _repositorios_async.pop(laco, None)
+    if pool is not None:
+        await pool.close(force=True)
+
+# Carrega o mapa {id: nome} de uma tabela de referência, compartilhando o cache da versão síncrona
+async def carregar_referencia(tabela: str) -> dict[int, str]:
+    agora = time.monotonic()
+    with cf._cache_lock:
+        entrada = cf._cache_referencia.get(tabela)
+    if entrada and agora - entrada["carregado_em"] < cf.CACHE_TTL_REFERENCIA:
+        return entrada["opcoes"]
+
+    repositorio = await obter_repositorio_async()
+    versao = await repositorio.versao_referencia(tabela)
+    if entrada and entrada["versao"] == versao:
+        with cf._cache_lock:
+            entrada["carregado_em"] = agora
+        return entrada["opcoes"]
+
+    opcoes = dict(await repositorio.listar_referencia(tabela))
+    with cf._cache_lock:
+        cf._cache_referencia[tabela] = {"opcoes": opcoes, "versao": versao, "carregado_em": agora}
+    return opcoes
+
+# Valida os dados de um projeto, consultando as duas tabelas de referência ao mesmo tempo
+async def validar_projeto(descricao: str, custo: float, status: str, id_tipo_fonte: int, id_regiao: int) -> dict:
+    tipos_fonte, regioes = await asyncio.gather(
+        carregar_referencia("TBL_TIPO_FONTES"),
+        carregar_referencia("TBL_REGIOES_SUSTENTAVEIS"),
+    )
+    return cf.validar_linha_projeto(
+        {
+            "DESCRICAO": descricao,
+            "CUSTO": custo,
+            "STATUS": status,
+            "ID_TIPO_FONTE": id_tipo_fonte,
+            "ID_REGIAO": id_regiao,
+        },
+        tipos_fonte,
+        regioes,
+    )
+
+
+# ======================= Operações assíncronas ===========================
+
+# Insere um novo projeto, retornando o ID gerado
+async def inserir_projeto(descricao: str, custo: float, status: str, id_tipo_fonte: int, id_regiao: int) -> int:
+    dados = await validar_projeto(descricao, custo, status, id_tipo_fonte, id_regiao)
+    return await (await obter_repositorio_async()).inserir_projeto(dados)
+
+# Retorna um projeto pelo ID, ou None se não existir
+async def buscar_projeto(id_projeto: int) -> tuple | None:
+    return await (await obter_repositorio_async()).buscar_projeto(id_projeto)
+
+# Carrega um projeto como registro com controle de alterações e versão
+async def carregar_projeto(id_projeto: int) -> Projeto | None:
+    return await (await obter_repositorio_async()).carregar_projeto(id_projeto)
+
+# Atualiza os campos informados de um projeto (apenas as colunas alteradas, conferindo a versão)
+async def atualizar_projeto(
+    id_projeto: int,
+    descricao: str | None = None,
+    custo: float | None = None,
+    status: str | None = None,
+    id_tipo_fonte: int | None = None,
+    id_regiao: int | None = None,
+    versao: int | None = None,
+) -> int:
+    repositorio = await obter_repositorio_async()
+    projeto = await repositorio.carregar_projeto(id_projeto)
+    if not projeto:
+        raise LookupError(f"Projeto {id_projeto} não encontrado.")
+    if versao is not None and versao != projeto.versao:
+        raise ConflitoDeVersao(f"O projeto {id_projeto} está na versão {projeto.versao}, não na {versao}.")
+
+    dados = await validar_projeto(
+        descricao if descricao is not None else projeto.descricao,
+        custo if custo is not None else projeto.custo,
+        status if status is not None else projeto.status,
+        id_tipo_fonte if id_tipo_fonte is not None else projeto.id_tipo_fonte,
+        id_regiao if id_regiao is not None else projeto.id_regiao,
+    )
+    for campo, valor in dados.items():
+        setattr(projeto, campo, valor)
+    return int(await repositorio.salvar_projeto(projeto))
+
+# Exclui um projeto, retornando a quantidade de linhas excluídas
+async def excluir_projeto(id_projeto: int) -> int:
+    return await (await obter_repositorio_async()).excluir_projeto(id_projeto)
+
+# Percorre os projetos (opcionalmente de um status), buscando-os em páginas
+async def consultar_projetos(status: str | None = None, tamanho_lote: int = cf.TAMANHO_LOTE_CONSULTA):
+    repositorio = await obter_repositorio_async()
+    async for pagina in repositorio.paginar_projetos(status, tamanho_lote):
+        for projeto in pagina:
+            yield projeto
+
+# Busca vários projetos ao mesmo tempo (uma consulta por ID, em paralelo no pool)
+async def buscar_projetos(ids: list[int]) -> list[tuple | None]:
+    return list(await asyncio.gather(*(buscar_projeto(id_projeto) for id_projeto in ids)))
+
+# Exporta os projetos para um arquivo sem bloquear o laço de eventos.
+# A exportação é uma leitura longa e sequencial: roda na API síncrona, em uma thread auxiliar.
+async def exportar_projetos(
+    formato: str,
+    nome_arquivo: str | None = None,
+    status: str | None = None,
+    compacto: bool = False,
+    gzip_ativo: bool = False,
+) -> dict:
+    import api
+
+    return await asyncio.to_thread(api.exportar_projetos, formato, nome_arquivo, status, compacto, gzip_ativo)
+
+
+# ========================= Ponte para código síncrono =====================
+
+# Laço de eventos em uma thread própria, com o seu próprio pool assíncrono
+def _obter_laco() -> asyncio.AbstractEventLoop:
+    global _laco
+    with _laco_lock:
+        if _laco is None:
+            _laco = asyncio.new_event_loop()
+            threading.Thread(target=_laco.run_forever, name="laco-servico-async", daemon=True).start()
+        return _laco
+
+# Executa uma corrotina do serviço a partir de código síncrono e devolve o resultado
+def executar(corrotina):
+    return asyncio.run_coroutine_threadsafe(corrotina, _obter_laco()).result()
+
+# Encerra o pool assíncrono e o laço de eventos da API síncrona
+def encerrar() -> None:
+    global _laco
+    with _laco_lock:
+        laco, _laco = _laco, None
+    if laco is not None:
+        asyncio.run_coroutine_threadsafe(encerrar_pool_async(), laco).result()
+        laco.call_soon_threadsafe(laco.stop)
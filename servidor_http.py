@@ -0,0 +1,462 @@
+# ================================ Imports ================================
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import zlib
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import api
+import metricas
+from repositorio import ConflitoDeVersao
+
+
+# ============================= Configurações =============================
+
+# Endereço padrão do serviço
+HTTP_HOST = os.getenv("HTTP_HOST", "127.0.0.1")
+HTTP_PORTA = int(os.getenv("HTTP_PORTA", "8000"))
+
+# Exibe uma linha de log por requisição (desligado por padrão para não pesar nos testes de carga)
+HTTP_LOG_REQUISICOES = os.getenv("HTTP_LOG_REQUISICOES", "0") == "1"
+
+# Maior página aceita na listagem de projetos
+LIMITE_MAXIMO_PAGINA = 1000
+
+# Maior corpo não lido que é descartado para manter a conexão; acima disso a conexão é fechada
+LIMITE_DESCARTE_CORPO = 1024 * 1024
+
+# Projetos por bloco enviado nas exportações JSON/NDJSON e bytes por bloco nos demais formatos
+PROJETOS_POR_BLOCO = 1000
+BYTES_POR_BLOCO = 64 * 1024
+
+# Tabelas de referência expostas: caminho -> (tabela, campo_id, campo_nome)
+REFERENCIAS = {
+    "tipos-fonte": ("TBL_TIPO_FONTES", "ID_TIPO_FONTE", "NOME"),
+    "regioes": ("TBL_REGIOES_SUSTENTAVEIS", "ID_REGIAO", "NOME"),
+}
+
+# Tipo de conteúdo de cada formato de exportação
+TIPOS_CONTEUDO = {
+    "json": "application/json; charset=utf-8",
+    "ndjson": "application/x-ndjson; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+    "feather": "application/vnd.apache.arrow.file",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Nomes das colunas de um projeto listado (mesma ordem da consulta de projetos)
+COLUNAS_PROJETO = ("ID_PROJETO", "DESCRICAO", "CUSTO", "STATUS", "ID_TIPO_FONTE", "TIPO_FONTE", "ID_REGIAO", "REGIAO")
+
+
+# ============================== Subalgoritmos ============================
+
+# Converte uma linha da consulta de projetos em dict
+def projeto_para_json(linha: tuple) -> dict:
+    return dict(zip(COLUNAS_PROJETO, linha))
+
+# ETag de uma tabela de referência (muda sempre que o conteúdo muda)
+def etag_referencia(opcoes: dict) -> str:
+    conteudo = json.dumps(sorted(opcoes.items()), ensure_ascii=False).encode("utf-8")
+    return '"' + hashlib.sha1(conteudo).hexdigest()[:16] + '"'
+
+# Verifica se algum ETag de If-None-Match/If-Match corresponde ao ETag atual
+def etag_corresponde(cabecalho: str | None, etag: str) -> bool:
+    if not cabecalho:
+        return False
+    valores = [valor.strip().removeprefix("W/") for valor in cabecalho.split(",")]
+    return "*" in valores or etag in valores
+
+# Verifica se o cliente aceita gzip, respeitando os q-values do Accept-Encoding ("gzip;q=0" recusa)
+def aceita_gzip(cabecalho: str | None) -> bool:
+    pesos = {}
+    for item in (cabecalho or "").split(","):
+        codificacao, *parametros = item.split(";")
+        peso = 1.0
+        for parametro in parametros:
+            nome, _, valor = parametro.partition("=")
+            if nome.strip().lower() == "q":
+                try:
+                    peso = float(valor)
+                except ValueError:
+                    peso = 0.0
+        pesos[codificacao.strip().lower()] = peso
+    return pesos.get("gzip", pesos.get("x-gzip", pesos.get("*", 0.0))) > 0
+
+# Lê um inteiro opcional da query string
+def inteiro_opcional(parametros: dict, nome: str) -> int | None:
+    valor = parametros.get(nome, [None])[0]
+    if valor in (None, ""):
+        return None
+    try:
+        return int(valor)
+    except ValueError:
+        raise ValueError(f"Parâmetro '{nome}' deve ser um número inteiro.") from None
+
+# Blocos de texto de uma exportação JSON/NDJSON compacta, gerados à medida que os projetos chegam do banco
+def blocos_exportacao_json(formato: str, status: str | None):
+    separador = "\n" if formato == "ndjson" else ","
+    # Busca o primeiro projeto antes de entregar qualquer bloco: erros de banco aparecem antes do status 200
+    projetos = iter(api.consultar_projetos(status))
+    primeiro_projeto = next(projetos, None)
+    if primeiro_projeto is not None:
+        projetos = _encadear(primeiro_projeto, projetos)
+    bloco, primeiro = ["["] if formato == "json" else [], True
+    for projeto in projetos:
+        if not primeiro:
+            bloco.append(separador)
+        primeiro = False
+        bloco.append(json.dumps(api.cf._projeto_para_dict(projeto), ensure_ascii=False, separators=(",", ":")))
+        if len(bloco) >= 2 * PROJETOS_POR_BLOCO:
+            yield "".join(bloco)
+            bloco = []
+    if formato == "ndjson" and not primeiro:
+        bloco.append("\n")
+    if formato == "json":
+        bloco.append("]")
+    yield "".join(bloco)
+
+# Blocos de um arquivo exportado em formato binário (gerado em um arquivo temporário e apagado ao final)
+def blocos_exportacao_arquivo(formato: str, status: str | None):
+    descritor, caminho = tempfile.mkstemp(suffix="." + formato)
+    os.close(descritor)
+    try:
+        api.exportar_projetos(formato, caminho, status)
+        with open(caminho, "rb") as arquivo:
+            while bloco := arquivo.read(BYTES_POR_BLOCO):
+                yield bloco
+    finally:
+        os.remove(caminho)
+
+
+# ============================ Servidor HTTP ==============================
+
+# Atende as requisições da API de projetos
+class ManipuladorProjetos(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Conexões persistentes e respostas em blocos (chunked)
+    server_version = "ProjetosSustentaveis/1.0"
+    disable_nagle_algorithm = True  # Cabeçalhos e corpo saem em escritas separadas; sem isso cada resposta espera o ACK atrasado
+
+    _medicao = metricas.MEDICAO_NULA  # Medição da requisição em andamento
+
+    # Rotas: (método, expressão do caminho, nome do método que atende)
+    ROTAS = [
+        ("GET", r"/saude", "saude"),
+        ("GET", r"/metricas", "exibir_metricas"),
+        ("GET", r"/projetos", "listar_projetos"),
+        ("GET", r"/projetos/busca", "buscar_projetos"),
+        ("POST", r"/projetos", "inserir_projeto"),
+        ("GET", r"/projetos/(\d+)", "buscar_projeto"),
+        ("PATCH", r"/projetos/(\d+)", "atualizar_projeto"),
+        ("PUT", r"/projetos/(\d+)", "atualizar_projeto"),
+        ("DELETE", r"/projetos/(\d+)", "excluir_projeto"),
+        ("GET", r"/referencias/([\w-]+)", "listar_referencia"),
+        ("GET", r"/exportacoes/(\w+)", "exportar_projetos"),
+    ]
+
+    # ----------------------------- Respostas ------------------------------
+
+    # Envia uma resposta JSON completa
+    def _responder_json(self, codigo: int, corpo, cabecalhos: dict | None = None) -> None:
+        dados = json.dumps(corpo, ensure_ascii=False, default=str).encode("utf-8") if corpo is not None else b""
+        self.send_response(codigo)
+        if corpo is not None:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        if codigo not in (HTTPStatus.NO_CONTENT, HTTPStatus.NOT_MODIFIED):  # Respostas sem corpo (RFC 9110)
+            self.send_header("Content-Length", str(len(dados)))
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        if dados and self.command != "HEAD":
+            self.wfile.write(dados)
+            self._medicao.bytes(len(dados))
+
+    # Envia uma resposta de erro no formato {"erro": ...}, descartando antes o corpo que a rota não leu
+    def _erro(self, codigo: int, mensagem: str, cabecalhos: dict | None = None) -> None:
+        self._descartar_corpo()
+        self._responder_json(codigo, {"erro": mensagem}, cabecalhos)
+
+    # Responde com erro. Se uma resposta em blocos já começou (status e cabeçalhos enviados), não há como mandar
+    # outro status: a resposta fica sem o bloco final e a conexão é fechada, para o cliente perceber a falha
+    def _falhar(self, codigo: int, mensagem: str) -> None:
+        if self._resposta_iniciada:
+            self.log_error("Resposta interrompida em %s %s: %s", self.command, self.path, mensagem)
+            self.close_connection = True
+            return
+        self._erro(codigo, mensagem)
+
+    # Envia uma resposta em blocos (Transfer-Encoding: chunked), opcionalmente comprimida com gzip
+    def _responder_em_blocos(self, blocos, tipo_conteudo: str, nome_arquivo: str, comprimir: bool) -> None:
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", tipo_conteudo)
+        self.send_header("Content-Disposition", f'attachment; filename="{nome_arquivo}"')
+        self.send_header("Transfer-Encoding", "chunked")
+        if comprimir:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self._resposta_iniciada = True
+
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if comprimir else None  # wbits=31: formato gzip
+        for bloco in blocos:
+            dados = bloco.encode("utf-8") if isinstance(bloco, str) else bloco
+            if compressor:
+                dados = compressor.compress(dados)
+            self._escrever_bloco(dados)
+        if compressor:
+            self._escrever_bloco(compressor.flush())
+        self.wfile.write(b"0\r\n\r\n")  # Fim da resposta
+
+    # Escreve um bloco da resposta chunked
+    def _escrever_bloco(self, dados: bytes) -> None:
+        if dados:
+            self.wfile.write(f"{len(dados):X}\r\n".encode("ascii") + dados + b"\r\n")
+            self._medicao.bytes(len(dados))
+
+    # Lê o corpo JSON da requisição
+    def _ler_json(self) -> dict:
+        self._corpo_lido = True
+        tamanho = int(self.headers.get("Content-Length") or 0)
+        try:
+            corpo = json.loads(self.rfile.read(tamanho) or b"{}")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSON inválido: {e}") from None
+        if not isinstance(corpo, dict):
+            raise ValueError("O corpo da requisição deve ser um objeto JSON.")
+        return corpo
+
+    # Consome o corpo que a rota não leu. Sem isso, numa conexão persistente os bytes do corpo seriam lidos como a
+    # próxima requisição. Corpos grandes, em blocos ou com tamanho inválido não são lidos: a conexão é fechada
+    def _descartar_corpo(self) -> None:
+        if self._corpo_lido:
+            return
+        self._corpo_lido = True
+        try:
+            tamanho = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            tamanho = -1
+        if self.headers.get("Transfer-Encoding") or not 0 <= tamanho <= LIMITE_DESCARTE_CORPO:
+            self.close_connection = True
+        elif tamanho:
+            self.rfile.read(tamanho)
+
+    # ----------------------------- Despacho -------------------------------
+
+    # Encontra a rota e trata as exceções da API como códigos HTTP
+    def _despachar(self) -> None:
+        url = urlsplit(self.path)
+        parametros = parse_qs(url.query)
+        self._corpo_lido = False
+        metodos_do_caminho = set()
+        for metodo, padrao, nome in self.ROTAS:
+            encontrado = re.fullmatch(padrao, url.path.rstrip("/") or "/")
+            if not encontrado:
+                continue
+            metodos_do_caminho.add(metodo)
+            if metodo != self.command:
+                continue
+            self._resposta_iniciada = False
+            try:
+                with metricas.medir("http:" + nome) as self._medicao:  # Latência e bytes enviados por rota
+                    getattr(self, nome)(parametros, *encontrado.groups())
+            except ConflitoDeVersao as e:
+                self._falhar(HTTPStatus.PRECONDITION_FAILED, str(e))
+            except LookupError as e:
+                self._falhar(HTTPStatus.NOT_FOUND, str(e))
+            except ValueError as e:
+                self._falhar(HTTPStatus.BAD_REQUEST, str(e))
+            except Exception as e:
+                self.log_error("Erro ao atender %s %s: %r", self.command, self.path, e)
+                self._falhar(HTTPStatus.INTERNAL_SERVER_ERROR, "Erro interno ao acessar o banco de dados.")
+            self._descartar_corpo()
+            return
+
+        if metodos_do_caminho:
+            self._erro(
+                HTTPStatus.METHOD_NOT_ALLOWED,
+                f"Método {self.command} não permitido neste recurso.",
+                {"Allow": ", ".join(sorted(metodos_do_caminho))},
+            )
+        else:
+            self._erro(HTTPStatus.NOT_FOUND, f"Recurso não encontrado: {url.path}")
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _despachar
+
+    def log_message(self, formato: str, *args) -> None:
+        if HTTP_LOG_REQUISICOES:
+            super().log_message(formato, *args)
+
+    def log_error(self, formato: str, *args) -> None:
+        sys.stderr.write(f"🔴 {self.address_string()} - {formato % args}\n")
+
+    # ------------------------------ Recursos ------------------------------
+
+    # GET /saude
+    def saude(self, parametros: dict) -> None:
+        self._responder_json(HTTPStatus.OK, {"status": "ok", "backend": api.cf.BACKEND_BD})
+
+    # GET /metricas (formato Prometheus) ou /metricas?formato=json
+    def exibir_metricas(self, parametros: dict) -> None:
+        if parametros.get("formato", ["prometheus"])[0] == "json":
+            dados, tipo = metricas.texto_json().encode("utf-8"), "application/json; charset=utf-8"
+        else:
+            dados, tipo = metricas.texto_prometheus().encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    # GET /projetos?status=&regiao=&tipo_fonte=&apos=&limite=
+    def listar_projetos(self, parametros: dict) -> None:
+        limite = inteiro_opcional(parametros, "limite") or api.cf.TAMANHO_PAGINA_TELA
+        if not 1 <= limite <= LIMITE_MAXIMO_PAGINA:
+            raise ValueError(f"O limite deve estar entre 1 e {LIMITE_MAXIMO_PAGINA}.")
+        status = parametros.get("status", [None])[0]
+        if status is not None and status not in api.cf.STATUS_VALIDOS:
+            raise ValueError(f"Status inválido: {status}")
+
+        pagina, proximo = api.listar_projetos(
+            status,
+            inteiro_opcional(parametros, "regiao"),
+            inteiro_opcional(parametros, "tipo_fonte"),
+            inteiro_opcional(parametros, "apos") or 0,
+            limite,
+        )
+        self._responder_json(HTTPStatus.OK, {"projetos": [projeto_para_json(linha) for linha in pagina], "proximo": proximo})
+
+    # GET /projetos/busca?q=&status=&apos=&limite=
+    def buscar_projetos(self, parametros: dict) -> None:
+        limite = inteiro_opcional(parametros, "limite") or api.cf.TAMANHO_PAGINA_TELA
+        if not 1 <= limite <= LIMITE_MAXIMO_PAGINA:
+            raise ValueError(f"O limite deve estar entre 1 e {LIMITE_MAXIMO_PAGINA}.")
+        status = parametros.get("status", [None])[0]
+        if status is not None and status not in api.cf.STATUS_VALIDOS:
+            raise ValueError(f"Status inválido: {status}")
+
+        pagina, proximo = api.buscar_projetos(
+            parametros.get("q", [""])[0], status, inteiro_opcional(parametros, "apos") or 0, limite
+        )
+        self._responder_json(HTTPStatus.OK, {"projetos": [projeto_para_json(linha) for linha in pagina], "proximo": proximo})
+
+    # POST /projetos
+    def inserir_projeto(self, parametros: dict) -> None:
+        corpo = self._ler_json()
+        try:
+            id_projeto = api.inserir_projeto(
+                corpo["descricao"], corpo["custo"], corpo["status"], corpo["id_tipo_fonte"], corpo["id_regiao"]
+            )
+        except KeyError as e:
+            raise ValueError(f"Campo obrigatório ausente: {e.args[0]}") from None
+        self._responder_json(HTTPStatus.CREATED, {"ID_PROJETO": id_projeto}, {"Location": f"/projetos/{id_projeto}"})
+
+    # GET /projetos/{id} (ETag = versão do projeto)
+    def buscar_projeto(self, parametros: dict, id_projeto: str) -> None:
+        projeto = api.carregar_projeto(int(id_projeto))
+        if not projeto:
+            raise LookupError(f"Projeto {id_projeto} não encontrado.")
+        etag = f'"v{projeto.versao}"'
+        if etag_corresponde(self.headers.get("If-None-Match"), etag):
+            self._responder_json(HTTPStatus.NOT_MODIFIED, None, {"ETag": etag})
+            return
+        corpo = {coluna: getattr(projeto, coluna.lower()) for coluna in COLUNAS_PROJETO}
+        corpo["VERSAO"] = projeto.versao
+        self._responder_json(HTTPStatus.OK, corpo, {"ETag": etag})
+
+    # PATCH/PUT /projetos/{id} (If-Match: "v<versão>" evita sobrescrever alterações de outro cliente)
+    def atualizar_projeto(self, parametros: dict, id_projeto: str) -> None:
+        corpo = self._ler_json()
+        versao = None
+        if if_match := self.headers.get("If-Match"):
+            encontrado = re.fullmatch(r'(?:W/)?"v(\d+)"', if_match.strip())
+            if not encontrado:
+                raise ConflitoDeVersao(f"If-Match inválido: {if_match}")
+            versao = int(encontrado.group(1))
+        alteradas = api.atualizar_projeto(
+            int(id_projeto),
+            corpo.get("descricao"),
+            corpo.get("custo"),
+            corpo.get("status"),
+            corpo.get("id_tipo_fonte"),
+            corpo.get("id_regiao"),
+            versao,
+        )
+        projeto = api.carregar_projeto(int(id_projeto))
+        self._responder_json(HTTPStatus.OK, {"alterado": bool(alteradas)}, {"ETag": f'"v{projeto.versao}"'} if projeto else None)
+
+    # DELETE /projetos/{id}
+    def excluir_projeto(self, parametros: dict, id_projeto: str) -> None:
+        if not api.excluir_projeto(int(id_projeto)):
+            raise LookupError(f"Projeto {id_projeto} não encontrado.")
+        self._responder_json(HTTPStatus.NO_CONTENT, None)
+
+    # GET /referencias/{tipos-fonte|regioes} (ETag do conteúdo; If-None-Match responde 304)
+    def listar_referencia(self, parametros: dict, nome: str) -> None:
+        if nome not in REFERENCIAS:
+            raise LookupError(f"Tabela de referência desconhecida: {nome} (use {', '.join(REFERENCIAS)})")
+        opcoes = api.cf.carregar_referencia(*REFERENCIAS[nome])  # Vem do cache com TTL na maior parte das vezes
+        etag = etag_referencia(opcoes)
+        cabecalhos = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_corresponde(self.headers.get("If-None-Match"), etag):
+            self._responder_json(HTTPStatus.NOT_MODIFIED, None, cabecalhos)
+            return
+        self._responder_json(HTTPStatus.OK, [{"id": id_opcao, "nome": nome_opcao} for id_opcao, nome_opcao in opcoes.items()], cabecalhos)
+
+    # GET /exportacoes/{formato}?status= (resposta em blocos, sem montar o arquivo inteiro em memória)
+    def exportar_projetos(self, parametros: dict, formato: str) -> None:
+        if formato not in api.FORMATOS_EXPORTACAO:
+            raise LookupError(f"Formato não suportado: {formato} (use {', '.join(api.FORMATOS_EXPORTACAO)})")
+        status = parametros.get("status", [None])[0]
+        if status is not None and status not in api.cf.STATUS_VALIDOS:
+            raise ValueError(f"Status inválido: {status}")
+
+        if formato in ("json", "ndjson"):
+            blocos = blocos_exportacao_json(formato, status)
+            comprimir = aceita_gzip(self.headers.get("Accept-Encoding"))
+        else:
+            # Formatos binários precisam do arquivo completo (rodapé do Parquet, índice do Feather, zip do Excel)
+            blocos = blocos_exportacao_arquivo(formato, status)
+            comprimir = False
+        primeiro = next(blocos)  # Erros de banco aparecem antes de enviar o status 200
+        self._responder_em_blocos(
+            _encadear(primeiro, blocos), TIPOS_CONTEUDO[formato], f"projetos.{formato}", comprimir
+        )
+
+
+# Recoloca o primeiro bloco já lido na frente dos demais
+def _encadear(primeiro, restantes):
+    yield primeiro
+    yield from restantes
+
+# Cria o servidor HTTP (uma thread por conexão)
+def criar_servidor(host: str = HTTP_HOST, porta: int = HTTP_PORTA) -> ThreadingHTTPServer:
+    servidor = ThreadingHTTPServer((host, porta), ManipuladorProjetos)
+    servidor.daemon_threads = True
+    return servidor
+
+# Inicia o serviço HTTP
+def main() -> None:
+    parser = argparse.ArgumentParser(description="API HTTP/JSON de projetos sustentáveis.")
+    parser.add_argument("--host", default=HTTP_HOST)
+    parser.add_argument("--porta", type=int, default=HTTP_PORTA)
+    args = parser.parse_args()
+
+    servidor = criar_servidor(args.host, args.porta)
+    print(f"🟢 API disponível em http://{args.host}:{servidor.server_port} (backend {api.cf.BACKEND_BD})")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🔵 Encerrando o servidor...")
+    finally:
+        servidor.server_close()
+        api.encerrar()
+
+
+# Executa o servidor
+if __name__ == "__main__":
+    main()
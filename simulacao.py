@@ -0,0 +1,265 @@
+# ================================ Imports ================================
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import get_context
+
+import numpy as np
+
+import código_fonte as cf
+import metricas
+from repositorio import Repositorio
+
+
+# ============================= Configurações =============================
+
+# A partir desta quantidade de cenários, os blocos são avaliados em processos separados
+LIMITE_CENARIOS_PROCESSOS = int(os.getenv("SIMULACAO_LIMITE_PROCESSOS", "200000"))
+
+# Cenários avaliados de uma vez (limita a memória: cada bloco usa algumas matrizes cenários x regiões x fontes)
+TAMANHO_BLOCO_CENARIOS = int(os.getenv("SIMULACAO_TAMANHO_BLOCO", "20000"))
+
+# Processos usados nas simulações grandes
+PROCESSOS_SIMULACAO = int(os.getenv("SIMULACAO_PROCESSOS", str(os.cpu_count() or 1)))
+
+# Percentis informados nas distribuições
+PERCENTIS = (5, 50, 95)
+
+
+# =============================== Carteira ================================
+
+# Projetos carregados uma única vez em vetores tipados e agregados por (região, tipo de fonte).
+# Todos os efeitos simulados agem por grupo, então cada cenário custa operações sobre matrizes regiões x fontes,
+# independente da quantidade de projetos.
+class Carteira:
+    __slots__ = (
+        "ids_regiao", "nomes_regiao", "ids_fonte", "nomes_fonte", "fator_emissao",
+        "custo", "quantidade", "custo_quadrado",
+    )
+
+    def __init__(
+        self,
+        custos: np.ndarray,
+        ids_regiao_projeto: np.ndarray,
+        ids_fonte_projeto: np.ndarray,
+        regioes: list[tuple],
+        fontes: list[tuple],
+        emissoes: list[tuple],
+    ):
+        # Tabelas de referência (id, nome), em ordem de ID
+        self.ids_regiao = np.array([id_regiao for id_regiao, _ in regioes], dtype=np.int64)
+        self.nomes_regiao = [nome for _, nome in regioes]
+        self.ids_fonte = np.array([id_fonte for id_fonte, _ in fontes], dtype=np.int64)
+        self.nomes_fonte = [nome for _, nome in fontes]
+        forma = (len(self.ids_regiao), len(self.ids_fonte))
+
+        # Grupo de cada projeto (posição da região x posição da fonte) e totais por grupo
+        grupos = np.searchsorted(self.ids_regiao, ids_regiao_projeto) * forma[1] + np.searchsorted(self.ids_fonte, ids_fonte_projeto)
+        tamanho = forma[0] * forma[1]
+        self.custo = np.bincount(grupos, weights=custos, minlength=tamanho).reshape(forma)
+        self.quantidade = np.bincount(grupos, minlength=tamanho).reshape(forma).astype(np.float64)
+        self.custo_quadrado = np.bincount(grupos, weights=custos * custos, minlength=tamanho).reshape(forma)
+
+        # Fator de emissão médio de cada fonte (0 se a fonte não tiver fator), como nos relatórios
+        fontes_fator = np.searchsorted(self.ids_fonte, np.array([emissao[1] for emissao in emissoes], dtype=np.int64))
+        soma = np.bincount(fontes_fator, weights=[float(emissao[2]) for emissao in emissoes], minlength=forma[1])
+        contagem = np.bincount(fontes_fator, minlength=forma[1])
+        self.fator_emissao = np.divide(soma, contagem, out=np.zeros(forma[1]), where=contagem > 0)
+
+    # Quantidade de projetos da carteira
+    @property
+    def projetos(self) -> int:
+        return int(self.quantidade.sum())
+
+    # Emissão estimada da carteira atual (cada projeto emite o fator da sua fonte)
+    @property
+    def emissao(self) -> float:
+        return float(self.quantidade.sum(axis=0) @ self.fator_emissao)
+
+    # Custo relativo de um projeto que troca da fonte f (linha) para a fonte g (coluna): razão dos custos médios
+    def razao_custo_troca(self) -> np.ndarray:
+        quantidade = self.quantidade.sum(axis=0)
+        media = np.divide(self.custo.sum(axis=0), quantidade, out=np.zeros_like(quantidade), where=quantidade > 0)
+        return np.divide(
+            media[None, :], media[:, None],
+            out=np.ones((len(media), len(media))),
+            where=(media[:, None] > 0) & (media[None, :] > 0),
+        )
+
+
+# ============================== Subalgoritmos ============================
+
+# Carrega a carteira de projetos (opcionalmente de um status) do banco, em blocos, direto para vetores NumPy
+def carregar_carteira(
+    status: str | None = None, repositorio: Repositorio | None = None, tamanho_lote: int = 10000
+) -> Carteira:
+    repositorio = repositorio or cf.obter_repositorio()
+    blocos = [np.array(bloco, dtype=np.float64) for bloco in repositorio.carteira_projetos(status, tamanho_lote)]
+    projetos = np.concatenate(blocos) if blocos else np.empty((0, 3))
+    return Carteira(
+        projetos[:, 0],
+        projetos[:, 1].astype(np.int64),
+        projetos[:, 2].astype(np.int64),
+        repositorio.listar_referencia("TBL_REGIOES_SUSTENTAVEIS"),
+        repositorio.listar_referencia("TBL_TIPO_FONTES"),
+        repositorio.listar_emissoes(),
+    )
+
+# Vetor com um valor por região/fonte: um número vale para todas; um dict {id: valor} vale para as informadas (demais 0)
+def _por_referencia(valor, ids: np.ndarray, nome: str) -> np.ndarray:
+    if not isinstance(valor, dict):
+        return np.full(len(ids), float(valor))
+    desconhecidos = sorted(set(valor) - set(ids.tolist()))
+    if desconhecidos:
+        raise ValueError(f"{nome} inexistente(s): {', '.join(map(str, desconhecidos))}")
+    vetor = np.zeros(len(ids))
+    vetor[np.searchsorted(ids, list(valor))] = list(valor.values())
+    return vetor
+
+# Valida as trocas {(id_fonte_origem, id_fonte_destino): fração ou (mínima, máxima)} e as converte para posições
+def _preparar_trocas(trocas: dict, ids_fonte: np.ndarray) -> list[tuple]:
+    preparadas, saidas = [], {}
+    for (origem, destino), fracao in trocas.items():
+        minimo, maximo = fracao if isinstance(fracao, tuple) else (fracao, fracao)
+        if origem == destino or not {origem, destino} <= set(ids_fonte.tolist()):
+            raise ValueError(f"Troca de fonte inválida: {origem} -> {destino}")
+        if not 0 <= minimo <= maximo <= 1:
+            raise ValueError(f"A fração trocada deve estar entre 0 e 1: {origem} -> {destino}")
+        saidas[origem] = saidas.get(origem, 0.0) + maximo
+        if saidas[origem] > 1:
+            raise ValueError(f"As trocas da fonte {origem} somam mais de 100% dos projetos.")
+        preparadas.append((int(np.searchsorted(ids_fonte, origem)), int(np.searchsorted(ids_fonte, destino)), minimo, maximo))
+    return preparadas
+
+# Parâmetros de uma simulação em vetores por região/fonte (pequenos: vão junto para cada processo)
+def preparar_parametros(
+    carteira: Carteira,
+    inflacao=0.0,
+    desvio_inflacao=0.0,
+    anos: float = 1.0,
+    trocas: dict | None = None,
+    incerteza=0.0,
+    incerteza_projeto: float = 0.0,
+) -> dict:
+    if anos < 0 or incerteza_projeto < 0:
+        raise ValueError("Os anos e a incerteza devem ser positivos.")
+    parametros = {
+        "inflacao": _por_referencia(inflacao, carteira.ids_regiao, "Região"),
+        "desvio_inflacao": _por_referencia(desvio_inflacao, carteira.ids_regiao, "Região"),
+        "anos": float(anos),
+        "trocas": _preparar_trocas(trocas or {}, carteira.ids_fonte),
+        "incerteza": _por_referencia(incerteza, carteira.ids_fonte, "Tipo de fonte"),
+        "incerteza_projeto": float(incerteza_projeto),
+        "razao_custo": carteira.razao_custo_troca(),
+    }
+    if (parametros["desvio_inflacao"] < 0).any() or (parametros["incerteza"] < 0).any():
+        raise ValueError("Os desvios devem ser positivos.")
+    return parametros
+
+# Avalia um bloco de cenários (também em processos separados): custo total, emissão total e custo por região
+def _simular_bloco(carteira: Carteira, parametros: dict, semente, quantidade: int) -> tuple:
+    gerador = np.random.default_rng(semente)
+    regioes, fontes = carteira.custo.shape
+
+    # Inflação de cada região em cada cenário, composta pelos anos simulados
+    taxas = parametros["inflacao"] + parametros["desvio_inflacao"] * gerador.standard_normal((quantidade, regioes))
+    multiplicador = (1.0 + taxas) ** parametros["anos"]
+
+    # Destino das fontes em cada cenário: troca[c, f, g] = fração dos projetos da fonte f que passam para a fonte g
+    troca = np.tile(np.eye(fontes), (quantidade, 1, 1))
+    for origem, destino, minimo, maximo in parametros["trocas"]:
+        fracao = gerador.uniform(minimo, maximo, quantidade) if maximo > minimo else np.full(quantidade, minimo)
+        troca[:, origem, origem] -= fracao
+        troca[:, origem, destino] += fracao
+
+    # Custo e quantidade de cada grupo depois das trocas (o custo trocado segue a razão dos custos médios)
+    custo = np.einsum("rf,cfg->crg", carteira.custo, troca * parametros["razao_custo"])
+    quantidade_grupo = np.einsum("rf,cfg->crg", carteira.quantidade, troca)
+
+    # Incerteza independente de cada projeto: a soma do grupo é amostrada de uma normal com a variância exata da soma
+    if parametros["incerteza_projeto"] > 0:
+        variancia = np.einsum("rf,cfg->crg", carteira.custo_quadrado, troca * parametros["razao_custo"] ** 2)
+        variancia *= np.expm1(parametros["incerteza_projeto"] ** 2)
+        custo += np.sqrt(variancia) * gerador.standard_normal(custo.shape)
+
+    # Incerteza comum aos projetos de um grupo: choque lognormal de média 1, com desvio por tipo de fonte
+    sigma = parametros["incerteza"]
+    if sigma.any():
+        custo *= np.exp(sigma * gerador.standard_normal(custo.shape) - sigma**2 / 2)
+
+    custo *= multiplicador[:, :, None]
+    custo_regiao = custo.sum(axis=2)
+    emissao = quantidade_grupo.sum(axis=1) @ carteira.fator_emissao
+    return custo_regiao.sum(axis=1), emissao, custo_regiao
+
+# Estatísticas de uma distribuição simulada
+def distribuicao(valores: np.ndarray) -> dict:
+    percentis = np.percentile(valores, PERCENTIS)
+    return {
+        "MEDIA": float(valores.mean()),
+        "DESVIO": float(valores.std()),
+        "MINIMO": float(valores.min()),
+        **{f"P{percentil}": float(valor) for percentil, valor in zip(PERCENTIS, percentis)},
+        "MAXIMO": float(valores.max()),
+    }
+
+# Simula milhares de cenários de custo e emissão da carteira: inflação por região (média e desvio, composta por
+# "anos"), troca de tipo de fonte (fração fixa ou sorteada entre mínima e máxima) e incerteza de custo (Monte Carlo).
+# Os cenários são avaliados em blocos, cada um com a sua semente: o resultado é o mesmo com ou sem processos.
+def simular(
+    carteira: Carteira,
+    cenarios: int = 10_000,
+    inflacao=0.0,
+    desvio_inflacao=0.0,
+    anos: float = 1.0,
+    trocas: dict | None = None,
+    incerteza=0.0,
+    incerteza_projeto: float = 0.0,
+    semente: int | None = None,
+    processos: int | None = None,
+    tamanho_bloco: int = TAMANHO_BLOCO_CENARIOS,
+) -> dict:
+    if cenarios < 1:
+        raise ValueError("A quantidade de cenários deve ser positiva.")
+    parametros = preparar_parametros(carteira, inflacao, desvio_inflacao, anos, trocas, incerteza, incerteza_projeto)
+    tamanhos = [min(tamanho_bloco, cenarios - inicio) for inicio in range(0, cenarios, tamanho_bloco)]
+    sequencia = np.random.SeedSequence(semente)
+    sementes = sequencia.spawn(len(tamanhos))
+    if processos is None:
+        processos = PROCESSOS_SIMULACAO if cenarios >= LIMITE_CENARIOS_PROCESSOS else 1
+    processos = max(1, min(processos, len(tamanhos)))
+
+    inicio = time.perf_counter()
+    with metricas.medir("simulacao"):
+        if processos > 1:
+            # "spawn": os processos não herdam as threads (pools de conexão, serviço assíncrono) deste processo
+            with ProcessPoolExecutor(max_workers=processos, mp_context=get_context("spawn")) as executor:
+                resultados = list(executor.map(_simular_bloco, repeat(carteira), repeat(parametros), sementes, tamanhos))
+        else:
+            resultados = [_simular_bloco(carteira, parametros, semente_bloco, n) for semente_bloco, n in zip(sementes, tamanhos)]
+    custo = np.concatenate([resultado[0] for resultado in resultados])
+    emissao = np.concatenate([resultado[1] for resultado in resultados])
+    custo_regiao = np.concatenate([resultado[2] for resultado in resultados])
+
+    return {
+        "cenarios": cenarios,
+        "projetos": carteira.projetos,
+        "semente": int(sequencia.entropy),  # Repete a simulação exatamente
+        "processos": processos,
+        "segundos": round(time.perf_counter() - inicio, 3),
+        "custo": {"BASE": float(carteira.custo.sum()), **distribuicao(custo)},
+        "emissao": {"BASE": carteira.emissao, **distribuicao(emissao)},
+        "custo_por_regiao": [
+            {"ID_REGIAO": int(id_regiao), "REGIAO": nome, "BASE": float(carteira.custo[posicao].sum()), **distribuicao(custo_regiao[:, posicao])}
+            for posicao, (id_regiao, nome) in enumerate(zip(carteira.ids_regiao, carteira.nomes_regiao))
+        ],
+    }
+
+# Linhas do resultado de uma simulação para exibição em tabela (custo total, emissão total e custo por região)
+def linhas_resultado(resultado: dict) -> list[dict]:
+    linhas = [{"INDICADOR": "CUSTO_TOTAL", **resultado["custo"]}, {"INDICADOR": "EMISSAO_TOTAL", **resultado["emissao"]}]
+    for regiao in resultado["custo_por_regiao"]:
+        valores = {chave: valor for chave, valor in regiao.items() if chave not in ("ID_REGIAO", "REGIAO")}
+        linhas.append({"INDICADOR": f"CUSTO {regiao['REGIAO']}", **valores})
+    return linhas
@@ -0,0 +1,39 @@
+# ================================ Imports ================================
+import os
+import sys
+
+import pytest
+
+# Permite importar os módulos da raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from repositorio import criar_repositorio_sqlite
+
+
+# ============================= Configurações =============================
+
+# Tabelas de referência criadas em cada banco de teste
+TIPOS_FONTE = ["Solar", "Eólica", "Hídrica"]
+REGIOES = ["Norte", "Sul"]
+
+
+# ================================ Fixtures ===============================
+
+# Repositório sobre um banco SQLite temporário, com o script, as migrações e as tabelas de referência preenchidas
+@pytest.fixture
+def repositorio(tmp_path):
+    repositorio = criar_repositorio_sqlite(str(tmp_path / "projetos.db"))
+    repositorio.inserir_referencia("TBL_TIPO_FONTES", TIPOS_FONTE)
+    repositorio.inserir_referencia("TBL_REGIOES_SUSTENTAVEIS", REGIOES)
+    yield repositorio
+    repositorio._ancora.close()
+
+# Dados de um projeto novo (região, tipo de fonte, status e custo podem ser trocados)
+def dados_projeto(custo: float = 1000.0, status: str = "Em andamento", id_tipo_fonte: int = 1, id_regiao: int = 1) -> dict:
+    return {
+        "descricao": "Projeto de teste",
+        "custo": custo,
+        "status": status,
+        "id_tipo_fonte": id_tipo_fonte,
+        "id_regiao": id_regiao,
+    }
@@ -0,0 +1,49 @@
+# ================================ Imports ================================
+import sqlite3
+
+from comandos import RegistroComandos
+
+
+# ============================== Subalgoritmos ============================
+
+# Registro com um comando e um cache pequeno, para os testes
+def registro(sessoes: int = 256) -> RegistroComandos:
+    comandos = RegistroComandos("sqlite", tamanho_cache=2, sessoes=sessoes)
+    comandos.registrar("um", "SELECT 1")
+    return comandos
+
+
+# ================================ Testes =================================
+
+# A primeira execução em cada sessão conta como análise; as seguintes vêm do cache da sessão
+def test_analises_estimadas_por_sessao():
+    comandos = registro()
+    primeira, segunda = sqlite3.connect(":memory:"), sqlite3.connect(":memory:")
+
+    for conexao in (primeira, primeira, segunda, segunda, primeira):
+        comandos.preparar("um", conexao)
+
+    [estatistica] = comandos.estatisticas()
+    assert (estatistica["EXECUCOES"], estatistica["ANALISES_ESTIMADAS"]) == (5, 2)
+
+# Sessões que nunca são descartadas (pool do Oracle) não acumulam além do limite
+def test_sessoes_acompanhadas_tem_limite():
+    comandos = registro(sessoes=3)
+
+    for _ in range(10):
+        comandos.preparar("um", sqlite3.connect(":memory:"))
+
+    assert len(comandos._caches) == 3
+
+# Uma sessão nova nunca herda o cache de uma sessão encerrada, mesmo que o id seja reaproveitado
+def test_sessao_nova_comeca_sem_cache():
+    comandos = registro()
+
+    for _ in range(5):
+        conexao = sqlite3.connect(":memory:")
+        comandos.preparar("um", conexao)
+        conexao.close()
+        del conexao
+
+    [estatistica] = comandos.estatisticas()
+    assert estatistica["ANALISES_ESTIMADAS"] == 5
@@ -0,0 +1,98 @@
+# ================================ Imports ================================
+import pytest
+
+from conftest import dados_projeto
+from repositorio import ConflitoDeVersao
+
+
+# ============================== Subalgoritmos ============================
+
+# Textos SQL preparados pelo repositório enquanto o teste roda
+@pytest.fixture
+def comandos_executados(repositorio, monkeypatch):
+    textos = []
+    preparar = repositorio.comandos.preparar
+
+    def registrar(nome, conexao):
+        texto = preparar(nome, conexao)
+        textos.append(texto)
+        return texto
+
+    monkeypatch.setattr(repositorio.comandos, "preparar", registrar)
+    return textos
+
+
+# ================================ Testes =================================
+
+# Cada gravação incrementa a versão do projeto, no banco e no registro
+def test_salvar_incrementa_versao(repositorio):
+    id_projeto = repositorio.inserir_projeto(dados_projeto(100.0))
+    projeto = repositorio.carregar_projeto(id_projeto)
+    versao_inicial = projeto.versao
+
+    projeto.custo = 200.0
+    assert repositorio.salvar_projeto(projeto) is True
+    assert projeto.versao == versao_inicial + 1
+    assert not projeto.alterado
+
+    projeto.status = "Concluído"
+    repositorio.salvar_projeto(projeto)
+    relido = repositorio.carregar_projeto(id_projeto)
+    assert relido.versao == versao_inicial + 2
+    assert (relido.custo, relido.status) == (200.0, "Concluído")
+
+# Sem campos alterados não há UPDATE nem mudança de versão
+def test_salvar_sem_alteracoes_nao_grava(repositorio, comandos_executados):
+    projeto = repositorio.carregar_projeto(repositorio.inserir_projeto(dados_projeto()))
+    comandos_executados.clear()
+
+    assert repositorio.salvar_projeto(projeto) is False
+    assert comandos_executados == []
+    assert repositorio.carregar_projeto(projeto.id_projeto).versao == projeto.versao
+
+# O UPDATE contém apenas as colunas alteradas (mais a versão)
+def test_update_somente_com_campos_alterados(repositorio, comandos_executados):
+    projeto = repositorio.carregar_projeto(repositorio.inserir_projeto(dados_projeto()))
+    comandos_executados.clear()
+
+    projeto.descricao = "Descrição nova"
+    repositorio.salvar_projeto(projeto)
+
+    updates = [texto for texto in comandos_executados if texto.startswith("UPDATE TBL_PROJETOS_SUSTENTAVEIS")]
+    assert len(updates) == 1
+    atribuicoes = updates[0].split(" SET ")[1].split(" WHERE ")[0]
+    assert atribuicoes == "DESCRICAO = :descricao, VERSAO = VERSAO + 1"
+    # Só a descrição mudou: o resumo não é tocado
+    assert not any("TBL_RESUMO_PROJETOS" in texto for texto in comandos_executados)
+
+# Gravar a partir de uma versão desatualizada levanta ConflitoDeVersao sem gravar nada
+def test_versao_desatualizada_gera_conflito(repositorio):
+    id_projeto = repositorio.inserir_projeto(dados_projeto(100.0))
+    primeiro = repositorio.carregar_projeto(id_projeto)
+    segundo = repositorio.carregar_projeto(id_projeto)
+
+    primeiro.custo = 150.0
+    repositorio.salvar_projeto(primeiro)
+    resumo_antes = repositorio.listar_resumo()
+
+    segundo.custo = 999.0
+    segundo.status = "Concluído"
+    with pytest.raises(ConflitoDeVersao):
+        repositorio.salvar_projeto(segundo)
+
+    relido = repositorio.carregar_projeto(id_projeto)
+    assert (relido.custo, relido.status, relido.versao) == (150.0, "Em andamento", primeiro.versao)
+    assert repositorio.listar_resumo() == resumo_antes
+    # O registro continua com as alterações pendentes e a versão lida
+    assert segundo.alterado
+    assert segundo.versao == primeiro.versao - 1
+
+# Um projeto excluído depois de lido também é um conflito
+def test_projeto_excluido_gera_conflito(repositorio):
+    projeto = repositorio.carregar_projeto(repositorio.inserir_projeto(dados_projeto()))
+    repositorio.excluir_projeto(projeto.id_projeto)
+
+    projeto.custo = 1.0
+    with pytest.raises(ConflitoDeVersao):
+        repositorio.salvar_projeto(projeto)
+    assert repositorio.listar_resumo() == []
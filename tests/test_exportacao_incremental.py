@@ -0,0 +1,103 @@
+# ================================ Imports ================================
+import json
+
+from conftest import dados_projeto
+from exportacao_incremental import exportar_alteracoes
+
+
+# ============================== Subalgoritmos ============================
+
+# Exporta as alterações em NDJSON e retorna (manifesto, IDs alterados, IDs excluídos)
+def exportar(repositorio, pasta, nome: str, avancar: bool = True) -> tuple[dict, list[int], list[int]]:
+    prefixo = str(pasta / nome)
+    manifesto = exportar_alteracoes("ndjson", prefixo, "teste", avancar=avancar, repositorio=repositorio)
+    with open(prefixo + ".ndjson", encoding="utf-8") as arquivo:
+        alterados = [json.loads(linha)["ID_PROJETO"] for linha in arquivo if linha.strip()]
+    with open(prefixo + "_excluidos.json", encoding="utf-8") as arquivo:
+        excluidos = [exclusao["ID_PROJETO"] for exclusao in json.load(arquivo)]
+    return manifesto, alterados, excluidos
+
+# Recua o horário das gravações já feitas. No SQLite o instante seguro tem resolução de segundos, e tudo o que foi
+# gravado no mesmo segundo da marca seria relido (releitura de commits atrasados); os testes comparam só a faixa
+def envelhecer_gravacoes(repositorio) -> None:
+    with repositorio.conexao() as conexao:
+        conexao.execute("UPDATE TBL_PROJETOS_SUSTENTAVEIS SET ALTERADO_EM = '2000-01-01 00:00:00'")
+        conexao.execute("UPDATE TBL_PROJETOS_EXCLUIDOS SET EXCLUIDO_EM = '2000-01-01 00:00:00'")
+        conexao.execute("UPDATE TBL_MARCAS_EXPORTACAO SET SEGURO_EM = '2000-01-01 00:00:01'")
+        conexao.commit()
+
+
+# ================================ Testes =================================
+
+# A primeira exportação de um consumidor leva todos os projetos e grava a marca
+def test_primeira_exportacao_leva_tudo(repositorio, tmp_path):
+    ids = [repositorio.inserir_projeto(dados_projeto(custo)) for custo in (10.0, 20.0, 30.0)]
+
+    manifesto, alterados, excluidos = exportar(repositorio, tmp_path, "primeira")
+
+    assert sorted(alterados) == ids
+    assert excluidos == []
+    assert (manifesto["alterados"], manifesto["excluidos"]) == (3, 0)
+    assert repositorio.ler_marca("teste")[0] == manifesto["ate"] == repositorio.ultima_alteracao()
+
+# A exportação seguinte leva só o que mudou desde a marca, mais as exclusões
+def test_segunda_exportacao_leva_alteracoes_e_exclusoes(repositorio, tmp_path):
+    ids = [repositorio.inserir_projeto(dados_projeto(custo)) for custo in (10.0, 20.0, 30.0, 40.0)]
+    exportar(repositorio, tmp_path, "primeira")
+    envelhecer_gravacoes(repositorio)
+
+    projeto = repositorio.carregar_projeto(ids[0])
+    projeto.custo = 15.0
+    repositorio.salvar_projeto(projeto)
+    repositorio.excluir_projeto(ids[1])
+    novo = repositorio.inserir_projeto(dados_projeto(50.0))
+
+    manifesto, alterados, excluidos = exportar(repositorio, tmp_path, "segunda")
+
+    assert alterados == [ids[0], novo]  # Em ordem de alteração
+    assert excluidos == [ids[1]]
+    assert manifesto["desde"] < manifesto["ate"]
+
+    # Sem novas gravações, a próxima exportação sai vazia
+    envelhecer_gravacoes(repositorio)
+    manifesto, alterados, excluidos = exportar(repositorio, tmp_path, "terceira")
+    assert (alterados, excluidos) == ([], [])
+
+# Excluir e incluir de novo o mesmo ID aparece como alteração, sem exclusão
+def test_exclusao_seguida_de_nova_inclusao_do_mesmo_id(repositorio, tmp_path):
+    ids = [repositorio.inserir_projeto(dados_projeto(custo)) for custo in (10.0, 20.0)]
+    exportar(repositorio, tmp_path, "primeira")
+    envelhecer_gravacoes(repositorio)
+
+    repositorio.excluir_projeto(ids[0])
+    erros = repositorio.inserir_projetos([{**dados_projeto(99.0), "id_projeto": ids[0]}], manter_ids=True)
+
+    manifesto, alterados, excluidos = exportar(repositorio, tmp_path, "segunda")
+
+    assert erros == []
+    assert alterados == [ids[0]]
+    assert excluidos == []
+
+# Com avancar=False os arquivos são gerados, mas a marca não muda
+def test_sem_avancar_mantem_a_marca(repositorio, tmp_path):
+    repositorio.inserir_projeto(dados_projeto())
+    exportar(repositorio, tmp_path, "primeira")
+    marca = repositorio.ler_marca("teste")
+    repositorio.inserir_projeto(dados_projeto())
+
+    _, primeira_tentativa, _ = exportar(repositorio, tmp_path, "teste_a", avancar=False)
+    assert repositorio.ler_marca("teste") == marca
+
+    # Repetir sem avançar exporta a mesma faixa
+    _, segunda_tentativa, _ = exportar(repositorio, tmp_path, "teste_b", avancar=False)
+    assert segunda_tentativa == primeira_tentativa
+    assert repositorio.ler_marca("teste") == marca
+
+# Sem marca gravada, avancar=False não cria a marca
+def test_sem_avancar_nao_cria_marca(repositorio, tmp_path):
+    repositorio.inserir_projeto(dados_projeto())
+
+    _, alterados, _ = exportar(repositorio, tmp_path, "previa", avancar=False)
+
+    assert len(alterados) == 1
+    assert repositorio.ler_marca("teste") is None
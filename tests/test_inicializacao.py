@@ -0,0 +1,38 @@
+# ================================ Imports ================================
+import os
+import sys
+
+import pytest
+
+# Permite importar o benchmark de inicialização (pasta benchmarks na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import inicializacao
+
+
+# ============================= Configurações =============================
+
+# Processos por módulo (vale o menor tempo, como no benchmark)
+REPETICOES = int(os.getenv("REPETICOES_INICIALIZACAO", "3"))
+
+# Módulos de entrada medidos
+ALVOS = [alvo.strip() for alvo in inicializacao.ALVOS_PADRAO.split(",")]
+
+
+# ================================ Testes =================================
+
+# Cada módulo de entrada é importado dentro do orçamento (ORCAMENTO_INICIALIZACAO_MS)
+@pytest.mark.parametrize("modulo", ALVOS)
+def test_importacao_dentro_do_orcamento(modulo):
+    melhor = min(inicializacao.medir_importacao(modulo)[0] for _ in range(REPETICOES))
+    assert melhor <= inicializacao.ORCAMENTO_MS, (
+        f"'import {modulo}' levou {melhor:.1f} ms (orçamento {inicializacao.ORCAMENTO_MS:.0f} ms)"
+    )
+
+# Nenhum módulo de entrada carrega pandas, numpy, openpyxl, oracledb ou pyarrow na inicialização
+@pytest.mark.parametrize("modulo", ALVOS)
+def test_importacao_sem_bibliotecas_pesadas(modulo):
+    _, carregados = inicializacao.medir_importacao(modulo)
+    assert not inicializacao.bibliotecas_proibidas(carregados), (
+        f"'import {modulo}' carrega {', '.join(inicializacao.bibliotecas_proibidas(carregados))}"
+    )
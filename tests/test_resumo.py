@@ -0,0 +1,71 @@
+# ================================ Imports ================================
+from conftest import dados_projeto
+
+
+# ============================== Subalgoritmos ============================
+
+# Resumo mantido pelos deltas, por grupo (região, tipo de fonte, status)
+def resumo(repositorio) -> dict:
+    return {linha[:3]: (linha[3], round(float(linha[4]), 2)) for linha in repositorio.listar_resumo()}
+
+
+# ================================ Testes =================================
+
+# A migração cria o resumo vazio em um banco novo
+def test_resumo_vazio_em_banco_novo(repositorio):
+    assert resumo(repositorio) == {}
+    assert repositorio.reconciliar_resumo(corrigir=False) == []
+
+# Inclusões (uma a uma e em lote) somam quantidade e custo no grupo do projeto
+def test_inclusoes_atualizam_resumo(repositorio):
+    repositorio.inserir_projeto(dados_projeto(100.0))
+    repositorio.inserir_projeto(dados_projeto(250.5))
+    erros = repositorio.inserir_projetos([dados_projeto(10.0, "Concluído", 2, 2), dados_projeto(20.0, "Concluído", 2, 2)])
+
+    assert erros == []
+    assert resumo(repositorio) == {
+        (1, 1, "Em andamento"): (2, 350.5),
+        (2, 2, "Concluído"): (2, 30.0),
+    }
+    assert repositorio.reconciliar_resumo(corrigir=False) == []
+
+# Alterações movem o projeto entre grupos; o grupo que fica vazio sai do resumo
+def test_alteracoes_movem_projeto_entre_grupos(repositorio):
+    id_projeto = repositorio.inserir_projeto(dados_projeto(100.0))
+    outro = repositorio.inserir_projeto(dados_projeto(40.0, id_regiao=2))
+
+    repositorio.atualizar_projeto(id_projeto, dados_projeto(150.0, "Concluído", 3, 2))
+    projeto = repositorio.carregar_projeto(outro)
+    projeto.custo = 60.0
+    repositorio.salvar_projeto(projeto)
+    repositorio.atualizar_projetos({"status": "Concluído"}, ids=[outro])
+
+    assert resumo(repositorio) == {
+        (2, 3, "Concluído"): (1, 150.0),
+        (2, 1, "Concluído"): (1, 60.0),
+    }
+    assert repositorio.reconciliar_resumo(corrigir=False) == []
+
+# Exclusões (uma a uma e em lote) subtraem do grupo
+def test_exclusoes_atualizam_resumo(repositorio):
+    ids = [repositorio.inserir_projeto(dados_projeto(custo)) for custo in (10.0, 20.0, 30.0, 40.0)]
+
+    repositorio.excluir_projeto(ids[0])
+    repositorio.excluir_projetos(ids=ids[1:3])
+
+    assert resumo(repositorio) == {(1, 1, "Em andamento"): (1, 40.0)}
+    repositorio.excluir_projeto(ids[3])
+    assert resumo(repositorio) == {}
+    assert repositorio.reconciliar_resumo(corrigir=False) == []
+
+# A reconciliação aponta e corrige um resumo adulterado
+def test_reconciliacao_corrige_resumo_divergente(repositorio):
+    repositorio.inserir_projeto(dados_projeto(100.0))
+    with repositorio.conexao() as conexao:
+        conexao.execute("UPDATE TBL_RESUMO_PROJETOS SET QUANTIDADE = 5")
+        conexao.commit()
+
+    divergencias = repositorio.reconciliar_resumo()
+
+    assert [(d["QUANTIDADE_RESUMO"], d["QUANTIDADE_REAL"]) for d in divergencias] == [(5, 1)]
+    assert repositorio.reconciliar_resumo(corrigir=False) == []
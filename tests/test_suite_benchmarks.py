@@ -0,0 +1,63 @@
+# ================================ Imports ================================
+import json
+import os
+import subprocess
+import sys
+
+# Permite importar a suíte de benchmarks (pasta benchmarks na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import suite
+
+
+# ============================= Configurações =============================
+
+# Suíte executada como na linha de comando
+SCRIPT_SUITE = os.path.abspath(suite.__file__)
+
+# Tamanhos mínimos: o teste só confere que todos os benchmarks rodam e gravam o histórico
+ARGUMENTOS_MINIMOS = [
+    "--tamanhos", "200",
+    "--insercoes", "20",
+    "--linhas-excel", "200",
+    "--buscas", "10",
+    "--repeticoes", "1",
+    "--sem-memoria",
+]
+
+
+# ================================ Testes =================================
+
+# A suíte inteira roda em um banco pequeno e grava uma entrada no histórico com todos os benchmarks
+def test_suite_executa_com_tamanho_minimo(tmp_path):
+    historico = tmp_path / "historico.json"
+    processo = subprocess.run(
+        [sys.executable, SCRIPT_SUITE, *ARGUMENTOS_MINIMOS, "--pasta", str(tmp_path / "bancos"), "--historico", str(historico)],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+
+    assert processo.returncode == 0, processo.stdout + processo.stderr
+    [execucao] = json.loads(historico.read_text(encoding="utf-8"))
+    assert set(execucao["resultados"]) == {
+        "inserir_unitario[20]",
+        "inserir_lote[20]",
+        "consultar_projetos[200]",
+        "exportar_json[200]",
+        "exportar_excel[200]",
+        "buscar_referencia_cache",
+        "buscar_referencia_banco",
+    }
+    assert execucao["resultados"]["consultar_projetos[200]"]["operacoes"] == 200
+
+# Tempo ou memória acima do fator (e da diferença mínima) gera alerta; ruído pequeno não
+def test_comparar_execucoes_aponta_regressoes():
+    anterior = {"resultados": {"a": {"segundos": 0.1, "pico_mb": 10.0}, "b": {"segundos": 0.001}}}
+    atual = {"resultados": {"a": {"segundos": 0.3, "pico_mb": 30.0}, "b": {"segundos": 0.003}, "novo": {"segundos": 9.0}}}
+
+    alertas = suite.comparar_execucoes(anterior, atual, fator=1.5)
+
+    assert len(alertas) == 2
+    assert all(alerta.startswith("a: ") for alerta in alertas)